@@ -0,0 +1,514 @@
+"""
+PennyStalker - Analyzer
+Catalyst classification, dilution detection and scoring
+"""
+
+import re
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config_files import (
+    FilingTypes,
+    ScanParameters,
+    ScoringThresholds,
+    ScoringWeights,
+    TimeWindows,
+    get_catalyst_keyword_tiers,
+    get_dilution_keyword_tiers,
+    is_confirmation_filing,
+    is_dilution_filing,
+)
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatches:
+    """
+    Result of one matcher pass over a piece of text
+    Hits are kept per tier as (offset, phrase) pairs in text order
+    """
+    
+    def __init__(self, tiers: List[str]):
+        self.hits: Dict[str, List[Tuple[int, str]]] = {tier: [] for tier in tiers}
+    
+    
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Number of hits per tier"""
+        return {tier: len(hits) for tier, hits in self.hits.items()}
+    
+    
+    def phrases(self, tier: str) -> List[str]:
+        """Distinct phrases hit in a tier, in order of first appearance"""
+        return list(dict.fromkeys(phrase for _, phrase in self.hits[tier]))
+    
+    
+    def has(self, tier: str) -> bool:
+        """True if any phrase from the tier was found"""
+        return bool(self.hits[tier])
+    
+    
+    def __bool__(self) -> bool:
+        return any(self.hits.values())
+
+
+class KeywordMatcher:
+    """
+    Single-pass multi-phrase matcher
+    
+    All phrases are merged into one trie-shaped regex, so the work per text
+    position depends on how much of a phrase matches there, not on how many
+    phrases exist. Matching is case-insensitive, respects word boundaries
+    ('loi' does not hit 'exploit'), treats any run of whitespace as a space
+    and reports overlapping phrases: 'partnership' inside 'strategic
+    partnership', and 'exploring' at the start of 'exploring options' -
+    every phrase found counts toward its tier, the same as scanning for
+    each phrase separately.
+    
+    The regex costs more per character than substring scans, so it only
+    pays off from roughly 250 phrases (benchmarks/bench_keyword_matcher.py).
+    With the ~70 shipped keywords a per-phrase scan is about twice as fast;
+    the matcher is used anyway for the offsets and consistent matching
+    rules, and its cost stays flat as keyword lists grow.
+    """
+    
+    def __init__(self, tiers: Dict[str, List[str]]):
+        """
+        Args:
+            tiers: Tier name -> phrases, in priority order (a phrase listed
+                   in two tiers counts toward the first)
+        """
+        self.tiers = list(tiers)
+        self.phrase_tiers: Dict[str, str] = {}
+        
+        for tier, phrases in tiers.items():
+            for phrase in phrases:
+                self.phrase_tiers.setdefault(self._normalize(phrase), tier)
+        
+        # Zero-width match at each word start, so overlapping phrases are all found
+        trie = self._build_trie(self.phrase_tiers)
+        self.prefixes = self._word_prefixes(trie, self.phrase_tiers)
+        self.pattern = re.compile(
+            r'(?<!\w)(?=(' + self._trie_to_regex(trie) + r')(?!\w))',
+            re.IGNORECASE
+        )
+        
+        logger.debug(f"Keyword matcher compiled: {len(self.phrase_tiers)} phrases in {len(self.tiers)} tiers")
+    
+    
+    @staticmethod
+    def _normalize(phrase: str) -> str:
+        """Lower-case and collapse whitespace"""
+        return ' '.join(phrase.lower().split())
+    
+    
+    @staticmethod
+    def _build_trie(phrases) -> Dict:
+        """Character trie; '' marks the end of a phrase"""
+        trie: Dict = {}
+        for phrase in phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        return trie
+    
+    
+    @staticmethod
+    def _word_prefixes(trie: Dict, phrases) -> Dict[str, List[str]]:
+        """Phrase -> the phrases it starts with (itself included, longest first)"""
+        prefixes = {}
+        for phrase in phrases:
+            node = trie
+            found = []
+            for i, char in enumerate(phrase):
+                node = node[char]
+                # A shorter phrase only matches where it ends on a word boundary
+                if '' in node and (i + 1 == len(phrase) or not re.match(r'\w', phrase[i + 1])):
+                    found.append(phrase[:i + 1])
+            prefixes[phrase] = found[::-1]
+        return prefixes
+    
+    
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        """Turn a trie into a regex that tries longer continuations first"""
+        branches = []
+        for char in sorted(key for key in node if key):
+            token = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(token + cls._trie_to_regex(node[char]))
+        
+        if not branches:
+            return ''
+        
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        
+        # Phrase can end here - the continuation is optional (greedy = longest first)
+        if '' in node:
+            return body + '?' if len(branches) == 1 and len(branches[0]) == 1 else '(?:' + body + ')?'
+        return body
+    
+    
+    @timed('analyzer_seconds', step='keyword_scan')
+    def scan(self, text: str) -> KeywordMatches:
+        """
+        Find every phrase in the text in one pass
+        
+        Args:
+            text: Headline or filing text
+            
+        Returns:
+            KeywordMatches with per-tier (offset, phrase) hits
+        """
+        matches = KeywordMatches(self.tiers)
+        
+        if not text:
+            return matches
+        
+        for match in self.pattern.finditer(text):
+            # The regex takes the longest phrase at an offset; shorter ones it starts with hit too
+            for phrase in self.prefixes[self._normalize(match.group(1))]:
+                matches.hits[self.phrase_tiers[phrase]].append((match.start(), phrase))
+        
+        return matches
+
+
+@lru_cache(maxsize=None)
+def get_catalyst_matcher() -> KeywordMatcher:
+    """Matcher for the CatalystKeywords tiers (compiled once per process)"""
+    return KeywordMatcher(get_catalyst_keyword_tiers())
+
+
+@lru_cache(maxsize=None)
+def get_dilution_matcher() -> KeywordMatcher:
+    """Matcher for the DilutionKeywords tiers (compiled once per process)"""
+    return KeywordMatcher(get_dilution_keyword_tiers())
+
+
+# Ordinal feature levels - arrays index the weight tables with these
+CATALYST_NONE, CATALYST_WEAK, CATALYST_MEDIUM, CATALYST_STRONG = range(4)
+DILUTION_NONE, DILUTION_LOW, DILUTION_MEDIUM, DILUTION_HIGH, DILUTION_CRITICAL = range(5)
+
+CATALYST_LEVELS = {'STRONG': CATALYST_STRONG, 'MEDIUM': CATALYST_MEDIUM, 'WEAK': CATALYST_WEAK}
+DILUTION_LEVEL_NAMES = ['NONE', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+# Prospectus supplements mean an offering is actually selling, not just registered
+ACTIVE_OFFERING_FORMS = {'424B3', '424B5'}
+
+
+def headline_features(news_item: Dict, now: Optional[datetime] = None) -> Dict:
+    """
+    The features a headline alone decides (no SEC data needed)
+    
+    Args:
+        news_item: News dict from StockTitanScraper
+        now: Reference time (default: now)
+        
+    Returns:
+        Dict with ticker, catalyst_level, promotional, age_hours,
+        catalyst_phrases and promotional_phrases
+    """
+    now = now or datetime.now()
+    published = news_item.get('published_time') or now
+    
+    headline_hits = get_catalyst_matcher().scan(news_item.get('headline', ''))
+    catalyst_level = max(
+        (level for tier, level in CATALYST_LEVELS.items() if headline_hits.has(tier)),
+        default=CATALYST_NONE
+    )
+    
+    return {
+        'ticker': news_item.get('ticker', ''),
+        'catalyst_level': catalyst_level,
+        'promotional': headline_hits.has('PROMOTIONAL'),
+        'age_hours': max(0.0, (now - published).total_seconds() / 3600),
+        'catalyst_phrases': [p for tier in CATALYST_LEVELS for p in headline_hits.phrases(tier)],
+        'promotional_phrases': headline_hits.phrases('PROMOTIONAL'),
+    }
+
+
+@timed('analyzer_seconds', step='extract_features')
+def extract_features(news_item: Dict, filings: List[Dict],
+                     filing_texts: Optional[Dict[str, str]] = None,
+                     now: Optional[datetime] = None) -> Dict:
+    """
+    Turn one candidate's raw data into scoring features
+    
+    Args:
+        news_item: News dict from StockTitanScraper
+        filings: Filing dicts from SECScraper (may cover DILUTION_HISTORY_DAYS)
+        filing_texts: filing_url -> extracted text for filings that were downloaded
+        now: Reference time (default: now)
+        
+    Returns:
+        Feature dict accepted by FeatureBatch.from_features
+    """
+    now = now or datetime.now()
+    filing_texts = filing_texts or {}
+    
+    # Catalyst strength from the headline
+    headline = headline_features(news_item, now)
+    
+    # SEC confirmation - an 8-K close to the news, or at least some recent filing
+    published = news_item.get('published_time') or now
+    recent_cutoff = now - timedelta(days=TimeWindows.FILING_LOOKBACK_DAYS)
+    recent = [f for f in filings if f['filing_date'] >= recent_cutoff]
+    
+    confirmed = any(
+        is_confirmation_filing(f['filing_type'])
+        and abs((f['filing_date'] - published).days) <= TimeWindows.FILING_CONFIRMATION_DAYS
+        for f in recent
+    )
+    
+    # Dilution from filing types
+    dilution_level = DILUTION_NONE
+    dilution_forms = []
+    
+    for filing in filings:
+        form = filing['filing_type'].upper().strip()
+        if not is_dilution_filing(form):
+            continue
+        dilution_forms.append(form)
+        
+        if filing['filing_date'] < recent_cutoff:
+            level = DILUTION_LOW  # Historical diluter
+        elif form in ACTIVE_OFFERING_FORMS:
+            level = DILUTION_CRITICAL
+        elif form in FilingTypes.DILUTION_CRITICAL:
+            level = DILUTION_HIGH
+        else:
+            level = DILUTION_LOW
+        dilution_level = max(dilution_level, level)
+    
+    # Dilution from filing language
+    dilution_phrases = []
+    matcher = get_dilution_matcher()
+    
+    for text in filing_texts.values():
+        text_hits = matcher.scan(text or '')
+        if text_hits.has('CRITICAL'):
+            dilution_level = max(dilution_level, DILUTION_CRITICAL)
+        elif text_hits:
+            dilution_level = max(dilution_level, DILUTION_MEDIUM)
+        for tier in matcher.tiers:
+            dilution_phrases.extend(text_hits.phrases(tier))
+    
+    return {
+        'ticker': headline['ticker'],
+        'catalyst_level': headline['catalyst_level'],
+        'promotional': headline['promotional'],
+        'confirmed': confirmed,
+        'has_filings': bool(recent),
+        'dilution_level': dilution_level,
+        'age_hours': headline['age_hours'],
+        'catalyst_phrases': headline['catalyst_phrases'],
+        'promotional_phrases': headline['promotional_phrases'],
+        'dilution_phrases': list(dict.fromkeys(dilution_phrases)),
+        'dilution_forms': list(dict.fromkeys(dilution_forms)),
+    }
+
+
+class FeatureBatch:
+    """
+    Scoring features for many candidates as parallel NumPy arrays
+    Keep one around to rescore or re-rank without re-running the scrapers
+    """
+    
+    def __init__(self, tickers: List[str], catalyst_level, promotional, confirmed,
+                 has_filings, dilution_level, age_hours):
+        self.tickers = tickers
+        self.catalyst_level = np.asarray(catalyst_level, dtype=np.int8)
+        self.promotional = np.asarray(promotional, dtype=bool)
+        self.confirmed = np.asarray(confirmed, dtype=bool)
+        self.has_filings = np.asarray(has_filings, dtype=bool)
+        self.dilution_level = np.asarray(dilution_level, dtype=np.int8)
+        self.age_hours = np.asarray(age_hours, dtype=np.float64)
+    
+    
+    @classmethod
+    def from_features(cls, features: List[Dict]) -> 'FeatureBatch':
+        """Build from extract_features() dicts"""
+        return cls(
+            tickers=[f['ticker'] for f in features],
+            catalyst_level=[f['catalyst_level'] for f in features],
+            promotional=[f['promotional'] for f in features],
+            confirmed=[f['confirmed'] for f in features],
+            has_filings=[f['has_filings'] for f in features],
+            dilution_level=[f['dilution_level'] for f in features],
+            age_hours=[f['age_hours'] for f in features],
+        )
+    
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+
+class BatchScorer:
+    """
+    Applies ScoringWeights and ScoringThresholds to a whole FeatureBatch at once
+    
+    Final Score = clip(min(Catalyst + SEC Bonus + Dilution Penalty + Time Decay, caps), 0, 100)
+    
+    Pass different weight/threshold classes to see how a rule change
+    re-ranks the same candidates.
+    """
+    
+    def __init__(self, weights=ScoringWeights, thresholds=ScoringThresholds):
+        """
+        Args:
+            weights: Object with ScoringWeights' attributes
+            thresholds: Object with ScoringThresholds' attributes
+        """
+        self.weights = weights
+        self.thresholds = thresholds
+    
+    
+    @timed('analyzer_seconds', step='batch_score')
+    def score(self, batch: FeatureBatch) -> np.ndarray:
+        """
+        Score every candidate in the batch
+        
+        Args:
+            batch: Candidate features
+            
+        Returns:
+            Float array of scores (0-100), aligned with batch.tickers
+        """
+        return self._score(batch)
+    
+    
+    def _score(self, batch: FeatureBatch) -> np.ndarray:
+        """score() without the timer - bounds() and prescore() are timed as their own steps"""
+        w = self.weights
+        t = self.thresholds
+        
+        # Lookup tables indexed by the ordinal feature levels
+        catalyst_points = np.array([0, w.CATALYST_WEAK, w.CATALYST_MEDIUM, w.CATALYST_STRONG], dtype=np.float64)
+        dilution_points = np.array(
+            [0, w.DILUTION_LOW, w.DILUTION_MEDIUM, w.DILUTION_HIGH, w.DILUTION_CRITICAL], dtype=np.float64
+        )
+        
+        catalyst = catalyst_points[batch.catalyst_level]
+        catalyst = np.where(batch.promotional & (batch.catalyst_level == CATALYST_NONE),
+                            w.CATALYST_PROMOTIONAL, catalyst)
+        
+        sec_bonus = np.where(batch.confirmed, w.SEC_CONFIRMATION_8K,
+                             np.where(batch.has_filings, w.SEC_CONFIRMATION_OTHER, w.SEC_NO_CONFIRMATION))
+        
+        dilution = dilution_points[batch.dilution_level]
+        
+        age = batch.age_hours
+        decay = np.select(
+            [age < 24, age < 48, age < 72],
+            [w.TIME_DECAY_FRESH, w.TIME_DECAY_RECENT, w.TIME_DECAY_OLD],
+            default=w.TIME_DECAY_STALE
+        )
+        
+        raw = catalyst + sec_bonus + dilution + decay
+        
+        # Mandatory caps
+        cap = np.full(len(batch), 100.0)
+        cap = np.where(batch.dilution_level == DILUTION_CRITICAL,
+                       np.minimum(cap, t.MAX_SCORE_WITH_CRITICAL_DILUTION), cap)
+        cap = np.where(~batch.confirmed, np.minimum(cap, t.MAX_SCORE_PR_ONLY), cap)
+        cap = np.where(batch.promotional, np.minimum(cap, t.MAX_SCORE_PROMOTIONAL), cap)
+        
+        return np.clip(np.minimum(raw, cap), 0, 100)
+    
+    
+    @timed('analyzer_seconds', step='bounds')
+    def bounds(self, features: Dict) -> Tuple[float, float]:
+        """
+        Lowest and highest score a candidate can still end up with
+        
+        Filing texts can only add dilution evidence - at worst they take the
+        dilution level to CRITICAL - and more dilution never raises a score.
+        So the features as they stand give the upper bound and the same
+        features at CRITICAL dilution the lower one.
+        
+        Args:
+            features: extract_features() dict for the texts read so far
+            
+        Returns:
+            (lower, upper) - equal when no filing text can change the score
+        """
+        worst = {**features, 'dilution_level': DILUTION_CRITICAL}
+        upper, lower = self._score(FeatureBatch.from_features([features, worst]))
+        return float(lower), float(upper)
+    
+    
+    @timed('analyzer_seconds', step='prescore')
+    def prescore(self, headlines: List[Dict]) -> np.ndarray:
+        """
+        Best score each candidate can still reach, from its headline alone
+        
+        Scores the headline features as if SEC checks come back perfect (a
+        confirming 8-K, no dilution). Those only ever add points or lift
+        caps, so the real score never ends up higher - promotional fluff is
+        held at MAX_SCORE_PROMOTIONAL however clean its filings are.
+        
+        Args:
+            headlines: headline_features() (or full feature) dicts
+            
+        Returns:
+            Float array of upper-bound scores, aligned with headlines
+        """
+        count = len(headlines)
+        batch = FeatureBatch(
+            tickers=[h['ticker'] for h in headlines],
+            catalyst_level=[h['catalyst_level'] for h in headlines],
+            promotional=[h['promotional'] for h in headlines],
+            confirmed=np.ones(count, dtype=bool),
+            has_filings=np.ones(count, dtype=bool),
+            dilution_level=np.full(count, DILUTION_NONE),
+            age_hours=[h['age_hours'] for h in headlines],
+        )
+        return self._score(batch)
+    
+    
+    def rank(self, scores: np.ndarray, top_n: Optional[int] = None,
+             min_score: Optional[float] = None) -> np.ndarray:
+        """
+        Indexes of the best candidates, highest score first
+        
+        With top_n, np.partition finds the Nth-best score and only the
+        candidates at or above it (ties included) are sorted. Ties keep
+        batch order.
+        
+        Args:
+            scores: Output of score()
+            top_n: How many to return (default: all)
+            min_score: Drop candidates below this (default: MIN_SCORE_THRESHOLD)
+            
+        Returns:
+            Integer index array into the batch
+        """
+        if min_score is None:
+            min_score = ScanParameters.MIN_SCORE_THRESHOLD
+        
+        eligible = np.flatnonzero(scores >= min_score)
+        
+        if top_n is not None and top_n < len(eligible):
+            if top_n <= 0:
+                return eligible[:0]
+            # Candidates scoring above the Nth-best, plus everyone tied with it
+            kth = np.partition(scores[eligible], len(eligible) - top_n)[len(eligible) - top_n]
+            eligible = eligible[scores[eligible] >= kth]
+        
+        order = eligible[np.lexsort((eligible, -scores[eligible]))]
+        return order[:top_n] if top_n is not None else order
+    
+    
+    def tiers(self, scores: np.ndarray) -> np.ndarray:
+        """Confidence tier label per score (HIGH / MEDIUM / LOW / FILTERED)"""
+        t = self.thresholds
+        return np.select(
+            [scores >= t.HIGH_CONFIDENCE, scores >= t.MEDIUM_CONFIDENCE, scores >= t.LOW_CONFIDENCE],
+            ['HIGH', 'MEDIUM', 'LOW'],
+            default='FILTERED'
+        )
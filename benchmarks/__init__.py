@@ -0,0 +1,5 @@
+"""
+PennyStalker - Benchmarks
+Offline performance checks run against a local stub server
+Run from the repo root, e.g. python -m benchmarks.bench_concurrent_sec
+"""
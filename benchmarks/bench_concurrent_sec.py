@@ -0,0 +1,77 @@
+"""
+PennyStalker - Concurrent SEC Fetch Benchmark
+Sequential get_filings vs get_filings_batch against a local stub server
+
+Usage: python -m benchmarks.bench_concurrent_sec [tickers] [latency_seconds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import unquote
+
+from benchmarks.fixtures import edgar_browse_page, company_tickers_json
+from benchmarks.stub_server import StubServer
+from config_files import ScanParameters
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+
+
+def make_route(tickers):
+    tickers_file = company_tickers_json(tickers).encode()
+
+    def route(path, query):
+        if path.endswith('/browse-edgar'):
+            company = unquote(query.get('CIK', ['X'])[0])
+            return 200, {'Content-Type': 'text/html'}, edgar_browse_page(company).encode()
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        return None
+
+    return route
+
+
+def run(ticker_count: int = 20, latency: float = 0.3):
+    tickers = [f"T{i:03d}" for i in range(ticker_count)]
+
+    with StubServer(make_route(tickers), latency=latency) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        scraper = SECScraper()
+        scraper.http_cache = None  # Measure the network path, not the cache
+        scraper.filing_ledger = None
+        scraper.base_url = server.url
+        scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+        scraper.rate_limiter.configure(server.url, ScanParameters.SEC_REQUESTS_PER_SECOND)
+        scraper.cik_index = CIKIndex(os.path.join(cache_dir, 'cik_index.tsv'))
+        scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+        scraper.cik_index.ensure_fresh(scraper)
+
+        start = time.perf_counter()
+        sequential = {t: scraper.get_filings(t) for t in tickers}
+        sequential_time = time.perf_counter() - start
+
+        scraper.clear_memo()  # Each pass is a separate run
+        start = time.perf_counter()
+        concurrent = scraper.get_filings_batch(tickers)
+        concurrent_time = time.perf_counter() - start
+
+        scraper.close()
+
+    assert sequential == concurrent, "Concurrent results differ from sequential"
+
+    floor = ticker_count / ScanParameters.SEC_REQUESTS_PER_SECOND
+    old_style = ticker_count * (ScanParameters.REQUEST_DELAY + latency)
+
+    print(f"{ticker_count} tickers, {latency * 1000:.0f} ms latency, "
+          f"{ScanParameters.SEC_REQUESTS_PER_SECOND:g} req/s ceiling, {ScanParameters.MAX_WORKERS} workers")
+    print(f"  sleep-per-request (estimated): {old_style:6.2f} s")
+    print(f"  sequential:                    {sequential_time:6.2f} s")
+    print(f"  concurrent:                    {concurrent_time:6.2f} s  "
+          f"(rate-limit floor {floor:.2f} s, speedup {sequential_time / concurrent_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    run(count, delay)
@@ -0,0 +1,93 @@
+"""
+PennyStalker - Filing Ledger Benchmark
+Six months of filing history: one 40-row company page per scan vs. the ledger
+
+A prolific filer lists more filings in DILUTION_HISTORY_DAYS than a single
+count=40 page holds. The old path loses the rest; the ledger pages back once,
+then each later scan fetches one short delta page. Between scans the
+company files a few new documents.
+
+Usage: python -m benchmarks.bench_filing_ledger [filings_in_window] [scans]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import company_tickers_json, edgar_browse_page
+from benchmarks.stub_server import StubServer
+from config_files import TimeWindows
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+from scrapers.filing_ledger import FilingLedger
+
+TICKER = 'ABCD'
+NEW_PER_SCAN = 2
+
+
+def run(in_window: int = 150, scans: int = 5):
+    days_apart = TimeWindows.DILUTION_HISTORY_DAYS / in_window
+    company = {'total': in_window * 2, 'bytes': 0}
+
+    def route(path, query):
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, company_tickers_json([TICKER]).encode()
+        if not path.endswith('/browse-edgar'):
+            return None
+
+        body = edgar_browse_page(
+            TICKER, rows=int(query.get('count', ['40'])[0]), start=int(query.get('start', ['0'])[0]),
+            total=company['total'], days_apart=days_apart,
+        ).encode()
+        company['bytes'] += len(body)
+        return 200, {'Content-Type': 'text/html'}, body
+
+    with StubServer(route) as server, tempfile.TemporaryDirectory() as work:
+        scraper = SECScraper()
+        scraper.http_cache = None  # Measure the network path, not the cache
+        scraper.filings_backend = 'html'
+        scraper.base_url = server.url
+        scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+        scraper.rate_limiter.configure(server.url, 0)
+        scraper.cik_index = CIKIndex(os.path.join(work, 'cik_index.tsv'))
+        scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+        scraper.cik_index.ensure_fresh(scraper)
+
+        ledger = FilingLedger(os.path.join(work, 'filing_ledger.sqlite3'))
+
+        print(f"{TICKER}: {in_window} filings in {TimeWindows.DILUTION_HISTORY_DAYS} days, "
+              f"{NEW_PER_SCAN} new filings per scan")
+        print(f"  {'scan':>4}  {'one page: filings':>17} {'reqs':>4} {'KB':>6}   "
+              f"{'ledger: filings':>15} {'reqs':>4} {'KB':>6} {'ms':>6}")
+
+        for scan in range(1, scans + 1):
+            row = []
+            for use_ledger in (False, True):
+                scraper.filing_ledger = ledger if use_ledger else None
+                scraper.clear_memo()  # Each scan is a separate run
+                server.reset_count()
+                company['bytes'] = 0
+
+                start = time.perf_counter()
+                filings = scraper.get_filings(TICKER, TimeWindows.DILUTION_HISTORY_DAYS)
+                elapsed = (time.perf_counter() - start) * 1000
+
+                row.append((len(filings), server.request_count, company['bytes'] / 1024, elapsed))
+
+            # Scans are hours apart - skip the ledger's hourly reuse so the delta path runs
+            ledger._connect().execute("UPDATE companies SET synced_at = 0")
+            ledger.conn.commit()
+
+            (old_count, old_reqs, old_kb, _), (new_count, new_reqs, new_kb, new_ms) = row
+            print(f"  {scan:>4}  {old_count:>17} {old_reqs:>4} {old_kb:>6.0f}   "
+                  f"{new_count:>15} {new_reqs:>4} {new_kb:>6.0f} {new_ms:>6.1f}")
+
+            company['total'] += NEW_PER_SCAN
+
+        ledger.close()
+        scraper.close()
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,45 @@
+"""
+PennyStalker - Filing Store Benchmark
+Cost of one put() as the filing text store fills up
+
+The index used to be one JSON file rewritten on every put, so a scan that
+stored N filings wrote O(N^2) bytes of index. It is now a SQLite table
+updated one row at a time.
+
+Usage: python -m benchmarks.bench_filing_store [entries ...]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+
+from scrapers.filing_store import FilingTextStore
+
+TEXT = 'We may offer and sell from time to time up to $50,000,000 of our common stock. ' * 60
+
+
+def run(sizes):
+    print(f"{'entries':>8} {'total':>10} {'per put':>10} {'last 100':>10}")
+
+    for size in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            store = FilingTextStore(directory, max_bytes=1024 ** 4)
+            start = time.perf_counter()
+            for i in range(size - 100):
+                store.put(f"0000000001-24-{i:06d}", TEXT)
+
+            tail_start = time.perf_counter()
+            for i in range(size - 100, size):
+                store.put(f"0000000001-24-{i:06d}", TEXT)
+            end = time.perf_counter()
+
+            print(f"{size:>8} {(end - start) * 1000:>8.0f}ms {(end - start) / size * 1e6:>8.0f}us "
+                  f"{(end - tail_start) / 100 * 1e6:>8.0f}us")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,96 @@
+"""
+PennyStalker - Filing Text Extraction Benchmark
+Full BeautifulSoup parse vs streaming extraction on large filing documents
+
+Each measurement runs in a fresh interpreter so peak RSS is comparable.
+Documents are HTML (the usual primary document) and plain text (.txt
+primary documents, no tags at all).
+
+Usage: python -m benchmarks.bench_filing_text [size_mb ...]
+"""
+
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import large_filing_html
+from config_files import ScanParameters
+from scrapers.text_extract import extract_text
+
+CHUNK = 64 * 1024
+
+
+def large_filing_txt(target_bytes: int) -> str:
+    """Plain-text filing document of roughly the requested size"""
+    paragraph = ('We may offer and sell from time to time up to $50,000,000 of our common stock,\n'
+                 'warrants and units in one or more offerings.    Net proceeds    12,345,678\n\n')
+    return paragraph * (target_bytes // len(paragraph) + 1)
+
+
+def full_parse(html: bytes, max_chars: int) -> str:
+    """The old path: whole document -> BeautifulSoup -> get_text -> slice"""
+    soup = BeautifulSoup(html.decode('utf-8'), 'lxml')
+    for script in soup(['script', 'style']):
+        script.decompose()
+    text = soup.get_text(separator=' ', strip=True)
+    return re.sub(r'\s+', ' ', text)[:max_chars]
+
+
+def streaming(html: bytes, max_chars: int) -> str:
+    """The new path: chunks -> incremental parser, stop at the budget"""
+    chunks = (html[i:i + CHUNK] for i in range(0, len(html), CHUNK))
+    return extract_text(chunks, max_chars, 'utf-8')
+
+
+def measure(mode: str, size_mb: float, kind: str = 'html'):
+    """Run one mode in this process and print a JSON result line"""
+    make = large_filing_html if kind == 'html' else large_filing_txt
+    html = make(int(size_mb * 1024 * 1024)).encode('utf-8')
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    text = (full_parse if mode == 'full' else streaming)(html, ScanParameters.FILING_TEXT_MAX_CHARS)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'seconds': elapsed,
+        'peak_mb': (peak - baseline) / 1024,
+        'chars': len(text),
+        'text_hash': hash(text),
+    }))
+
+
+def run(sizes):
+    for kind in ('html', 'txt'):
+        for size_mb in sizes:
+            run_one(kind, size_mb)
+
+
+def run_one(kind: str, size_mb: float):
+    results = {}
+    for mode in ('full', 'stream'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_filing_text', '--measure', mode, str(size_mb), kind],
+            capture_output=True, text=True, check=True, env={**os.environ, 'PYTHONHASHSEED': '0'},
+        )
+        results[mode] = json.loads(output.stdout.strip().splitlines()[-1])
+
+    full, stream = results['full'], results['stream']
+    same = full['text_hash'] == stream['text_hash']
+    print(f"{size_mb:g} MB {kind} document ({full['chars']} chars kept, identical: {same}):")
+    print(f"  full parse: {full['seconds'] * 1000:8.1f} ms  peak +{full['peak_mb']:6.1f} MB")
+    print(f"  streaming:  {stream['seconds'] * 1000:8.1f} ms  peak +{stream['peak_mb']:6.1f} MB")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(sys.argv[2], float(sys.argv[3]), *sys.argv[4:5])
+    else:
+        run([float(arg) for arg in sys.argv[1:]] or [1, 5, 20])
@@ -0,0 +1,78 @@
+"""
+PennyStalker - Filing List Backend Benchmark
+HTML company page vs JSON submissions document, parse cost and coverage
+
+Usage: python -m benchmarks.bench_filings_backend [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import unquote
+
+from benchmarks.fixtures import edgar_browse_page, submissions_json, company_tickers_json, fake_cik
+from benchmarks.stub_server import StubServer
+from config_files import TimeWindows
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+
+TICKER = 'ABCD'
+
+PAGES = {
+    'html': edgar_browse_page(TICKER).encode(),
+    'json': submissions_json(TICKER).encode(),
+    'tickers': company_tickers_json([TICKER]).encode(),
+}
+
+
+def route(path, query):
+    if path.endswith('/browse-edgar'):
+        return 200, {'Content-Type': 'text/html'}, PAGES['html']
+    if path.endswith(f"/CIK{fake_cik(TICKER):010d}.json"):
+        return 200, {'Content-Type': 'application/json'}, PAGES['json']
+    if path.endswith('/company_tickers.json'):
+        return 200, {'Content-Type': 'application/json'}, PAGES['tickers']
+    return None
+
+
+def time_backend(scraper, backend, repeats, lookback_days=None):
+    scraper.filings_backend = backend
+    start = time.perf_counter()
+    for _ in range(repeats):
+        scraper.clear_memo()  # Time the lookup, not the per-run memo
+        filings = scraper.get_filings(TICKER, lookback_days)
+    return (time.perf_counter() - start) / repeats, filings
+
+
+def run(repeats: int = 50):
+    with StubServer(route) as server, tempfile.TemporaryDirectory() as cache_dir:
+        scraper = SECScraper()
+        scraper.http_cache = None  # Measure the network path, not the cache
+        scraper.filing_ledger = None
+        scraper.base_url = server.url
+        scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+        scraper.submissions_url = f"{server.url}/submissions"
+        scraper.rate_limiter.configure(server.url, 0)  # Unlimited - measure parsing
+        scraper.cik_index = CIKIndex(os.path.join(cache_dir, 'cik_index.tsv'))
+        scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+
+        html_time, html_filings = time_backend(scraper, 'html', repeats)
+        json_time, json_filings = time_backend(scraper, 'json', repeats)
+        _, html_history = time_backend(scraper, 'html', 1, TimeWindows.DILUTION_HISTORY_DAYS)
+        _, json_history = time_backend(scraper, 'json', 1, TimeWindows.DILUTION_HISTORY_DAYS)
+
+        scraper.close()
+
+    assert html_filings == json_filings, "Backends disagree on the recent window"
+
+    print(f"{TimeWindows.FILING_LOOKBACK_DAYS}-day window ({len(html_filings)} filings), avg of {repeats}:")
+    print(f"  html: {html_time * 1000:7.2f} ms")
+    print(f"  json: {json_time * 1000:7.2f} ms  ({html_time / json_time:.1f}x faster)")
+    print(f"{TimeWindows.DILUTION_HISTORY_DAYS}-day window in one request:")
+    print(f"  html: {len(html_history)} filings (capped at 40 rows)")
+    print(f"  json: {len(json_history)} filings")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
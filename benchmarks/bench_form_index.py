@@ -0,0 +1,166 @@
+"""
+PennyStalker - Bulk Form Index Benchmark
+One company page per ticker vs. EDGAR's master index files joined locally
+
+The stub publishes a quarterly master.idx per quarter (every filing up to
+yesterday, plus thousands of unlisted filers) and a daily master file for
+today. The bulk backend downloads the quarters once, then only new daily
+files; the HTML backend requests one page per ticker every scan.
+
+Usage: python -m benchmarks.bench_form_index [tickers]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from benchmarks.fixtures import (
+    company_index_rows, company_tickers_json, daily_index_listing, edgar_browse_page, fake_cik, master_index,
+)
+from benchmarks.stub_server import StubServer
+from config_files import TimeWindows
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+from scrapers.form_index import FormIndex
+
+NOISE_FILERS = 20000      # Funds, insiders and other filers with no ticker
+FULL_INDEX = re.compile(r'/full-index/(\d{4})/QTR(\d)/master\.idx$')
+DAILY_LISTING = re.compile(r'/daily-index/(\d{4})/QTR(\d)/index\.json$')
+DAILY_FILE = re.compile(r'/daily-index/\d{4}/QTR\d/master\.(\d{8})\.idx$')
+
+
+def quarter(day: str):
+    return int(day[:4]), (int(day[5:7]) - 1) // 3 + 1
+
+
+def build_site(tickers):
+    """Every filing by day - listed companies plus unlisted noise"""
+    rng = random.Random(3)
+    rows = [row for ticker in tickers for row in company_index_rows(ticker)]
+
+    today = date.today().isoformat()
+    days = sorted({row[2] for row in rows})
+    for i in range(NOISE_FILERS):
+        rows.append((90000000 + i, '4', rng.choice(days), f"9{i:09d}-24-000001"))
+
+    by_day = {}
+    for row in rows:
+        by_day.setdefault(row[2], []).append(row)
+
+    # Today's daily file is published later (EDGAR builds it in the evening)
+    return {'by_day': by_day, 'today': today, 'published': days[-2], 'bytes': 0}
+
+
+def make_route(site, tickers):
+    tickers_file = company_tickers_json(tickers).encode()
+    by_cik = {f"{fake_cik(ticker):010d}": ticker for ticker in tickers}
+
+    def send(body: str):
+        data = body.encode()
+        site['bytes'] += len(data)
+        return 200, {'Content-Type': 'text/plain'}, data
+
+    def route(path, query):
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        if path.endswith('/browse-edgar'):
+            return send(edgar_browse_page(by_cik[query['CIK'][0]]))
+
+        match = FULL_INDEX.search(path)
+        if match:
+            wanted = (int(match.group(1)), int(match.group(2)))
+            return send(master_index([
+                row for day, rows in sorted(site['by_day'].items())
+                if quarter(day) == wanted and day < site['today'] for row in rows
+            ]))
+
+        match = DAILY_LISTING.search(path)
+        if match:
+            wanted = (int(match.group(1)), int(match.group(2)))
+            return send(daily_index_listing([
+                f"master.{day.replace('-', '')}.idx" for day in sorted(site['by_day'])
+                if quarter(day) == wanted and day <= site['published']
+            ]))
+
+        match = DAILY_FILE.search(path)
+        if match:
+            day = datetime.strptime(match.group(1), '%Y%m%d').strftime('%Y-%m-%d')
+            return send(master_index(site['by_day'].get(day, []), daily=True))
+
+        return None
+
+    return route
+
+
+def run(ticker_count: int = 300):
+    tickers = [f"T{i:03d}" for i in range(ticker_count)]
+    site = build_site(tickers)
+    window = TimeWindows.DILUTION_HISTORY_DAYS
+
+    with StubServer(make_route(site, tickers)) as server, tempfile.TemporaryDirectory() as work:
+        scraper = SECScraper()
+        scraper.http_cache = None  # Measure the network path, not the cache
+        scraper.filing_ledger = None
+        scraper.base_url = server.url
+        scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+        scraper.rate_limiter.configure(server.url, 0)
+        scraper.cik_index = CIKIndex(os.path.join(work, 'cik_index.tsv'))
+        scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+        scraper.cik_index.ensure_fresh(scraper)
+        scraper.form_index = FormIndex(os.path.join(work, 'form_index.sqlite3'))
+
+        print(f"{ticker_count} tickers, {window}-day window, {NOISE_FILERS} unlisted filers in the index:")
+
+        def measure(label, backend):
+            scraper.filings_backend = backend
+            scraper.clear_memo()  # Each scan is a separate run
+            server.reset_count()
+            site['bytes'] = 0
+            start = time.perf_counter()
+            results = {ticker: scraper.get_filings(ticker, window) for ticker in tickers}
+            elapsed = time.perf_counter() - start
+            filings = sum(len(found or []) for found in results.values())
+            print(f"  {label:28s} {elapsed:6.2f} s  {server.request_count:4d} requests  "
+                  f"{site['bytes'] / 1024 / 1024:6.1f} MB  {filings:6d} filings")
+            return results
+
+        html = measure('html: company page each', 'html')
+        measure('bulk: first scan (backfill)', 'bulk')
+        measure('bulk: later scan, same hour', 'bulk')
+
+        # Today's daily file appears
+        site['published'] = site['today']
+        scraper.form_index._connect().execute("UPDATE state SET value = '0' WHERE key = 'checked_at'")
+        scraper.form_index.conn.commit()
+        bulk = measure('bulk: next check, new file', 'bulk')
+
+        # Both backends agree wherever the 40-row company page reaches
+        reach = min(f['filing_date'] for f in html[tickers[0]])
+        same = all(
+            [f['filing_url'] for f in html[t] if f['filing_date'] >= reach] ==
+            [f['filing_url'] for f in bulk[t] if f['filing_date'] >= reach]
+            for t in tickers
+        )
+        print(f"  filings identical back to {reach:%Y-%m-%d} (html page limit): {same}")
+
+        # Saved index files load without the network
+        saved = os.path.join(work, 'master.idx')
+        with open(saved, 'w', encoding='latin-1') as f:
+            f.write(master_index([row for rows in site['by_day'].values() for row in rows]))
+        offline = FormIndex(os.path.join(work, 'offline.sqlite3'))
+        start = time.perf_counter()
+        loaded = offline.ingest_file(saved, set(scraper.cik_index.ciks.values()))
+        print(f"  ingest saved master.idx      {time.perf_counter() - start:6.2f} s  "
+              f"{os.path.getsize(saved) / 1024 / 1024:.1f} MB -> {loaded} listed-company filings")
+        offline.close()
+
+        scraper.form_index.close()
+        scraper.close()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
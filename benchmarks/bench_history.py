@@ -0,0 +1,130 @@
+"""
+PennyStalker - Scan History Benchmark
+Writes and queries against the SQLite scan history vs. the old text reports
+
+Simulates a year of scans (one scan per weekday, ~200 scored tickers each),
+then times the write path and the two questions the history is for. The text
+baseline greps report files written the way main.py used to write them.
+
+Usage: python -m benchmarks.bench_history [scans] [tickers_per_scan]
+"""
+
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from history import ScanHistory
+from report import format_report
+
+FEATURES = {
+    'catalyst_level': 2, 'dilution_level': 1, 'confirmed': False, 'promotional': False,
+    'has_filings': True, 'catalyst_phrases': ['partnership'], 'promotional_phrases': [],
+    'dilution_forms': ['S-3'], 'dilution_phrases': [],
+}
+
+
+def make_results(rng: random.Random, universe, count: int):
+    results = []
+    for ticker in rng.sample(universe, count):
+        results.append({
+            'ticker': ticker,
+            'score': float(rng.randint(0, 100)),
+            'tier': 'MEDIUM',
+            'headline': f"{ticker} announces strategic partnership",
+            'news_url': f"https://www.stocktitan.net/news/{ticker}/x.html",
+            'published_time': datetime.now(),
+            'filing_url': '',
+            'filings': [],
+            'features': FEATURES,
+            'data_gaps': [],
+        })
+    return results
+
+
+def run(scan_count: int = 260, per_scan: int = 200):
+    rng = random.Random(7)
+    universe = [f"T{i:04d}" for i in range(3000)]
+    scans = [(scan_count - i, make_results(rng, universe, per_scan)) for i in range(scan_count)]
+    rows = scan_count * per_scan
+
+    with tempfile.TemporaryDirectory() as work:
+        # Write path: batched transactions vs. a commit per result
+        one_scan = scans[0][1]
+
+        batched = ScanHistory(os.path.join(work, 'batched.sqlite3'))
+        start = time.perf_counter()
+        batched.begin_scan()
+        for result in one_scan:
+            batched.add(result)
+        batched.end_scan()
+        batched_ms = (time.perf_counter() - start) * 1000
+        batched.close()
+
+        conn = sqlite3.connect(os.path.join(work, 'per_row.sqlite3'))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE results (ticker TEXT, scan_time REAL, score REAL, headline TEXT)")
+        start = time.perf_counter()
+        for result in one_scan:
+            conn.execute("INSERT INTO results VALUES (?, ?, ?, ?)",
+                         (result['ticker'], time.time(), result['score'], result['headline']))
+            conn.commit()
+        per_row_ms = (time.perf_counter() - start) * 1000
+        conn.close()
+
+        print(f"Write one scan ({per_scan} results):")
+        print(f"  commit per result     {per_row_ms:8.1f} ms")
+        print(f"  batched transactions  {batched_ms:8.1f} ms")
+
+        # Load a year of history, backdating each scan
+        path = os.path.join(work, 'history.sqlite3')
+        history = ScanHistory(path)
+        for age_days, results in scans:
+            scan_id = history.begin_scan()
+            for result in results:
+                history.add(result)
+            history.end_scan()
+            history.conn.execute("UPDATE results SET scan_time = scan_time - ? WHERE scan_id = ?",
+                                 (age_days * 86400, scan_id))
+            history.conn.commit()
+
+        # The same data as the old text reports
+        report_dir = os.path.join(work, 'output')
+        os.makedirs(report_dir)
+        for index, (age_days, results) in enumerate(scans):
+            ranked = sorted(results, key=lambda r: r['score'], reverse=True)
+            with open(os.path.join(report_dir, f"scan_{index:05d}.txt"), 'w', encoding='utf-8') as f:
+                f.write(format_report(ranked, len(ranked)) + '\n')
+
+        print(f"\nQueries over {scan_count} scans ({rows} results):")
+
+        start = time.perf_counter()
+        found = history.ticker_history('T0042', min_score=70, days=90)
+        sqlite_ms = (time.perf_counter() - start) * 1000
+
+        pattern = re.compile(r"T0042 - Score: (\d+)/100")
+        start = time.perf_counter()
+        grepped = 0
+        for name in sorted(os.listdir(report_dir))[-90:]:
+            with open(os.path.join(report_dir, name), encoding='utf-8') as f:
+                grepped += sum(1 for score in pattern.findall(f.read()) if int(score) >= 70)
+        grep_ms = (time.perf_counter() - start) * 1000
+
+        print(f"  ticker > 70, 90 days   sqlite {sqlite_ms:7.2f} ms ({len(found)} hits)   "
+              f"text files {grep_ms:8.1f} ms ({grepped} hits)")
+
+        start = time.perf_counter()
+        movers = history.score_changes(hours=48, min_change=10)
+        movers_ms = (time.perf_counter() - start) * 1000
+        print(f"  score changes, 48 h    sqlite {movers_ms:7.2f} ms ({len(movers)} tickers)   "
+              f"text files: not answerable without parsing every report")
+
+        history.close()
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,113 @@
+"""
+PennyStalker - HTML Parser Benchmark
+XPath fast paths vs the BeautifulSoup parsers on EDGAR and StockTitan pages
+
+Pages can be saved copies of the real sites (browse-edgar company pages,
+filing -index.htm pages, StockTitan's live page); the page type is detected
+from its markup. Without arguments generated fixture pages are used.
+
+Usage: python -m benchmarks.bench_html_parsers [page.html ...]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fixtures import (
+    accession, edgar_browse_page, fake_cik, filing_index_page, stocktitan_page,
+)
+from scrapers import parsers
+
+BASE_URL = 'https://www.sec.gov'
+
+
+def fixture_pages():
+    """(name, bytes) for one page of each kind"""
+    cik = fake_cik('ABCD')
+    items = [
+        {'ticker': f"T{i:02d}", 'headline': f"$T{i:02d} announces results of phase {i % 3 + 1} trial",
+         'age': f"{i * 7} minutes ago"}
+        for i in range(50)
+    ]
+    return [
+        ('company page (40 rows)', edgar_browse_page('ABCD').encode()),
+        ('filing index', filing_index_page(cik, accession(cik, 1)).encode()),
+        ('stocktitan live (50 entries)', stocktitan_page(items).encode()),
+    ]
+
+
+def parsers_for(content: bytes):
+    """(kind, lxml parser, BeautifulSoup parser) for a page"""
+    now = datetime.now()
+    news_cutoff = now - timedelta(hours=24)
+    filing_cutoff = now - timedelta(days=365)
+
+    if b'tableFile2' in content:
+        return (
+            'filings',
+            lambda: parsers._parse_filings_page_lxml(content, 'utf-8', 'ABCD', filing_cutoff, BASE_URL),
+            lambda: parsers._parse_filings_page_soup(content, 'utf-8', 'ABCD', filing_cutoff, BASE_URL),
+        )
+    if b'tableFile' in content:
+        return (
+            'index',
+            lambda: parsers._find_primary_document_lxml(content, 'utf-8'),
+            lambda: parsers._find_primary_document_soup(content, 'utf-8'),
+        )
+    if b'link-block' in content:
+        return (
+            'news',
+            lambda: parsers._parse_news_page_lxml(content, 'utf-8', news_cutoff, 50, None, None),
+            lambda: parsers._parse_news_page_soup(content, 'utf-8', news_cutoff, 50, None),
+        )
+    return None
+
+
+def comparable(kind: str, result):
+    """Result with 'x minutes ago' timestamps rounded off (each parse reads the clock)"""
+    if kind != 'news' or result is None:
+        return result
+    items = [
+        {**item, 'published_time': item['published_time'].replace(second=0, microsecond=0)}
+        for item in result['items']
+    ]
+    oldest = result['oldest'] and result['oldest'].replace(second=0, microsecond=0)
+    return {**result, 'items': items, 'oldest': oldest}
+
+
+def timed(func, repeat: int) -> float:
+    """Seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(pages, repeat: int = 200):
+    for name, content in pages:
+        found = parsers_for(content)
+        if found is None:
+            print(f"{name}: unrecognised page - skipped")
+            continue
+
+        kind, fast, soup = found
+        same = comparable(kind, fast()) == comparable(kind, soup())
+
+        fast_time = timed(fast, repeat)
+        soup_time = timed(soup, repeat)
+
+        print(f"{name} ({len(content) / 1024:.0f} KB, identical: {same}):")
+        print(f"  BeautifulSoup: {soup_time * 1000:7.2f} ms  {1 / soup_time:8.0f} pages/s")
+        print(f"  lxml XPath:    {fast_time * 1000:7.2f} ms  {1 / fast_time:8.0f} pages/s  "
+              f"({soup_time / fast_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:]:
+        saved = []
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                saved.append((path, f.read()))
+        run(saved, repeat=50)
+    else:
+        run(fixture_pages())
@@ -0,0 +1,108 @@
+"""
+PennyStalker - Keyword Matcher Benchmark
+Compiled single-pass matcher vs scanning the text once per phrase
+
+Two per-phrase baselines: plain `in` (fast but wrong - 'loi' hits
+'exploit') and `in` as a prefilter on whitespace-collapsed text followed by
+a word-boundary check, which finds exactly what the compiled matcher finds
+and is the fair comparison.
+
+Usage: python -m benchmarks.bench_keyword_matcher
+"""
+
+import random
+import re
+import time
+
+from analyzer import KeywordMatcher
+from benchmarks.fixtures import large_filing_html
+from config_files import ScanParameters, get_catalyst_keyword_tiers, get_dilution_keyword_tiers
+from scrapers.text_extract import extract_text
+
+VOCABULARY = (
+    'shares common stock offering warrant company agreement period market capital revenue '
+    'trial product license holder board director notes price exchange registration securities'
+).split()
+
+
+def synthetic_tiers(phrase_count: int, seed: int = 7):
+    """Real keyword tiers padded with made-up multi-word phrases"""
+    rng = random.Random(seed)
+    tiers = {tier: list(phrases) for tier, phrases in {
+        **get_catalyst_keyword_tiers(), **get_dilution_keyword_tiers()
+    }.items()}
+
+    existing = sum(len(phrases) for phrases in tiers.values())
+    names = list(tiers)
+    for i in range(max(0, phrase_count - existing)):
+        phrase = ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 3)))
+        tiers[names[i % len(names)]].append(f"{phrase} {i}")
+    return tiers
+
+
+def naive_scan(text: str, tiers):
+    """What a first analyzer would do: lower() once, then `in` per phrase"""
+    lowered = text.lower()
+    return {tier: [p for p in phrases if p in lowered] for tier, phrases in tiers.items()}
+
+
+def boundary_patterns(tiers):
+    """One precompiled word-boundary regex per phrase"""
+    return {
+        tier: [(p, re.compile(r'(?<!\w)' + re.escape(p) + r'(?!\w)')) for p in phrases]
+        for tier, phrases in tiers.items()
+    }
+
+
+def boundary_scan(text: str, patterns):
+    """Per-phrase scan with the matcher's rules: `in` finds candidates, the regex checks boundaries"""
+    normalized = ' '.join(text.lower().split())
+    return {
+        tier: [p for p, pattern in compiled if p in normalized and pattern.search(normalized)]
+        for tier, compiled in patterns.items()
+    }
+
+
+def best_of(func, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run():
+    html = large_filing_html(1024 * 1024)
+    text = extract_text([html], ScanParameters.FILING_TEXT_MAX_CHARS)
+    print(f"Text: {len(text)} characters of filing text")
+    print(f"{'phrases':>8} {'naive in':>10} {'boundary':>10} {'compiled':>10} {'build':>9}  same hits")
+
+    for phrase_count in (73, 250, 500, 1000, 2000):
+        tiers = synthetic_tiers(phrase_count)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(tiers)
+        build = time.perf_counter() - start
+
+        patterns = boundary_patterns(tiers)
+        naive = best_of(lambda: naive_scan(text, tiers))
+        boundary = best_of(lambda: boundary_scan(text, patterns))
+        compiled = best_of(lambda: matcher.scan(text))
+
+        # Phrases listed in two tiers count toward the first in both
+        matches = matcher.scan(text)
+        seen = set()
+        expected = {}
+        for tier, phrases in boundary_scan(text, patterns).items():
+            expected[tier] = {p for p in phrases if p not in seen}
+            seen.update(phrases)
+        same = all(set(matches.phrases(tier)) == expected[tier] for tier in tiers)
+
+        total = sum(len(phrases) for phrases in tiers.values())
+        print(f"{total:>8} {naive * 1000:>8.2f}ms {boundary * 1000:>8.2f}ms {compiled * 1000:>8.2f}ms "
+              f"{build * 1000:>7.1f}ms  {same}")
+
+
+if __name__ == '__main__':
+    run()
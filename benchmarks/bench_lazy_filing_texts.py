@@ -0,0 +1,125 @@
+"""
+PennyStalker - Lazy Filing Text Benchmark
+Reading every relevant filing text vs. only those that can still change the report
+
+Issuers come in three kinds: active offerings (a recent 424B5 already means
+CRITICAL dilution), occasional filers (only a recent 8-K) and recent shelf
+registrations (S-3). Half the filing documents contain offering language.
+Both runs must produce the same report; the lazy one should need fewer
+requests.
+
+Usage: python -m benchmarks.bench_lazy_filing_texts [tickers] [top_n]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.fixtures import company_tickers_json, edgar_browse_page, fake_cik, filing_index_page
+from benchmarks.stub_server import StubServer
+from config_files import ScanParameters
+from pipeline import ScanPipeline
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+
+HEADLINES = [
+    "${t} receives FDA approval for lead candidate",
+    "${t} announces strategic partnership with major distributor",
+    "${t} provides corporate update to shareholders",
+    "${t} revolutionary game changer technology unveiled",
+    "${t} wins government contract for rapid test kits",
+]
+DAYS_APART = (3, 40, 12)  # Active offering / occasional filer / recent shelf
+INDEX_PATH = re.compile(r'/data/(\d+)/\d+/([\d-]+)-index\.htm$')
+DOCUMENT_PATH = re.compile(r'/data/(\d+)/')
+CLEAN = b'<html><body><p>Quarterly report. Nothing to see.</p></body></html>'
+OFFERING = b'<html><body><p>The Company may offer and sell shares from time to time.</p></body></html>'
+
+
+def make_route(tickers):
+    tickers_file = company_tickers_json(tickers).encode()
+    by_cik = {fake_cik(t): t for t in tickers}
+    html = {'Content-Type': 'text/html'}
+
+    def route(path, query):
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        if path.endswith('/browse-edgar'):
+            ticker = by_cik[int(query['CIK'][0])]
+            days_apart = DAYS_APART[int(ticker[1:]) % len(DAYS_APART)]
+            return 200, html, edgar_browse_page(ticker, rows=10, days_apart=days_apart).encode()
+        match = INDEX_PATH.search(path)
+        if match:
+            return 200, html, filing_index_page(int(match.group(1)), match.group(2)).encode()
+        if path.endswith('.htm'):
+            cik = int(DOCUMENT_PATH.search(path).group(1))
+            return 200, html, OFFERING if cik % 2 else CLEAN
+        return None
+
+    return route
+
+
+def make_scraper(server, cache_dir):
+    scraper = SECScraper()
+    scraper.http_cache = None  # Every run pays for its requests
+    scraper.filing_ledger = None
+    scraper.filing_store = None
+    scraper.filings_backend = 'html'
+    scraper.base_url = server.url
+    scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+    scraper.rate_limiter.configure(server.url, 0)
+    scraper.cik_index = CIKIndex(os.path.join(cache_dir, 'cik_index.tsv'))
+    scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+    scraper.cik_index.ensure_fresh(scraper)
+    return scraper
+
+
+def run(ticker_count: int = 60, top_n: int = 5):
+    tickers = [f"Q{i:03d}" for i in range(ticker_count)]
+    now = datetime.now()
+    news = [
+        {'ticker': t, 'ticker_source': 'dollar', 'headline': HEADLINES[i % len(HEADLINES)].format(t=t),
+         'url': f"https://example.com/{t}", 'published_time': now, 'source': 'StockTitan'}
+        for i, t in enumerate(tickers)
+    ]
+    ScanParameters.MAX_CANDIDATES = len(news)
+
+    print(f"{ticker_count} tickers, threshold {ScanParameters.MIN_SCORE_THRESHOLD}:")
+
+    with StubServer(make_route(tickers), latency=0.02) as server, tempfile.TemporaryDirectory() as cache_dir:
+        scraper = make_scraper(server, cache_dir)
+
+        for report_top in (None, top_n):
+            reports = {}
+            for label, lazy in (('every text', False), ('lazy', True)):
+                scraper.clear_memo()
+                pipeline = ScanPipeline(sec=scraper)
+                if not lazy:
+                    pipeline._skip_texts_reason = lambda *args: None
+
+                server.reset_count()
+                start = time.perf_counter()
+                results = pipeline.run([news], top_n=report_top)
+                elapsed = time.perf_counter() - start
+
+                ranked = pipeline.rank(results, top_n=report_top)
+                reports[lazy] = [(r['ticker'], r['score'], r['tier']) for r in ranked]
+                stats = pipeline.text_stats
+                avoided = sum(stats.values()) - stats['downloaded']
+                print(f"  {'top ' + str(report_top) if report_top else 'all above threshold':20s} {label:10s} "
+                      f"{elapsed:5.2f} s  {server.request_count:4d} requests  "
+                      f"{stats['downloaded']:3d} texts read, {avoided:3d} avoided "
+                      f"({stats['decided']} decided, {stats['below_threshold']} below threshold, "
+                      f"{stats['outside_top_n']} outside top N)")
+
+            print(f"  {'':20s} same report: {reports[False] == reports[True]} ({len(reports[True])} ranked)")
+
+        scraper.close()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 60,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5)
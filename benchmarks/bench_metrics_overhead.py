@@ -0,0 +1,82 @@
+"""
+PennyStalker - Metrics Overhead Benchmark
+Cost of scan metrics per recording call, and on whole scans, enabled vs disabled
+
+The scans are benchmarks.suite scans (stub server, no rate limits) run in
+fresh interpreters with METRICS=true and METRICS=false, alternating so
+drift hits both sides alike.
+
+Usage: python -m benchmarks.bench_metrics_overhead [tickers] [rounds]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from metrics import ScanMetrics, get_metrics, timed
+
+CALLS = 200_000
+
+
+def per_call_ns(func) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func()
+    return (time.perf_counter() - start) / CALLS * 1e9
+
+
+def run_micro():
+    print(f"Per call ({CALLS:,} calls):")
+    for enabled in (False, True):
+        metrics = ScanMetrics(enabled)
+
+        def with_timer():
+            with metrics.timer('stage_item_seconds', stage='sec'):
+                pass
+
+        calls = {
+            'inc': lambda: metrics.inc('http_requests_total', host='sec.gov', status='200'),
+            'observe': lambda: metrics.observe('http_request_seconds', 0.2, host='sec.gov'),
+            'timer': with_timer,
+        }
+        label = 'enabled ' if enabled else 'disabled'
+        print(f"  {label}  " + '  '.join(f"{name} {per_call_ns(func):6.0f} ns" for name, func in calls.items()))
+
+    # The decorator checks the shared registry (METRICS from the environment) on each call
+    plain = lambda: None
+    wrapped = timed('analyzer_seconds', step='bench')(plain)
+    state = 'enabled' if get_metrics().enabled else 'disabled'
+    print(f"  timed decorator ({state}): {per_call_ns(wrapped) - per_call_ns(plain):6.0f} ns over a bare call")
+
+
+def scan_seconds(tickers: int, enabled: bool) -> float:
+    env = {**os.environ, 'LOG_LEVEL': 'WARNING', 'METRICS': 'true' if enabled else 'false'}
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.suite', '--scan', str(tickers), '--latency', '0'],
+        capture_output=True, text=True, env=env,
+    )
+    if output.returncode != 0:
+        raise SystemExit(output.stderr)
+    runs = json.loads(output.stdout.strip().splitlines()[-1])
+    return runs['cold']['seconds'] + runs['warm']['seconds']
+
+
+def run_scans(tickers: int, rounds: int):
+    times = {False: [], True: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            times[enabled].append(scan_seconds(tickers, enabled))
+
+    off, on = statistics.median(times[False]), statistics.median(times[True])
+    print(f"Scans of {tickers} tickers (cold + warm, median of {rounds}):")
+    print(f"  METRICS=false  {off:6.3f} s")
+    print(f"  METRICS=true   {on:6.3f} s  ({(on - off) / off * 100:+.1f}%)")
+
+
+if __name__ == '__main__':
+    run_micro()
+    run_scans(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+              int(sys.argv[2]) if len(sys.argv) > 2 else 5)
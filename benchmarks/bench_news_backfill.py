@@ -0,0 +1,85 @@
+"""
+PennyStalker - News Backfill Benchmark
+Live page only vs. walking older pages one at a time vs. a few at once
+
+The stub publishes an article every few minutes, 50 per page, with a mix of
+relative ("35 minutes ago") and absolute ("Oct 17, 2026 3:05 PM") times.
+With a 24 hour window the live page alone covers only its first few hours.
+
+Usage: python -m benchmarks.bench_news_backfill [latency]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fixtures import stocktitan_page
+from benchmarks.stub_server import StubServer
+from config_files import TimeWindows
+from scrapers import StockTitanScraper
+
+PER_PAGE = 50
+ARTICLES = 1000
+MINUTES_APART = 7
+WINDOW_HOURS = 24
+
+
+def build_articles(now: datetime):
+    articles = []
+    for i in range(ARTICLES):
+        published = now - timedelta(minutes=MINUTES_APART * i + 1)
+        minutes = MINUTES_APART * i + 1
+        age = f"{minutes} minutes ago" if minutes < 60 else published.strftime('%b %d, %Y %I:%M %p')
+        ticker = 'Q' + ''.join(chr(ord('A') + i // 26 ** k % 26) for k in (2, 1, 0))
+        articles.append({
+            'ticker': ticker,
+            'headline': f"${ticker} announces results of operations update {i}",
+            'age': age,
+            'published': published,
+        })
+    return articles
+
+
+def make_route(articles):
+    def route(path, query):
+        if not path.endswith('/live.html'):
+            return None
+        number = int(query.get('page', ['1'])[0])
+        chunk = articles[(number - 1) * PER_PAGE:number * PER_PAGE]
+        return 200, {'Content-Type': 'text/html; charset=utf-8'}, stocktitan_page(chunk).encode()
+    return route
+
+
+def run(latency: float = 0.15):
+    articles = build_articles(datetime.now())
+    cutoff = datetime.now() - timedelta(hours=WINDOW_HOURS)
+    in_window = sum(1 for article in articles if article['published'] >= cutoff)
+    TimeWindows.NEWS_LOOKBACK_HOURS = WINDOW_HOURS
+
+    print(f"{WINDOW_HOURS} h window, {in_window} articles in it, {PER_PAGE} per page, {latency * 1000:.0f} ms latency:")
+
+    with StubServer(make_route(articles), latency=latency) as server:
+        for label, pages, workers in (('live page only', 0, 1), ('backfill, 1 at a time', 20, 1),
+                                      ('backfill, 3 at a time', 20, 3)):
+            scraper = StockTitanScraper()
+            scraper.http_cache = None  # Measure the network path, not the cache
+            scraper.news_url = f"{server.url}/news/live.html"
+            scraper.news_page_url = f"{scraper.news_url}?page={{page}}"
+            scraper.rate_limiter.configure(server.url, 0)
+            scraper.backfill_pages = pages
+            scraper.backfill_workers = workers
+
+            server.reset_count()
+            start = time.perf_counter()
+            items = scraper.get_recent_news()
+            elapsed = time.perf_counter() - start
+
+            ordered = all(a['published_time'] >= b['published_time'] for a, b in zip(items, items[1:]))
+            oldest = (datetime.now() - items[-1]['published_time']).total_seconds() / 3600 if items else 0
+            print(f"  {label:24s} {elapsed:5.2f} s  {server.request_count:3d} requests  "
+                  f"{len(items):4d}/{in_window} items  back to {oldest:4.1f} h  newest first: {ordered}")
+            scraper.close()
+
+
+if __name__ == '__main__':
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 0.15)
@@ -0,0 +1,125 @@
+"""
+PennyStalker - Parse Pool Benchmark
+SEC company-page throughput with HTML parsing inline vs in worker processes
+
+Each PARSE_WORKERS setting runs in a fresh interpreter (the setting is read
+at import). Gains need spare cores - on a single core the pool only adds
+pickling and IPC overhead. The CPUs this process may use are printed
+with the results; rows with more workers than that say nothing about
+scaling.
+
+Usage: python -m benchmarks.bench_parse_pool [tickers] [latency_seconds] [rows_per_page]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import unquote
+
+from benchmarks.fixtures import edgar_browse_page, company_tickers_json
+from benchmarks.stub_server import StubServer
+
+WORKER_COUNTS = (0, 1, 2, 4)
+
+
+def make_route(tickers, rows: int):
+    tickers_file = company_tickers_json(tickers).encode()
+    pages = {}
+
+    def route(path, query):
+        if path.endswith('/browse-edgar'):
+            company = unquote(query.get('CIK', ['X'])[0])
+            if company not in pages:
+                pages[company] = edgar_browse_page(company, rows=rows).encode()
+            return 200, {'Content-Type': 'text/html'}, pages[company]
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        return None
+
+    return route
+
+
+def measure(ticker_count: int, latency: float, rows: int):
+    """Fetch every ticker's filings once in this process and print a JSON result line"""
+    from config_files import ScanParameters
+    from scrapers import SECScraper
+    from scrapers.cik_index import CIKIndex
+
+    tickers = [f"T{i:03d}" for i in range(ticker_count)]
+
+    with StubServer(make_route(tickers, rows), latency=latency) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        scraper = SECScraper()
+        scraper.http_cache = None
+        scraper.filing_ledger = None
+        scraper.filings_backend = 'html'
+        scraper.base_url = server.url
+        scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+        scraper.rate_limiter.configure(server.url, 0)
+        scraper.cik_index = CIKIndex(os.path.join(cache_dir, 'cik_index.tsv'))
+        scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+        scraper.cik_index.ensure_fresh(scraper)
+
+        # Warm up - starts the worker processes outside the timed section
+        scraper.get_filings(tickers[0])
+        scraper.clear_memo()
+
+        start = time.perf_counter()
+        results = scraper.get_filings_batch(tickers)
+        elapsed = time.perf_counter() - start
+
+        scraper.close()
+
+    # Compare paths only - the stub's port changes between runs
+    paths = sorted((t, [f['filing_url'][len(server.url):] for f in fs]) for t, fs in results.items())
+    print(json.dumps({
+        'seconds': elapsed,
+        'filings': sum(len(f) for f in results.values()),
+        'digest': hash(repr(paths)),
+    }))
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on (affinity / container limits), not just the machine's count"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run(ticker_count: int = 100, latency: float = 0.02, rows: int = 200):
+    cpus = usable_cpus()
+    print(f"{ticker_count} company pages, {rows} rows each, {latency * 1000:.0f} ms latency "
+          f"(os.cpu_count() = {os.cpu_count()}, usable = {cpus}):")
+
+    baseline = None
+    for workers in WORKER_COUNTS:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_parse_pool', '--measure',
+             str(ticker_count), str(latency), str(rows)],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, 'PARSE_WORKERS': str(workers), 'PYTHONHASHSEED': '0', 'LOG_LEVEL': 'WARNING'},
+        )
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        baseline = baseline or result
+
+        label = 'inline' if workers == 0 else f"{workers} processes"
+        same = result['digest'] == baseline['digest']
+        note = '  [more workers than CPUs]' if workers > cpus else ''
+        print(f"  {label:12s} {result['seconds']:6.2f} s  {ticker_count / result['seconds']:7.1f} pages/s  "
+              f"({result['filings']} filings, identical: {same}){note}")
+
+    if cpus < max(WORKER_COUNTS):
+        print(f"  Only {cpus} usable CPU(s) - multi-core scaling was not measured by this run")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(int(sys.argv[2]), float(sys.argv[3]), int(sys.argv[4]))
+    else:
+        args = sys.argv[1:]
+        run(int(args[0]) if args else 100,
+            float(args[1]) if len(args) > 1 else 0.02,
+            int(args[2]) if len(args) > 2 else 200)
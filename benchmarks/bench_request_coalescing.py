@@ -0,0 +1,136 @@
+"""
+PennyStalker - Request Coalescing Benchmark
+Every lookup on its own vs. single-flight requests and per-run memoization
+
+The scan holds share classes of one company (ABCD and ABCDW - same CIK, same
+company page) and merger parties whose company pages list the same filings.
+Without deduplication each of them downloads the page and every filing again.
+
+Usage: python -m benchmarks.bench_request_coalescing [latency]
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.fixtures import edgar_browse_page, fake_cik, filing_index_page
+from benchmarks.stub_server import StubServer
+from config_files import ScanParameters
+from pipeline import ScanPipeline
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+
+INDEX_PATH = re.compile(r'/data/(\d+)/\d+/([\d-]+)-index\.htm$')
+DOCUMENT = b'<html><body><p>The Company may offer and sell shares from time to time.</p></body></html>'
+
+
+def build_universe():
+    """Ticker -> CIK, and CIK -> ticker whose filings its company page lists"""
+    issuers = [f"I{i:03d}" for i in range(20)]
+    ciks = {ticker: fake_cik(ticker) for ticker in issuers}
+    pages = {cik: ticker for ticker, cik in ciks.items()}
+
+    # Warrants / second share class - same registrant
+    for ticker in issuers[:8]:
+        ciks[ticker + 'W'] = ciks[ticker]
+
+    # Merger parties - co-registrants on the same filings
+    for i, ticker in enumerate(issuers[10:16]):
+        partner = f"M{i:03d}"
+        ciks[partner] = fake_cik(partner)
+        pages[ciks[partner]] = ticker
+
+    return ciks, pages
+
+
+def make_route(ciks, pages):
+    tickers_file = json.dumps({
+        str(i): {'cik_str': cik, 'ticker': ticker, 'title': f"{ticker} Corp"}
+        for i, (ticker, cik) in enumerate(ciks.items())
+    }).encode()
+    html = {'Content-Type': 'text/html'}
+
+    def route(path, query):
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        if path.endswith('/browse-edgar'):
+            return 200, html, edgar_browse_page(pages[int(query['CIK'][0])]).encode()
+        match = INDEX_PATH.search(path)
+        if match:
+            return 200, html, filing_index_page(int(match.group(1)), match.group(2)).encode()
+        if path.endswith('.htm'):
+            return 200, html, DOCUMENT
+        return None
+
+    return route
+
+
+def no_dedupe(key, func):
+    return func(), False
+
+
+def run(latency: float = 0.1):
+    ciks, pages = build_universe()
+    now = datetime.now()
+    news = [
+        {'ticker': ticker, 'ticker_source': 'dollar', 'headline': f"${ticker} announces merger agreement",
+         'url': f"https://example.com/{ticker}", 'published_time': now, 'source': 'StockTitan'}
+        for ticker in ciks
+    ]
+    ScanParameters.MAX_CANDIDATES = len(news)
+
+    print(f"{len(news)} tickers, {len(pages)} company pages, {latency * 1000:.0f} ms latency:")
+
+    with StubServer(make_route(ciks, pages), latency=latency) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        for label, dedupe in (('every lookup on its own', False), ('coalesced + memoized', True)):
+            scraper = SECScraper()
+            scraper.http_cache = None  # Measure the network path, not the caches
+            scraper.filing_ledger = None
+            scraper.filing_store = None
+            scraper.filings_backend = 'html'
+            scraper.base_url = server.url
+            scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+            scraper.rate_limiter.configure(server.url, 0)
+            scraper.cik_index = CIKIndex(os.path.join(cache_dir, f"cik_index_{dedupe}.tsv"))
+            scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+            scraper.cik_index.ensure_fresh(scraper)
+
+            if not dedupe:
+                scraper.in_flight.do = no_dedupe
+                scraper.filings_memo.do = no_dedupe
+                scraper.filing_text_memo.do = no_dedupe
+
+            pipeline = ScanPipeline(sec=scraper)
+            server.reset_count()
+            start = time.perf_counter()
+            results = pipeline.run([news])
+            elapsed = time.perf_counter() - start
+
+            scores = sorted((r['ticker'], r['score']) for r in results)
+            saved = dict(scraper.saved_stats)
+            scan_requests = server.request_count
+
+            # The same page wanted by 8 threads at once (e.g. a cache miss every worker hits)
+            server.reset_count()
+            url = f"{scraper.search_url}?action=getcompany&CIK={fake_cik('I000'):010d}"
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: scraper.make_request(url), range(8)))
+
+            print(f"  {label:24s} {elapsed:5.2f} s  {scan_requests:4d} requests  "
+                  f"{saved['memoized']:3d} memoized lookups  {len(results)} scored  |  "
+                  f"8 concurrent GETs of one URL: {server.request_count} request(s)")
+            pipeline.close()
+
+            if dedupe:
+                print(f"  same scores: {scores == baseline}")
+            baseline = scores
+
+
+if __name__ == '__main__':
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 0.1)
@@ -0,0 +1,127 @@
+"""
+PennyStalker - Result Log Benchmark
+Keeping every result for the final ranking vs. streaming them to a JSONL log
+
+Results carry each ticker's filings over the dilution history window, so a
+large scan holding all of them until it ends grows with the scan. The log
+keeps them on disk and the ranking reads them back, holding only results
+above the threshold. Also checks that a log cut off mid-write (a killed
+scan) still reads back up to the damage.
+
+Usage: python -m benchmarks.bench_result_log [results]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from analyzer import BatchScorer, FeatureBatch, extract_features
+from config_files import ScanParameters
+from results_log import ResultLog, rank_records, read_records
+
+HEADLINES = [
+    "{t} receives FDA approval for lead candidate",
+    "{t} announces strategic partnership with major distributor",
+    "{t} revolutionary game changer technology unveiled",
+    "{t} provides corporate update to shareholders",
+]
+
+
+def filing_type(i: int, j: int) -> str:
+    """Every other ticker has a confirming 8-K, every fifth a shelf registration"""
+    if j == 0 and i % 2 == 0:
+        return '8-K'
+    if j == 3 and i % 5 == 0:
+        return 'S-3'
+    return ('10-Q', '4', 'SC 13G', '10-K')[j % 4]
+
+
+def make_results(count: int):
+    """Scored results shaped like the pipeline's, generated lazily"""
+    scorer = BatchScorer()
+    now = datetime.now()
+
+    for i in range(count):
+        ticker = f"Q{i:05d}"
+        news = {'ticker': ticker, 'headline': HEADLINES[i % len(HEADLINES)].format(t=ticker),
+                'url': f"https://example.com/{ticker}", 'published_time': now - timedelta(hours=i % 24)}
+        filings = [
+            {'ticker': ticker, 'filing_type': filing_type(i, j), 'filing_date': now - timedelta(days=9 * j),
+             'filing_url': f"https://www.sec.gov/Archives/edgar/data/{i}/{i:010d}-24-{j:06d}-index.htm"}
+            for j in range(40)
+        ]
+        features = extract_features(news, filings, now=now)
+        score = scorer.score(FeatureBatch.from_features([features]))
+
+        yield {
+            'ticker': ticker, 'score': float(score[0]), 'tier': str(scorer.tiers(score)[0]),
+            'headline': news['headline'], 'news_url': news['url'], 'published_time': news['published_time'],
+            'filing_url': filings[0]['filing_url'], 'filings': filings, 'features': features, 'data_gaps': [],
+        }
+
+
+def in_memory(count: int):
+    """Collect everything, then rank (what run_scan does without the log)"""
+    results = list(make_results(count))
+    batch = FeatureBatch.from_features([r['features'] for r in results])
+    scorer = BatchScorer()
+    return [results[i] for i in scorer.rank(scorer.score(batch))]
+
+
+def streamed(count: int, directory: str, compress: bool):
+    os.makedirs(directory, exist_ok=True)
+    log = ResultLog(tempfile.mkdtemp(dir=directory), compress=compress, max_bytes=8 * 1024 * 1024)
+    log.begin_scan()
+    for result in make_results(count):
+        log.add(result)
+    log.close()
+    return rank_records(log.read_scan()), log
+
+
+def measure(func, *args):
+    """Run once for wall time, once more under tracemalloc for peak memory"""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    value = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+def run(count: int = 10000):
+    ScanParameters.MIN_SCORE_THRESHOLD = 30
+    print(f"{count} results, 40 filings each, threshold {ScanParameters.MIN_SCORE_THRESHOLD}:")
+
+    baseline, elapsed, peak = measure(in_memory, count)
+    print(f"  in memory, rank at the end     {elapsed:6.2f} s  peak {peak:7.1f} MB  {len(baseline)} ranked")
+    baseline = [(r['ticker'], r['score']) for r in baseline]
+
+    with tempfile.TemporaryDirectory() as work:
+        for compress in (False, True):
+            directory = os.path.join(work, 'gz' if compress else 'plain')
+            (ranked, log), elapsed, peak = measure(streamed, count, directory, compress)
+            paths = log.paths
+            size = sum(os.path.getsize(path) for path in paths) / 1024 / 1024
+            same = [(r['ticker'], r['score']) for r in ranked] == baseline
+            label = 'JSONL.gz log' if compress else 'JSONL log'
+            print(f"  {label:13s} + rank from disk {elapsed:6.2f} s  peak {peak:7.1f} MB  "
+                  f"{size:5.1f} MB in {len(paths)} file(s)  same ranking: {same}")
+
+            # A killed scan: chop the last file mid-record and read what survived
+            last = paths[-1]
+            with open(last, 'r+b') as f:
+                f.truncate(os.path.getsize(last) * 2 // 3)
+            survived = sum(1 for _ in read_records(paths, scan=log.scan))
+            print(f"  {'':13s}   last file cut to 2/3: {survived} of {count} records still readable")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,130 @@
+"""
+PennyStalker - Scan Priority Benchmark
+News order vs. best-pre-score-first scheduling, with and without a deadline
+
+A rate-limited SEC (a throttled day) and a news feed where strong catalysts,
+partnerships, corporate updates and promotional fluff arrive shuffled. For
+each order: how long until every ticker of the final top 10 is scored, and
+how many of them a deadline run returns.
+
+Usage: python -m benchmarks.bench_scan_priority [deadline_seconds] [requests_per_second]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.fixtures import company_tickers_json, edgar_browse_page, fake_cik, filing_index_page
+from benchmarks.stub_server import StubServer
+from config_files import ScanParameters
+from pipeline import ScanPipeline
+from scrapers import SECScraper
+from scrapers.cik_index import CIKIndex
+
+HEADLINES = [
+    "${t} receives FDA approval for lead candidate",
+    "${t} announces strategic partnership with major distributor",
+    "${t} provides corporate update to shareholders",
+    "${t} revolutionary game changer technology unveiled",
+]
+INDEX_PATH = re.compile(r'/data/(\d+)/\d+/([\d-]+)-index\.htm$')
+DOCUMENT = b'<html><body><p>Quarterly report. Nothing to see.</p></body></html>'
+TOP_N = 10
+
+
+def make_route(tickers):
+    tickers_file = company_tickers_json(tickers).encode()
+    by_cik = {fake_cik(t): t for t in tickers}
+    html = {'Content-Type': 'text/html'}
+
+    def route(path, query):
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        if path.endswith('/browse-edgar'):
+            ticker = by_cik[int(query['CIK'][0])]
+            # Half the issuers file often (recent offerings), half rarely
+            days_apart = 3 if int(ticker[1:]) % 2 else 40
+            return 200, html, edgar_browse_page(ticker, rows=10, days_apart=days_apart).encode()
+        match = INDEX_PATH.search(path)
+        if match:
+            return 200, html, filing_index_page(int(match.group(1)), match.group(2)).encode()
+        if path.endswith('.htm'):
+            return 200, html, DOCUMENT
+        return None
+
+    return route
+
+
+def make_scraper(server, cache_dir, rate):
+    scraper = SECScraper()
+    scraper.http_cache = None  # Every run pays for its requests
+    scraper.filing_ledger = None
+    scraper.filing_store = None
+    scraper.filings_backend = 'html'
+    scraper.base_url = server.url
+    scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+    scraper.rate_limiter.configure(server.url, rate)
+    scraper.cik_index = CIKIndex(os.path.join(cache_dir, 'cik_index.tsv'))
+    scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+    scraper.cik_index.ensure_fresh(scraper)
+    return scraper
+
+
+def scan(scraper, news, prioritized: bool, deadline_seconds=None):
+    """One pipeline run; returns {ticker: (score, seconds after start)}"""
+    scraper.clear_memo()
+    pipeline = ScanPipeline(sec=scraper)
+    if not prioritized:
+        pipeline.scorer.prescore = lambda headlines: np.zeros(len(headlines))  # Equal - news order stays
+
+    start = time.perf_counter()
+    finished = {}
+    deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+    pipeline.run([news], lambda r: finished.__setitem__(r['ticker'], (r['score'], time.perf_counter() - start)),
+                 deadline=deadline)
+    return finished
+
+
+def run(deadline_seconds: float = 3.0, rate: float = 20):
+    tickers = [f"Q{i:03d}" for i in range(48)]
+    now = datetime.now()
+    news = [
+        {'ticker': t, 'ticker_source': 'dollar', 'headline': HEADLINES[i % len(HEADLINES)].format(t=t),
+         'url': f"https://example.com/{t}", 'published_time': now, 'source': 'StockTitan'}
+        for i, t in enumerate(tickers)
+    ]
+    random.Random(7).shuffle(news)
+    ScanParameters.MAX_CANDIDATES = len(news)
+
+    with StubServer(make_route(tickers), latency=0.02) as server, tempfile.TemporaryDirectory() as cache_dir:
+        scraper = make_scraper(server, cache_dir, rate)
+
+        full = scan(scraper, news, prioritized=True)
+        best = sorted(full, key=lambda t: -full[t][0])[:TOP_N]
+        cutoff = full[best[-1]][0]
+        top = [t for t in full if full[t][0] >= cutoff]  # Everyone tied with the 10th counts
+
+        print(f"{len(news)} tickers, SEC at {rate:g} req/s, top {TOP_N} scores >= {cutoff:.0f} "
+              f"({len(top)} tickers), full scan {max(s for _, s in full.values()):.1f} s")
+
+        for label, prioritized in (('news order', False), ('pre-score first', True)):
+            finished = scan(scraper, news, prioritized)
+            top_done = max(finished[t][1] for t in top)
+
+            bounded = scan(scraper, news, prioritized, deadline_seconds)
+            found = sum(1 for t in top if t in bounded)
+            print(f"  {label:16s} top {TOP_N} all scored after {top_done:5.1f} s  |  "
+                  f"{deadline_seconds:g} s deadline: {len(bounded):2d} scored, {found}/{len(top)} of the top")
+
+        scraper.close()
+
+
+if __name__ == '__main__':
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 3.0,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,92 @@
+"""
+PennyStalker - Startup Budget Check
+Import time of the command line entry points, with a budget to check against
+
+Each measurement runs in a fresh interpreter. `import main` must stay under
+the budget and must not load the scraping / scoring stacks - history queries
+and --help only need config and sqlite. Exits non-zero when over budget, so
+it can gate a change:
+
+Usage: python -m benchmarks.bench_startup [budget_ms]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that `import main` must leave alone
+HEAVY = ('requests', 'bs4', 'lxml', 'numpy')
+
+DEFAULT_BUDGET_MS = 30.0
+RUNS = 7
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of a module in a fresh interpreter (-X importtime)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+
+def loaded_after(statement: str) -> list:
+    """Heavy modules present after running a statement in a fresh interpreter"""
+    check = f"{statement}; import sys; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def wall_ms(args, env=None) -> float:
+    """Median wall time of a command, process start to exit"""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, env=env)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run(budget_ms: float = DEFAULT_BUDGET_MS) -> int:
+    failures = []
+
+    # Best of a few - the first run pays for cold disk caches
+    main_ms = min(import_time_ms('main') for _ in range(3))
+    heavy = loaded_after('import main')
+    print(f"import main              {main_ms:6.1f} ms  (budget {budget_ms:.0f} ms)  heavy modules: {heavy or 'none'}")
+    if main_ms > budget_ms:
+        failures.append(f"import main took {main_ms:.1f} ms")
+    if heavy:
+        failures.append(f"import main loaded {', '.join(heavy)}")
+
+    # The score subcommand needs the pipeline, but not the BeautifulSoup fallbacks
+    pipeline_ms = min(import_time_ms('pipeline') for _ in range(3))
+    heavy = loaded_after('import pipeline')
+    print(f"import pipeline (score)  {pipeline_ms:6.1f} ms  loads: {', '.join(heavy)}")
+    if 'bs4' in heavy:
+        failures.append("the score path loaded bs4")
+
+    with tempfile.TemporaryDirectory() as work:
+        env = {**os.environ, 'HISTORY_DB': os.path.join(work, 'history.sqlite3')}
+        bare = wall_ms(['-c', 'pass'])
+        print(f"python -c pass           {bare:6.1f} ms")
+        for args in (['main.py', '--help'], ['main.py', '--history', 'ABCD']):
+            print(f"{' '.join(args):24s} {wall_ms(args, env):6.1f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} startup check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS))
@@ -0,0 +1,191 @@
+"""
+PennyStalker - Throttling Benchmark
+SEC filing fetches against a stub host that rate limits (429) or hangs
+
+Compares the old request behavior (no retries, no host pause or rate
+backoff, no circuit breaker: every failure is a missing filing list) against
+the adaptive policy. Each run is a fresh interpreter so host state starts clean.
+
+Also checks that a host recovers after its circuit opened, however the
+half-open trial request ends (a 429, or an unexpected exception).
+
+Usage: python -m benchmarks.bench_throttling [tickers]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import unquote
+
+from benchmarks.fixtures import edgar_browse_page, company_tickers_json
+from benchmarks.stub_server import StubServer
+
+SERVER_RATE = 4.0      # Requests per second the throttling host accepts
+HANG_SECONDS = 3.0     # How long the failing host holds a request
+COOLDOWN_SECONDS = 0.5  # Circuit breaker cooldown in the recovery check
+
+POLICIES = {
+    'fixed policy': {'MAX_RETRIES': '0', 'CIRCUIT_BREAKER_THRESHOLD': '1000000'},
+    'adaptive policy': {},
+}
+
+
+def make_route(tickers, scenario: str):
+    tickers_file = company_tickers_json(tickers).encode()
+    lock = threading.Lock()
+    window = {'start': time.monotonic(), 'count': 0}
+
+    def route(path, query):
+        if path.endswith('/company_tickers.json'):
+            return 200, {'Content-Type': 'application/json'}, tickers_file
+        if not path.endswith('/browse-edgar'):
+            return None
+
+        if scenario == 'throttled':
+            # Fixed one-second windows, like a simple server-side limiter
+            with lock:
+                now = time.monotonic()
+                if now - window['start'] >= 1.0:
+                    window['start'], window['count'] = now, 0
+                window['count'] += 1
+                if window['count'] > SERVER_RATE:
+                    return 429, {'Retry-After': '1'}, b'Too Many Requests'
+
+        if scenario == 'outage':
+            time.sleep(HANG_SECONDS)
+            return 503, {}, b'Service Unavailable'
+
+        company = unquote(query.get('CIK', ['X'])[0])
+        return 200, {'Content-Type': 'text/html'}, edgar_browse_page(company).encode()
+
+    return route
+
+
+def measure(scenario: str, ticker_count: int, adaptive: bool):
+    """Fetch every ticker's filings once in this process and print a JSON result line"""
+    from config_files import ScanParameters
+    from scrapers import SECScraper
+    from scrapers.cik_index import CIKIndex
+
+    tickers = [f"T{i:03d}" for i in range(ticker_count)]
+
+    with StubServer(make_route(tickers, scenario)) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        scraper = SECScraper()
+        scraper.http_cache = None
+        scraper.filing_ledger = None
+        scraper.filings_backend = 'html'
+        scraper.base_url = server.url
+        scraper.search_url = f"{server.url}/cgi-bin/browse-edgar"
+        scraper.rate_limiter.configure(server.url, ScanParameters.SEC_REQUESTS_PER_SECOND)
+        if not adaptive:
+            scraper.rate_limiter.throttle = lambda url, pause: None
+        scraper.cik_index = CIKIndex(os.path.join(cache_dir, 'cik_index.tsv'))
+        scraper.cik_index.url = f"{server.url}/files/company_tickers.json"
+        scraper.cik_index.ensure_fresh(scraper)
+        server.reset_count()
+
+        start = time.perf_counter()
+        results = scraper.get_filings_batch(tickers)
+        elapsed = time.perf_counter() - start
+
+        scraper.close()
+
+    print(json.dumps({
+        'seconds': elapsed,
+        'gaps': sum(1 for filings in results.values() if filings is None),
+        'requests': server.request_count,
+    }))
+
+
+def measure_trial(outcome: str):
+    """
+    Open a host's circuit with 500s, end the half-open trial with `outcome`,
+    then check that requests to the recovered host get through
+    """
+    from scrapers import SECScraper
+
+    state = {'status': 500}
+
+    def route(path, query):
+        return state['status'], {}, b'ok' if state['status'] == 200 else b'error'
+
+    with StubServer(route) as server:
+        scraper = SECScraper()
+        scraper.http_cache = None
+        scraper.rate_limiter.configure(server.url, 0)
+        url = f"{server.url}/ping"
+
+        for _ in range(2):
+            scraper.make_request(url)
+        time.sleep(COOLDOWN_SECONDS + 0.1)
+
+        if outcome == '429':
+            state['status'] = 429
+            scraper.make_request(url)
+        else:
+            request = scraper.session.request
+            scraper.session.request = lambda *args, **kwargs: 1 / 0
+            scraper.make_request(url)
+            scraper.session.request = request
+            time.sleep(COOLDOWN_SECONDS + 0.1)  # The failed trial reopened the circuit
+
+        state['status'] = 200
+        answered = sum(1 for _ in range(3) if scraper.make_request(url) is not None)
+        scraper.close()
+
+    print(json.dumps({'answered': answered}))
+
+
+def run_trials():
+    print(f"circuit recovery (threshold 2, cooldown {COOLDOWN_SECONDS:g}s, host healthy again after the trial):")
+
+    for outcome in ('429', 'exception'):
+        env = {
+            **os.environ, 'MAX_RETRIES': '0', 'CIRCUIT_BREAKER_THRESHOLD': '2',
+            'CIRCUIT_BREAKER_COOLDOWN': str(COOLDOWN_SECONDS), 'LOG_LEVEL': 'CRITICAL',
+        }
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_throttling', '--trial', outcome],
+            capture_output=True, text=True, check=True, env=env,
+        )
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        status = 'ok' if result['answered'] == 3 else 'HOST LOCKED OUT'
+        print(f"  trial ends with {outcome:9s} -> {result['answered']}/3 later requests answered  {status}")
+
+
+def run(ticker_count: int = 40):
+    for scenario in ('throttled', 'outage'):
+        detail = (f"host accepts {SERVER_RATE:g} req/s, client paced at 10/s" if scenario == 'throttled'
+                  else f"host hangs {HANG_SECONDS:g}s then 503s, REQUEST_TIMEOUT=2")
+        print(f"{scenario} ({ticker_count} tickers, {detail}):")
+
+        for label, overrides in POLICIES.items():
+            env = {
+                **os.environ, **overrides,
+                'REQUEST_TIMEOUT': '2', 'RETRY_BACKOFF_SECONDS': '0.5',
+                'SEC_REQUESTS_PER_SECOND': '10', 'LOG_LEVEL': 'CRITICAL',
+            }
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_throttling', '--measure', scenario,
+                 str(ticker_count), label],
+                capture_output=True, text=True, check=True, env=env,
+            )
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            print(f"  {label:24s} {result['seconds']:6.2f} s  {result['gaps']:3d} missing filing lists  "
+                  f"{result['requests']:4d} requests")
+
+    run_trials()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(sys.argv[2], int(sys.argv[3]), adaptive=sys.argv[4] == 'adaptive policy')
+    elif len(sys.argv) > 1 and sys.argv[1] == '--trial':
+        measure_trial(sys.argv[2])
+    else:
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,116 @@
+"""
+PennyStalker - Ticker Extraction Benchmark
+Three regexes per headline (the old extractor) vs. the batch extractor
+
+Headlines follow common press-release shapes: $TICKER, (EXCHANGE: TICKER),
+a bare symbol, or no symbol at all (company name only - nothing to find).
+The acronyms in them are drawn from ones press releases use, most of which
+are NOT in Patterns.TICKER_STOP_WORDS, so the stop list alone doesn't make
+the bogus-ticker count look good. What matters most is the bogus tickers -
+symbols the headline isn't about, each of which costs SEC requests
+downstream; speed is a few microseconds per headline either way.
+
+Usage: python -m benchmarks.bench_ticker_extraction
+"""
+
+import random
+import re
+import time
+
+from scrapers.tickers import TickerExtractor
+
+OLD_TICKER = re.compile(r'\b[A-Z]{1,5}\b(?=\s|$|:|\))')
+OLD_DOLLAR = re.compile(r'\$([A-Z]{1,5})\b')
+OLD_PARENS = re.compile(r'\(([A-Z]+):\s*([A-Z]{1,5})\)')
+
+# (template, names its ticker); {acr} is a press-release acronym
+TEMPLATES = [
+    ("${t} Shares Jump After {acr} Update", True),
+    ("${t} Signs {acr} With {other} for Phase 2 Study", True),
+    ("{name} (NASDAQ: {t}) Announces {acr} Results for Q3 2024", True),
+    ("{name} (OTCQB: {t}) Enters {acr} Agreement With {other}", True),
+    ("{name} (NYSE American: {t}) Reports Q2 Results", True),
+    ("{t} Stock Soars After {acr} Data Presented at ASCO", True),
+    ("{t}: {acr} Approval Expected in Q1", True),
+    ("{name} ({t}) Announces Closing of {acr} Deal", True),
+    ("{name} Announces Pricing of $5 Million Registered Direct Offering", False),
+    ("{name} Presents New {acr} Data at H.C. Wainwright Conference", False),
+    ("{name} Receives {acr} Clearance, Shares HALTED Pending News", False),
+    ("{name} Files Form 10-Q; {acr} Update Expected", False),
+]
+WORDS = ['Biotech', 'Therapeutics', 'Energy', 'Mining', 'Labs', 'Holdings']
+# Common in press releases; only FDA and CEO are on the stop list
+ACRONYMS = ['FDA', 'CEO', 'GAAP', 'LOI', 'KOL', 'NFT', 'EU', 'UK', 'CMS', 'DOD', 'NASA', 'PDUFA',
+            'MOU', 'API', 'SAAS', 'FAQ', 'CRO', 'GMP', 'ANDA', 'BTC', 'LNG', 'EBITDA', 'CAGR', 'HIV']
+
+
+def old_extract(text):
+    """The original per-headline extractor"""
+    tickers = set(OLD_DOLLAR.findall(text))
+    tickers.update(match[1] for match in OLD_PARENS.findall(text))
+
+    if not tickers:
+        false_positives = {
+            'THE', 'AND', 'FOR', 'INC', 'LLC', 'USA', 'CEO', 'CFO',
+            'FDA', 'SEC', 'IPO', 'NYSE', 'NASDAQ', 'OTC', 'ETF',
+            'NEWS', 'STOCK', 'MARKET', 'ABOUT', 'WILL', 'HAVE'
+        }
+        tickers.update(t for t in OLD_TICKER.findall(text) if t not in false_positives and 1 <= len(t) <= 5)
+
+    return list(tickers)
+
+
+def make_headlines(count: int, symbols):
+    """Headlines plus the ticker each one names (None when it names none)"""
+    rng = random.Random(11)
+    headlines, truth = [], []
+    for _ in range(count):
+        ticker = rng.choice(symbols)
+        template, names_ticker = rng.choice(TEMPLATES)
+        name = f"{rng.choice(['Nova', 'Apex', 'Blue Ridge', 'Kestrel', 'Orion'])} {rng.choice(WORDS)} Inc."
+        headlines.append(template.format(t=ticker, name=name, acr=rng.choice(ACRONYMS),
+                                         other=f"{rng.choice(WORDS)} Corp"))
+        truth.append(ticker if names_ticker else None)
+    return headlines, truth
+
+
+def run():
+    rng = random.Random(5)
+    acronyms = set(ACRONYMS)
+    symbols = sorted({''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(2, 4)))
+                      for _ in range(3000)} - acronyms)
+    known = frozenset(symbols)
+
+    print("Extraction time per headline:")
+    for count in (50, 1000, 10000, 100000):
+        headlines, _ = make_headlines(count, symbols)
+
+        start = time.perf_counter()
+        for headline in headlines:
+            old_extract(headline)
+        old = (time.perf_counter() - start) / count * 1e6
+
+        extractor = TickerExtractor(known)
+        start = time.perf_counter()
+        extractor.extract_batch(headlines)
+        batch = (time.perf_counter() - start) / count * 1e6
+
+        print(f"  {count:>6} headlines   per headline {old:6.2f} us   batch {batch:6.2f} us  ({old / batch:.1f}x)")
+
+    headlines, truth = make_headlines(5000, symbols)
+    named = sum(1 for ticker in truth if ticker)
+    print(f"\n5000 headlines, {named} naming a ticker:")
+
+    results = {
+        'per headline (old)': [old_extract(headline) for headline in headlines],
+        'batch, stop words': [[t for t, _ in found] for found in TickerExtractor().extract_batch(headlines)],
+        'batch, known symbols': [[t for t, _ in found] for found in TickerExtractor(known).extract_batch(headlines)],
+    }
+    for label, found in results.items():
+        bogus = sum(1 for tickers, ticker in zip(found, truth) for t in tickers if t != ticker)
+        missed = sum(1 for tickers, ticker in zip(found, truth) if ticker and ticker not in tickers)
+        print(f"  {label:22s} {bogus:5d} bogus  {missed:4d} missed")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,248 @@
+"""
+PennyStalker - Benchmark Fixtures
+Builds EDGAR-shaped pages so benchmarks run without touching the internet
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+FORMS = ['8-K', '10-Q', 'S-3', '424B5', '8-K', 'S-8', '10-K', 'DEF 14A']
+
+# Days between filings for the three kinds of issuer filing_cadence hands out:
+# the 424B5 (4th row) lands on day 9, day 36 or day 120 - only active offerings
+# have one inside the 30-day lookback, the others need their filing texts read
+CADENCES = (3, 12, 40)  # Active offering / occasional filer / quiet filer
+
+
+def fake_cik(ticker: str) -> int:
+    """Deterministic CIK for a made-up ticker"""
+    cik = 0
+    for char in ticker:
+        cik = cik * 31 + ord(char)
+    return 1000000 + cik % 8999999
+
+
+def filing_cadence(ticker: str) -> float:
+    """Days between a made-up issuer's filings (edgar_browse_page days_apart), a third of issuers each"""
+    return CADENCES[fake_cik(ticker) % len(CADENCES)]
+
+
+def accession(cik: int, seq: int) -> str:
+    """Accession number in EDGAR's 0000000000-YY-NNNNNN format"""
+    return f"{cik:010d}-24-{seq:06d}"
+
+
+def edgar_browse_page(ticker: str, rows: int = 40, today: datetime = None,
+                      start: int = 0, total: int = None, days_apart: float = 3) -> str:
+    """
+    Company filings page as returned by browse-edgar?action=getcompany
+
+    Args:
+        ticker: Ticker the page is for
+        rows: Number of filing rows (EDGAR's count parameter)
+        today: Date of the newest filing (default: now)
+        start: Row offset (EDGAR's start parameter)
+        total: Filings the company has in all - caps the page and numbers
+            accessions oldest first, so adding a filing keeps the others stable
+        days_apart: Days between consecutive filings
+    """
+    today = today or datetime.now()
+    cik = fake_cik(ticker)
+    end = start + rows if total is None else min(start + rows, total)
+
+    body = []
+    for i in range(start, end):
+        acc = accession(cik, total - i if total is not None else i + 1)
+        date = (today - timedelta(days=i * days_apart)).strftime('%Y-%m-%d')
+        href = f"/Archives/edgar/data/{cik}/{acc.replace('-', '')}/{acc}-index.htm"
+        body.append(
+            f'<tr><td nowrap="nowrap">{FORMS[i % len(FORMS)]}</td>'
+            f'<td nowrap="nowrap"><a href="{href}" id="documentsbutton">&nbsp;Documents</a></td>'
+            f'<td class="small">Current report<br/>Acc-no: {acc}&nbsp;(34 Act)&nbsp; Size: 312 KB</td>'
+            f'<td>{date}</td><td><a href="/cgi-bin/browse-edgar?filenum=001">001-38000</a></td></tr>'
+        )
+
+    return (
+        '<html><head><title>EDGAR Search Results</title></head><body>'
+        f'<div class="companyInfo"><span class="companyName">{ticker} CORP CIK#: {cik:010d}</span></div>'
+        '<div id="seriesDiv"><table class="tableFile2" summary="Results">'
+        '<tr><th>Filings</th><th>Format</th><th>Description</th><th>Filing Date</th><th>File/Film Number</th></tr>'
+        + ''.join(body) +
+        '</table></div></body></html>'
+    )
+
+
+def company_tickers_json(tickers: List[str]) -> str:
+    """SEC company_tickers.json for a list of made-up tickers"""
+    return json.dumps({
+        str(i): {'cik_str': fake_cik(t), 'ticker': t, 'title': f"{t} Corp"}
+        for i, t in enumerate(tickers)
+    })
+
+
+def submissions_json(company: str, rows: int = 1000, today: datetime = None) -> str:
+    """
+    data.sec.gov submissions document with the same filings as edgar_browse_page
+
+    Args:
+        company: Ticker or CIK the document is for
+        rows: Number of recent filings listed
+        today: Date of the newest filing (default: now)
+    """
+    today = today or datetime.now()
+    cik = fake_cik(company)
+
+    accessions = [accession(cik, i + 1) for i in range(rows)]
+    return json.dumps({
+        'cik': str(cik),
+        'name': f"{company} CORP",
+        'tickers': [company],
+        'filings': {
+            'recent': {
+                'accessionNumber': accessions,
+                'filingDate': [(today - timedelta(days=i * 3)).strftime('%Y-%m-%d') for i in range(rows)],
+                'form': [FORMS[i % len(FORMS)] for i in range(rows)],
+                'primaryDocument': [f"doc{i}.htm" for i in range(rows)],
+            },
+            'files': [],
+        },
+    })
+
+
+def company_index_rows(company: str, rows: int = 60, today: datetime = None) -> List[tuple]:
+    """
+    Master index rows with the same filings as edgar_browse_page / submissions_json
+
+    Returns:
+        (cik, form_type, 'YYYY-MM-DD', accession) per filing, newest first
+    """
+    today = today or datetime.now()
+    cik = fake_cik(company)
+    return [
+        (cik, FORMS[i % len(FORMS)], (today - timedelta(days=i * 3)).strftime('%Y-%m-%d'), accession(cik, i + 1))
+        for i in range(rows)
+    ]
+
+
+def master_index(rows: List[tuple], daily: bool = False) -> str:
+    """
+    EDGAR master index file (full-index/YYYY/QTRn/master.idx)
+
+    Args:
+        rows: (cik, form_type, 'YYYY-MM-DD', accession) per filing
+        daily: Write dates as YYYYMMDD, like daily-index/.../master.YYYYMMDD.idx
+    """
+    header = (
+        "Description:           Master Index of EDGAR Dissemination Feed\n"
+        "Last Data Received:    \n"
+        "Comments:              webmaster@sec.gov\n"
+        "Anonymous FTP:         ftp://ftp.sec.gov/edgar/\n"
+        "\n\n\n"
+        "CIK|Company Name|Form Type|Date Filed|Filename\n"
+        + '-' * 80 + "\n"
+    )
+    lines = [
+        f"{cik}|COMPANY {cik} INC|{form}|{day.replace('-', '') if daily else day}|edgar/data/{cik}/{acc}.txt\n"
+        for cik, form, day, acc in rows
+    ]
+    return header + ''.join(lines)
+
+
+def daily_index_listing(names: List[str]) -> str:
+    """daily-index/YYYY/QTRn/index.json directory listing"""
+    return json.dumps({
+        'directory': {
+            'item': [{'name': name, 'type': 'file', 'href': name} for name in names],
+            'name': 'daily-index/',
+            'parent-dir': '../',
+        }
+    })
+
+
+def filing_index_page(cik: int, acc: str, documents: int = 6) -> str:
+    """
+    Filing index page (the -index.htm the documents button links to)
+    The primary document is an inline XBRL file linked through the /ix viewer
+
+    Args:
+        cik: Company CIK
+        acc: Accession number
+        documents: Rows in the document table (primary document first)
+    """
+    folder = f"/Archives/edgar/data/{cik}/{acc.replace('-', '')}"
+    rows = []
+    for i in range(documents):
+        name = 'primary.htm' if i == 0 else f"ex{i:02d}.htm"
+        href = f"/ix?doc={folder}/{name}" if i == 0 else f"{folder}/{name}"
+        rows.append(
+            f'<tr><td scope="row">{i + 1}</td><td scope="row">Exhibit {i}</td>'
+            f'<td scope="row"><a href="{href}">{name}</a></td>'
+            f'<td scope="row">{FORMS[i % len(FORMS)]}</td><td scope="row">{20000 + i * 731}</td></tr>'
+        )
+
+    return (
+        '<html><head><title>EDGAR Filing Documents</title></head><body>'
+        f'<div id="formDiv"><div class="formGrouping"><div class="infoHead">Filing Date</div>'
+        f'<div class="info">2024-01-02</div></div>'
+        '<table class="tableFile" summary="Document Format Files">'
+        '<tr><th scope="col">Seq</th><th scope="col">Description</th><th scope="col">Document</th>'
+        '<th scope="col">Type</th><th scope="col">Size</th></tr>'
+        + ''.join(rows) +
+        '</table></div></body></html>'
+    )
+
+
+def large_filing_html(target_bytes: int = 5 * 1024 * 1024) -> str:
+    """
+    S-1 style filing document of roughly the requested size
+    Markup-heavy like EDGAR's HTML exports: styled tables, inline XBRL-ish spans, scripts
+    """
+    head = (
+        '<html><head><title>S-1 Registration Statement</title>'
+        '<style>td { font-family: Times New Roman; font-size: 10pt }</style>'
+        '<script>var viewer = { page: 1 };</script></head><body>'
+    )
+    paragraph = (
+        '<p style="margin-top:6pt;text-align:justify"><span style="font-family:Times New Roman">'
+        'We may offer and sell from time to time up to $50,000,000 of our common stock, '
+        'warrants and units in one or more offerings. This prospectus describes the general '
+        'terms of these securities.</span></p>'
+    )
+    row = (
+        '<tr><td style="width:40%;padding:2pt"><span style="font-size:10pt">Net proceeds</span></td>'
+        '<td style="text-align:right"><span>$</span></td><td style="text-align:right">12,345,678</td></tr>'
+    )
+    block = paragraph + '<table cellpadding="0" cellspacing="0">' + row * 20 + '</table>'
+
+    parts = [head]
+    size = len(head)
+    while size < target_bytes:
+        parts.append(block)
+        size += len(block)
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def stocktitan_page(items: List[dict]) -> str:
+    """
+    StockTitan live news page
+
+    Args:
+        items: Dicts with ticker, headline and optional age text / slug
+    """
+    entries = []
+    for item in items:
+        words = ''.join(c if c.isalnum() else ' ' for c in item['headline'].lower()).split()
+        slug = item.get('slug', f"{item['ticker']}/{'-'.join(words)}")
+        entries.append(
+            f'<div class="link-block"><a href="/news/{slug}.html">'
+            f'<div class="title">{item["headline"]}</div></a>'
+            f'<span class="time">{item.get("age", "5 minutes ago")}</span></div>'
+        )
+
+    return (
+        '<html><head><title>Live Stock News</title></head><body><div class="news-list">'
+        + ''.join(entries) +
+        '</div></body></html>'
+    )
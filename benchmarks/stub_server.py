@@ -0,0 +1,103 @@
+"""
+PennyStalker - Stub HTTP Server
+Local stand-in for StockTitan and SEC Edgar used by the benchmarks
+"""
+
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+# A route gets (path, query) and returns (status, headers, body) or None for 404
+Route = Callable[[str, Dict[str, list]], Optional[Tuple[int, Dict[str, str], bytes]]]
+
+
+class _QuietServer(ThreadingHTTPServer):
+    """Clients abandoning streamed downloads is expected - don't print tracebacks"""
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class StubServer:
+    """
+    Threaded HTTP server that answers from a route function
+    Adds a fixed latency per request, counts requests and answers
+    If-None-Match with 304 when the route sets an ETag
+    """
+
+    def __init__(self, route: Route, latency: float = 0.0):
+        """
+        Args:
+            route: Function that builds the response for a request
+            latency: Seconds to sleep before answering (simulated network)
+        """
+        self.route = route
+        self.latency = latency
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.httpd = _QuietServer(('127.0.0.1', 0), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+            wbufsize = 1 << 16  # Send headers and body in one write
+
+            def do_GET(self):
+                with server.lock:
+                    server.request_count += 1
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parsed = urlparse(self.path)
+                result = server.route(parsed.path, parse_qs(parsed.query))
+                status, headers, body = result or (404, {}, b'Not Found')
+
+                # Honor revalidation like a real server would
+                etag = headers.get('ETag')
+                if etag and self.headers.get('If-None-Match') == etag:
+                    status, body = 304, b''
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+    def reset_count(self):
+        """Zero the request counter"""
+        with self.lock:
+            self.request_count = 0
+
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,418 @@
+"""
+PennyStalker - Benchmark Suite
+Offline end-to-end numbers for the scrapers and the scoring stages
+
+Everything runs against the local stub server replaying StockTitan live
+pages, EDGAR company pages, filing index pages and filing documents built
+by benchmarks.fixtures - no internet needed. Measured:
+
+- parse throughput for each page type and for filing documents
+- feature extraction and batch scoring throughput
+- full scans (StockTitan -> SEC -> analysis -> ranking) at 10/100/1000
+  tickers: wall time, requests per scan (by page type), peak memory,
+  cold (empty cache) and warm (second scan, cache filled)
+
+Issuers are a mix of active offerings (decided without reading filing
+texts) and occasional / quiet filers (texts read), so a cold scan has to
+download documents and skip some - the suite fails if it doesn't.
+
+Rate limits are switched off so the numbers reflect this code rather than
+the SEC's 10 requests/second ceiling. Each scan size runs in a fresh
+interpreter. Results go to a JSON file; --compare checks them against an
+earlier file and exits non-zero on regressions.
+
+Usage:
+    python -m benchmarks.suite [--sizes 10 100 1000] [--latency 0.005] [--output FILE]
+    python -m benchmarks.suite --compare OLD.json [NEW.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from benchmarks.fixtures import (
+    accession, company_tickers_json, edgar_browse_page, fake_cik, filing_cadence,
+    filing_index_page, large_filing_html, stocktitan_page,
+)
+from benchmarks.stub_server import StubServer
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+HEADLINES = [
+    "${t} receives FDA approval for lead candidate",
+    "${t} announces strategic partnership with major distributor",
+    "${t} reports record quarterly revenue growth",
+    "${t} revolutionary game changer technology unveiled",
+    "${t} announces pricing of public offering",
+    "${t} enters definitive merger agreement",
+    "${t} provides corporate update to shareholders",
+]
+
+# Regressions beyond this fraction fail --compare (request counts must not grow at all)
+TOLERANCE = 0.2
+
+
+def bench_tickers(count: int) -> List[str]:
+    """Letters-only symbols (the ticker patterns don't match digits)"""
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    tickers = []
+    for i in range(count):
+        a, rest = divmod(i, 26 * 26)
+        b, c = divmod(rest, 26)
+        tickers.append(f"Q{letters[a % 26]}{letters[b]}{letters[c]}")
+    return tickers
+
+
+def news_items(tickers: List[str]) -> List[Dict]:
+    """One article per ticker spread over the last few hours"""
+    return [
+        {'ticker': t, 'headline': HEADLINES[i % len(HEADLINES)].replace('{t}', t),
+         'age': f"{(i * 7) % 600 + 1} minutes ago"}
+        for i, t in enumerate(tickers)
+    ]
+
+
+class ReplaySite:
+    """
+    Every page a scan can request, rendered up front and served by path
+    Counts requests per page type
+    """
+
+    def __init__(self, tickers: List[str], document_kb: int, today: datetime):
+        self.requests = Counter()
+        self.lock = threading.Lock()
+
+        self.live = stocktitan_page(news_items(tickers)).encode()
+        self.tickers_file = company_tickers_json(tickers).encode()
+        self.document = large_filing_html(document_kb * 1024).encode()
+
+        self.browse = {}
+        self.index = {}
+        for ticker in tickers:
+            cik = fake_cik(ticker)
+            self.browse[f"{cik:010d}"] = edgar_browse_page(
+                ticker, today=today, days_apart=filing_cadence(ticker)).encode()
+            for seq in range(1, 41):
+                acc = accession(cik, seq)
+                path = f"/Archives/edgar/data/{cik}/{acc.replace('-', '')}/{acc}-index.htm"
+                self.index[path] = filing_index_page(cik, acc).encode()
+
+    def _count(self, kind: str):
+        with self.lock:
+            self.requests[kind] += 1
+
+    def route(self, path, query):
+        html = {'Content-Type': 'text/html; charset=utf-8'}
+
+        if path.endswith('/live.html'):
+            self._count('stocktitan')
+            return 200, html, self.live
+        if path.endswith('/company_tickers.json'):
+            self._count('ticker_index')
+            return 200, {'Content-Type': 'application/json'}, self.tickers_file
+        if path.endswith('/browse-edgar'):
+            self._count('company_page')
+            page = self.browse.get(query.get('CIK', [''])[0])
+            return (200, html, page) if page else None
+        if path.endswith('-index.htm'):
+            self._count('filing_index')
+            page = self.index.get(path)
+            return (200, html, page) if page else None
+        if path.endswith('.htm'):
+            self._count('document')
+            return 200, html, self.document
+        return None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ----------------------------------------------------------------------
+# Scans (run in a child interpreter per size)
+# ----------------------------------------------------------------------
+
+def measure_scan(ticker_count: int, latency: float, document_kb: int):
+    """Cold + warm scan in this process, printing one JSON line"""
+    tickers = bench_tickers(ticker_count)
+    site = ReplaySite(tickers, document_kb, datetime.now())
+
+    with StubServer(site.route, latency=latency) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        # Config is read at import, so point it at the stub before importing anything
+        os.environ.update({
+            'STOCKTITAN_NEWS_URL': f"{server.url}/news/live.html",
+            'SEC_SEARCH_URL': f"{server.url}/cgi-bin/browse-edgar",
+            'SEC_BASE_URL': server.url,
+            'SEC_SUBMISSIONS_URL': f"{server.url}/submissions",
+            'SEC_COMPANY_TICKERS_URL': f"{server.url}/files/company_tickers.json",
+            'CACHE_DIR': cache_dir,
+            'METRICS_DIR': cache_dir,
+            'REQUEST_DELAY': '0',
+            'SEC_REQUESTS_PER_SECOND': '0',
+            'MAX_CANDIDATES': str(ticker_count),
+            'NEWS_ENTRY_LIMIT': str(ticker_count),
+            'NEWS_BACKFILL_PAGES': '0',  # One page holds every ticker
+        })
+
+        from metrics import get_metrics
+        from pipeline import run_scan
+
+        baseline_mb = peak_rss_mb()
+        runs = {}
+
+        for label in ('cold', 'warm'):
+            site.requests.clear()
+            scored = []
+
+            start = time.perf_counter()
+            ranked = run_scan(on_result=scored.append)
+            elapsed = time.perf_counter() - start
+
+            runs[label] = {
+                'seconds': elapsed,
+                'tickers_per_second': len(scored) / elapsed if elapsed else 0.0,
+                'requests': sum(site.requests.values()),
+                'requests_per_ticker': sum(site.requests.values()) / max(1, len(scored)),
+                'requests_by_page': dict(site.requests),
+                'scored': len(scored),
+                'ranked': len(ranked),
+                'peak_rss_mb': peak_rss_mb() - baseline_mb,
+                'filing_texts_skipped': sum(
+                    series['value'] for series in get_metrics().summary().get('filing_texts_skipped_total', [])),
+            }
+
+    print(json.dumps(runs))
+
+
+def run_scans(sizes: List[int], latency: float, document_kb: int) -> List[Dict]:
+    scans = []
+    for size in sizes:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.suite', '--scan', str(size),
+             '--latency', str(latency), '--document-kb', str(document_kb)],
+            capture_output=True, text=True, env={**os.environ, 'LOG_LEVEL': 'WARNING'},
+        )
+        if output.returncode != 0:
+            print(output.stderr, file=sys.stderr)
+            raise SystemExit(f"Scan of {size} tickers failed")
+
+        runs = json.loads(output.stdout.strip().splitlines()[-1])
+        scans.append({'tickers': size, **runs})
+
+        cold, warm = runs['cold'], runs['warm']
+
+        # The fixtures mix issuers so both sides of the lazy filing text reads run
+        if not cold['requests_by_page'].get('document') or not cold['filing_texts_skipped']:
+            raise SystemExit(f"Scan of {size} tickers read {cold['requests_by_page'].get('document', 0)} "
+                             f"filing documents and skipped {cold['filing_texts_skipped']:g} - the suite "
+                             f"should exercise both")
+        print(f"  {size:5d} tickers: cold {cold['seconds']:7.2f} s ({cold['requests']} requests, "
+              f"+{cold['peak_rss_mb']:.0f} MB)  warm {warm['seconds']:6.2f} s ({warm['requests']} requests)")
+    return scans
+
+
+# ----------------------------------------------------------------------
+# Parsing and scoring (in this process)
+# ----------------------------------------------------------------------
+
+def throughput(func, min_seconds: float = 0.5) -> float:
+    """Calls per second, repeating until min_seconds have passed"""
+    func()  # Warm up
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls / elapsed
+
+
+def run_parsers(document_kb: int) -> Dict:
+    from config_files import ScanParameters
+    from scrapers import parsers
+    from scrapers.text_extract import extract_text
+
+    now = datetime.now()
+    cik = fake_cik('ABCD')
+    company = edgar_browse_page('ABCD').encode()
+    index = filing_index_page(cik, accession(cik, 1)).encode()
+    live = stocktitan_page(news_items(bench_tickers(50))).encode()
+    document = large_filing_html(document_kb * 1024).encode()
+    chunk = 64 * 1024
+
+    cases = {
+        'company_page': lambda: parsers.parse_filings_page(
+            company, 'utf-8', 'ABCD', now - timedelta(days=180), 'https://www.sec.gov'),
+        'filing_index': lambda: parsers.find_primary_document(index, 'utf-8'),
+        'stocktitan_live': lambda: parsers.parse_news_page(live, 'utf-8', now - timedelta(hours=24)),
+        'filing_document': lambda: extract_text(
+            (document[i:i + chunk] for i in range(0, len(document), chunk)),
+            ScanParameters.FILING_TEXT_MAX_CHARS, 'utf-8'),
+    }
+
+    results = {}
+    for name, func in cases.items():
+        results[name] = {'pages_per_second': throughput(func)}
+        print(f"  {name:16s} {results[name]['pages_per_second']:9.0f} pages/s")
+    return results
+
+
+def run_scoring() -> Dict:
+    from analyzer import BatchScorer, FeatureBatch, extract_features
+
+    now = datetime.now()
+    text = large_filing_html(64 * 1024)
+    items = news_items(bench_tickers(100))
+    filings = [
+        {'ticker': 'QAAA', 'filing_type': form, 'filing_date': now - timedelta(days=d),
+         'filing_url': f"https://www.sec.gov/{form}/{d}"}
+        for d, form in enumerate(['8-K', 'S-3', '424B5', '10-Q'])
+    ]
+    texts = {filings[1]['filing_url']: text}
+
+    features = [extract_features(item, filings, texts, now) for item in items]
+    per_second = throughput(lambda: [extract_features(item, filings, texts, now) for item in items]) * len(items)
+
+    batch = FeatureBatch.from_features(features * 1000)  # 100k candidates
+    scorer = BatchScorer()
+    score_seconds = 1 / throughput(lambda: scorer.rank(scorer.score(batch)))
+
+    print(f"  extract_features {per_second:9.0f} candidates/s")
+    print(f"  score + rank 100k {score_seconds * 1000:8.1f} ms")
+    return {
+        'extract_features': {'candidates_per_second': per_second},
+        'score_rank_100k': {'seconds': score_seconds},
+    }
+
+
+# ----------------------------------------------------------------------
+# Regression check
+# ----------------------------------------------------------------------
+
+def flatten(results: Dict) -> Dict[str, float]:
+    """Comparable metrics as 'section.name.metric' -> value"""
+    metrics = {}
+    for section in ('parsing', 'scoring'):
+        for name, values in results.get(section, {}).items():
+            for metric, value in values.items():
+                metrics[f"{section}.{name}.{metric}"] = value
+
+    for scan in results.get('scans', []):
+        for run in ('cold', 'warm'):
+            for metric in ('seconds', 'requests', 'peak_rss_mb'):
+                metrics[f"scan.{scan['tickers']}.{run}.{metric}"] = scan[run][metric]
+    return metrics
+
+
+def compare(old: Dict, new: Dict, tolerance: float = TOLERANCE) -> List[str]:
+    """
+    Metrics that got worse between two result files
+
+    Returns:
+        Human readable regression lines (empty if none)
+    """
+    old_metrics, new_metrics = flatten(old), flatten(new)
+    regressions = []
+
+    for name in sorted(old_metrics.keys() & new_metrics.keys()):
+        before, after = old_metrics[name], new_metrics[name]
+        higher_is_better = name.endswith('_per_second')
+
+        if name.endswith('.requests'):
+            worse = after > before
+        elif name.endswith('peak_rss_mb') and max(before, after) < 10:
+            worse = False  # Too small to measure reliably
+        elif higher_is_better:
+            worse = after < before * (1 - tolerance)
+        else:
+            worse = after > before * (1 + tolerance)
+
+        if worse:
+            regressions.append(f"{name}: {before:.4g} -> {after:.4g}")
+    return regressions
+
+
+def run_compare(old_path: str, new_path: str) -> int:
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    regressions = compare(old, new)
+    if not regressions:
+        print(f"No regressions ({new_path} vs {old_path})")
+        return 0
+
+    print(f"{len(regressions)} regressions ({new_path} vs {old_path}):")
+    for line in regressions:
+        print(f"  {line}")
+    return 1
+
+
+def latest_results() -> str:
+    files = sorted(f for f in os.listdir(RESULTS_DIR) if f.endswith('.json')) if os.path.isdir(RESULTS_DIR) else []
+    if not files:
+        raise SystemExit("No result files - run the suite first")
+    return os.path.join(RESULTS_DIR, files[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline PennyStalker benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help="tickers per scan")
+    parser.add_argument('--latency', type=float, default=0.005, help="stub server latency per request (s)")
+    parser.add_argument('--document-kb', type=int, default=256, help="size of each filing document")
+    parser.add_argument('--output', help="result file (default: benchmarks/results/suite_<time>.json)")
+    parser.add_argument('--compare', nargs='+', metavar='FILE',
+                        help="compare OLD [NEW] result files (NEW defaults to the latest run)")
+    parser.add_argument('--scan', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.scan:
+        measure_scan(args.scan, args.latency, args.document_kb)
+        return 0
+
+    if args.compare:
+        return run_compare(args.compare[0], args.compare[1] if len(args.compare) > 1 else latest_results())
+
+    print("Parsing:")
+    parsing = run_parsers(args.document_kb)
+    print("Scoring:")
+    scoring = run_scoring()
+    print(f"Scans ({args.latency * 1000:g} ms stub latency, {args.document_kb} KB documents):")
+    scans = run_scans(args.sizes, args.latency, args.document_kb)
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'latency': args.latency, 'document_kb': args.document_kb, 'sizes': args.sizes},
+        'parsing': parsing,
+        'scoring': scoring,
+        'scans': scans,
+    }
+
+    path = args.output or os.path.join(RESULTS_DIR, f"suite_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import os
+
+#twelfth we need our cache settings so repeat scans dont download everything again
+class CacheSettings:
+    # HTTP response cache (from .env or defaults)
+    HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE', 'true').lower() == 'true'
+    HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '200'))
+    
+    # Time-to-live in seconds by URL class - first matching substring wins
+    HTTP_CACHE_TTLS = [
+        ('/Archives/edgar/data/', 30 * 24 * 3600),  # Filed documents never change
+        ('/submissions/', 15 * 60),  # Filing lists
+        ('browse-edgar', 60 * 60),  # Company filing pages
+        ('company_tickers', 24 * 3600),  # Ticker -> CIK file
+        ('stocktitan', 60),  # Live news page is volatile
+    ]
+    HTTP_CACHE_DEFAULT_TTL = 5 * 60
+    
+    # Extracted filing text, keyed by accession number (filings never change)
+    FILING_STORE_ENABLED = os.getenv('FILING_STORE', 'true').lower() == 'true'
+    FILING_STORE_MAX_MB = int(os.getenv('FILING_STORE_MAX_MB', '500'))
+    
+    # Filings already listed per CIK - later scans only fetch newer ones
+    FILING_LEDGER_ENABLED = os.getenv('FILING_LEDGER', 'true').lower() == 'true'
+    FILING_LEDGER_MAX_AGE = 60 * 60  # Re-sync a company at most this often (same as the company page TTL)
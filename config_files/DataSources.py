@@ -14,5 +14,9 @@ load_dotenv()
 class DataSources:
     #these are going to be our urls 
     STOCKTITAN_NEWS = os.getenv('STOCKTITAN_NEWS_URL', 'https://www.stocktitan.net/news/live.html')
+    #older news pages, {page} is 2, 3, ...
+    STOCKTITAN_NEWS_PAGE = os.getenv('STOCKTITAN_NEWS_PAGE_URL', STOCKTITAN_NEWS + '?page={page}')
     SEC_SEARCH = os.getenv('SEC_SEARCH_URL', 'https://www.sec.gov/cgi-bin/browse-edgar')
-    SEC_BASE = os.getenv('SEC_BASE_URL', 'https://www.sec.gov')
\ No newline at end of file
+    SEC_BASE = os.getenv('SEC_BASE_URL', 'https://www.sec.gov')
+    SEC_COMPANY_TICKERS = os.getenv('SEC_COMPANY_TICKERS_URL', 'https://www.sec.gov/files/company_tickers.json')
+    SEC_SUBMISSIONS = os.getenv('SEC_SUBMISSIONS_URL', 'https://data.sec.gov/submissions')
@@ -7,6 +7,24 @@ class Patterns:
     TICKER_WITH_DOLLAR = re.compile(r'\$([A-Z]{1,5})\b')
     TICKER_IN_PARENS = re.compile(r'\(([A-Z]+):\s*([A-Z]{1,5})\)')
     
+    # Batch forms. Each starts with a plain character ($, '(', A-Z) so the
+    # regex engine can skip ahead to candidates instead of trying every
+    # position. The exchange form never spans a line break (headlines are
+    # newline-joined); the bare form is TICKER with the \b written as a lookbehind
+    TICKER_EXCHANGE = re.compile(r'\((?P<market>[A-Z]+):[ \t]*(?P<exchange>[A-Z]{1,5})\)')
+    TICKER_BARE = re.compile(r'[A-Z](?<!\w[A-Z])[A-Z]{0,4}\b(?=\s|$|:|\))')
+    
+    # Uppercase words in headlines that are not tickers
+    TICKER_STOP_WORDS = frozenset({
+        'A', 'I', 'AN', 'AS', 'AT', 'BE', 'BY', 'IN', 'IS', 'IT', 'OF', 'ON', 'OR', 'TO', 'UP', 'US', 'WE',
+        'THE', 'AND', 'FOR', 'NEW', 'ALL', 'ARE', 'NOW', 'ONE', 'OUT', 'ABOUT', 'WILL', 'HAVE',
+        'INC', 'LLC', 'LTD', 'CORP', 'PLC', 'CO', 'NV', 'SA', 'AG', 'USA', 'USD',
+        'CEO', 'CFO', 'COO', 'CTO', 'AI', 'EV', 'EPS', 'ESG', 'FY', 'IR', 'PR', 'ATM', 'ADR', 'ADS',
+        'FDA', 'SEC', 'EMA', 'NIH', 'FTC', 'DOJ', 'NDA', 'BLA', 'IND', 'IPO', 'SPAC', 'REIT', 'ETF',
+        'NYSE', 'NASDAQ', 'AMEX', 'OTC', 'OTCQB', 'OTCQX', 'TSX', 'TSXV', 'CSE', 'ASX',
+        'NEWS', 'STOCK', 'MARKET', 'UPDATE', 'ALERT', 'TODAY',
+    })
+    
     # Money amounts: $5M, $10,000, $5.2 million
     MONEY = re.compile(r'\$[\d,]+(?:\.\d+)?(?:\s*(?:million|billion|M|B))?', re.IGNORECASE)
     
@@ -4,15 +4,71 @@ import os
 class ScanParameters:
     # From .env or defaults
     MAX_CANDIDATES = int(os.getenv('MAX_CANDIDATES', '20'))
+    NEWS_ENTRY_LIMIT = int(os.getenv('NEWS_ENTRY_LIMIT', '50'))  # Live page entries looked at per watch poll
+    
+    # News backfill - older pages walked until TIME_WINDOW_HOURS is covered (0 = live page only)
+    NEWS_BACKFILL_PAGES = int(os.getenv('NEWS_BACKFILL_PAGES', '10'))
+    NEWS_BACKFILL_WORKERS = int(os.getenv('NEWS_BACKFILL_WORKERS', '3'))
     MIN_SCORE_THRESHOLD = int(os.getenv('MIN_SCORE_THRESHOLD', '30'))
+    REPORT_TOP_N = int(os.getenv('REPORT_TOP_N', '0'))  # Final report keeps the best N (0 = all above the threshold)
+    
+    # Wall-clock budget per scan - no new SEC work starts after it (0 = no deadline)
+    SCAN_DEADLINE_SECONDS = float(os.getenv('SCAN_DEADLINE_SECONDS', '0'))
     
     # Request behavior
     REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '10'))
     REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1.0'))
     
+    # Retries - GETs that time out or get 429/5xx are retried with jittered backoff
+    MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
+    RETRY_BACKOFF_SECONDS = float(os.getenv('RETRY_BACKOFF_SECONDS', '1.0'))
+    RETRY_BACKOFF_MAX = 30.0  # Longest wait between attempts (also caps Retry-After)
+    
+    # Circuit breaker - after this many failures in a row a host fails fast for the cooldown
+    CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', '5'))
+    CIRCUIT_BREAKER_COOLDOWN = float(os.getenv('CIRCUIT_BREAKER_COOLDOWN', '60'))
+    
+    # Concurrency - SEC publishes a ceiling of 10 requests/second per client
+    SEC_REQUESTS_PER_SECOND = float(os.getenv('SEC_REQUESTS_PER_SECOND', '10'))
+    MAX_WORKERS = int(os.getenv('MAX_WORKERS', '8'))
+    
+    # Pipeline - worker threads per stage and queue capacity between stages
+    SEC_WORKERS = int(os.getenv('SEC_WORKERS', str(MAX_WORKERS)))
+    ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '2'))
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '16'))
+    MAX_FILING_TEXTS = 3  # Filing documents read per ticker
+    
+    # Processes for HTML parsing - 0 parses on the I/O threads themselves
+    PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', '0'))
+    
+    # Where filing lists come from: 'html' (company page), 'json' (submissions API)
+    # or 'bulk' (EDGAR master index files, one download shared by every ticker)
+    SEC_FILINGS_BACKEND = os.getenv('SEC_FILINGS_BACKEND', 'html').lower()
+    
+    # Watch mode - how often to poll the live feed and how many seen articles to remember
+    WATCH_POLL_SECONDS = int(os.getenv('WATCH_POLL_SECONDS', '60'))
+    WATCH_SEEN_CAPACITY = 5000
+    
+    # Filing text kept per document (filings can be huge)
+    FILING_TEXT_MAX_CHARS = 50000
+    
     # Output settings
     SAVE_OUTPUT = os.getenv('SAVE_OUTPUT', 'true').lower() == 'true'
     OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'output')
+    HISTORY_DB = os.getenv('HISTORY_DB', os.path.join(OUTPUT_DIR, 'history.sqlite3'))
+    
+    # Streaming JSONL result log (one record per scored ticker, rotated daily and by size)
+    RESULTS_LOG = os.getenv('RESULTS_LOG', 'true').lower() == 'true'
+    RESULTS_DIR = os.getenv('RESULTS_DIR', os.path.join(OUTPUT_DIR, 'results'))
+    RESULTS_COMPRESS = os.getenv('RESULTS_COMPRESS', 'false').lower() == 'true'
+    RESULTS_ROTATE_MB = int(os.getenv('RESULTS_ROTATE_MB', '64'))
+    
+    # Per-scan metrics (metrics.json + metrics.prom in METRICS_DIR)
+    METRICS_ENABLED = os.getenv('METRICS', 'true').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR', OUTPUT_DIR)
+    
+    # Local data (ticker index, caches) kept between runs
+    CACHE_DIR = os.getenv('CACHE_DIR', 'cache')
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -11,3 +11,9 @@ class TimeWindows:
     
     # Dilution history window
     DILUTION_HISTORY_DAYS = 180  # 6 months of dilution history
+    
+    # Ticker -> CIK index refresh interval
+    CIK_INDEX_MAX_AGE_HOURS = 24
+    
+    # How often the bulk backend looks for new EDGAR daily index files
+    FORM_INDEX_CHECK_HOURS = 1
@@ -14,9 +14,12 @@ from .ScoringThresholds import ScoringThresholds
 from .TimeWindows import TimeWindows
 from .ScanParameters import ScanParameters
 from .Patterns import Patterns
+from .CacheSettings import CacheSettings
 from .helper_functions import (
     get_all_catalyst_keywords,
     get_all_dilution_keywords,
+    get_catalyst_keyword_tiers,
+    get_dilution_keyword_tiers,
     is_dilution_filing,
     is_confirmation_filing
 )
@@ -33,8 +36,11 @@ __all__ = [
     'TimeWindows',
     'ScanParameters',
     'Patterns',
+    'CacheSettings',
     'get_all_catalyst_keywords',
     'get_all_dilution_keywords',
+    'get_catalyst_keyword_tiers',
+    'get_dilution_keyword_tiers',
     'is_dilution_filing',
     'is_confirmation_filing',
 ]
\ No newline at end of file
@@ -23,6 +23,27 @@ def get_all_dilution_keywords():
     )
     return all_dilution
 
+
+def get_catalyst_keyword_tiers():
+    """Catalyst keywords grouped by tier, strongest first (same words as get_all_catalyst_keywords)."""
+    keyword_tiers = {
+        'STRONG': CatalystKeywords.STRONG,
+        'MEDIUM': CatalystKeywords.MEDIUM,
+        'WEAK': CatalystKeywords.WEAK,
+        'PROMOTIONAL': CatalystKeywords.PROMOTIONAL,
+    }
+    return keyword_tiers
+
+
+def get_dilution_keyword_tiers():
+    """Dilution keywords grouped by tier, most severe first (same words as get_all_dilution_keywords)."""
+    keyword_tiers = {
+        'CRITICAL': DilutionKeywords.CRITICAL,
+        'HIGH': DilutionKeywords.HIGH,
+        'MEDIUM': DilutionKeywords.MEDIUM,
+    }
+    return keyword_tiers
+
 def is_dilution_filing(filing_type):
     """Checks if a specific filing type is associated with dilution."""
     # 1. Clean the input
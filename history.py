@@ -0,0 +1,390 @@
+"""
+PennyStalker - Scan History
+SQLite store of every scan: news, filings, features and scores
+
+Results are written in batched transactions as they stream out of the
+pipeline. The database runs in WAL mode so queries can read while a watch
+run keeps writing, and (ticker, scan_time) / score indexes keep lookups
+like "every time ABCD scored above 70 in the last 90 days" in milliseconds.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config_files import ScanParameters
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    scored INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans (id),
+    ticker TEXT NOT NULL,
+    scan_time REAL NOT NULL,
+    score REAL NOT NULL,
+    tier TEXT NOT NULL,
+    catalyst_level INTEGER NOT NULL,
+    dilution_level INTEGER NOT NULL,
+    confirmed INTEGER NOT NULL,
+    promotional INTEGER NOT NULL,
+    headline TEXT NOT NULL,
+    news_url TEXT,
+    published_time REAL,
+    filing_url TEXT,
+    features TEXT NOT NULL,
+    data_gaps TEXT,
+    score_bound INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_ticker_time ON results (ticker, scan_time);
+CREATE INDEX IF NOT EXISTS idx_results_score ON results (score);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (scan_time);
+
+CREATE TABLE IF NOT EXISTS filings (
+    filing_url TEXT PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    filing_type TEXT NOT NULL,
+    filing_date REAL NOT NULL,
+    first_seen_scan INTEGER REFERENCES scans (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_filings_ticker_date ON filings (ticker, filing_date);
+"""
+
+# Results buffered before a transaction is written
+BATCH_SIZE = 50
+
+# ... or after this many seconds, so a slow watch run still lands on disk
+BATCH_SECONDS = 5.0
+
+# How often the background flusher checks for results waiting past BATCH_SECONDS
+FLUSH_CHECK_SECONDS = 1.0
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value else None
+
+
+def _datetime(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
+class ScanHistory:
+    """
+    Scan history database
+    
+    Use begin_scan() / add() / end_scan() while a scan runs; the query
+    methods work at any time (also from another process).
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (default: HISTORY_DB)
+        """
+        self.path = path or ScanParameters.HISTORY_DB
+        self.lock = threading.Lock()
+        self.conn = None
+        self.scan_id = None
+        self.pending: List[Dict] = []
+        self.last_flush = time.monotonic()
+        
+        # Writes the last results of a quiet watch poll, when no add() comes to do it
+        self.flusher: Optional[threading.Thread] = None
+        self.closing = threading.Event()
+    
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            
+            # WAL lets readers query while a scan is writing; NORMAL sync is safe under WAL
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            
+            # Databases from before score_bound existed get the column (every old score is final)
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(results)")}
+            if 'score_bound' not in columns:
+                self.conn.execute("ALTER TABLE results ADD COLUMN score_bound INTEGER NOT NULL DEFAULT 0")
+            # Final scores only - what the history and movers queries read
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_final ON results (ticker, scan_time) WHERE score_bound = 0"
+            )
+            self.conn.commit()
+        return self.conn
+    
+    
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    
+    def begin_scan(self, mode: str = 'scan') -> int:
+        """
+        Record the start of a scan
+        
+        Args:
+            mode: 'scan' or 'watch'
+        
+        Returns:
+            Scan id
+        """
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "INSERT INTO scans (mode, started_at) VALUES (?, ?)", (mode, time.time())
+            )
+            conn.commit()
+            self.scan_id = cursor.lastrowid
+            return self.scan_id
+    
+    
+    def add(self, result: Dict):
+        """
+        Queue a scored result; written with the next batch, at most
+        BATCH_SECONDS (plus a FLUSH_CHECK_SECONDS tick) after it was queued
+        
+        Args:
+            result: Result dict from the scan pipeline
+        """
+        with self.lock:
+            self.pending.append({**result, 'scan_time': time.time()})
+            
+            if len(self.pending) >= BATCH_SIZE or time.monotonic() - self.last_flush >= BATCH_SECONDS:
+                self._flush()
+            
+            if self.flusher is None:
+                self.closing.clear()
+                self.flusher = threading.Thread(target=self._flush_loop, name='history-flush', daemon=True)
+                self.flusher.start()
+    
+    
+    def _flush_loop(self):
+        """Write queued results once they are BATCH_SECONDS old, even if no more arrive"""
+        while not self.closing.wait(FLUSH_CHECK_SECONDS):
+            with self.lock:
+                if self.pending and time.monotonic() - self.last_flush >= BATCH_SECONDS:
+                    self._flush()
+    
+    
+    def flush(self):
+        """Write any queued results now"""
+        with self.lock:
+            self._flush()
+    
+    
+    def _flush(self):
+        """Write queued results in one transaction (lock held)"""
+        self.last_flush = time.monotonic()
+        
+        if not self.pending:
+            return
+        
+        batch, self.pending = self.pending, []
+        result_rows = []
+        filing_rows = []
+        
+        for result in batch:
+            features = result['features']
+            result_rows.append((
+                self.scan_id, result['ticker'], result['scan_time'], result['score'], result['tier'],
+                features['catalyst_level'], features['dilution_level'],
+                int(features['confirmed']), int(features['promotional']),
+                result['headline'], result.get('news_url'), _timestamp(result.get('published_time')),
+                result.get('filing_url'), json.dumps(features), json.dumps(result.get('data_gaps') or []),
+                int(result.get('score_bound', False)),
+            ))
+            filing_rows.extend(
+                (f['filing_url'], f['ticker'], f['filing_type'], f['filing_date'].timestamp(), self.scan_id)
+                for f in result.get('filings', [])
+            )
+        
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO results (
+                        scan_id, ticker, scan_time, score, tier, catalyst_level, dilution_level,
+                        confirmed, promotional, headline, news_url, published_time, filing_url,
+                        features, data_gaps, score_bound
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, result_rows)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO filings VALUES (?, ?, ?, ?, ?)", filing_rows
+                )
+                if self.scan_id is not None:
+                    conn.execute(
+                        "UPDATE scans SET scored = scored + ? WHERE id = ?", (len(result_rows), self.scan_id)
+                    )
+            logger.debug(f"Wrote {len(result_rows)} results to scan history")
+        except sqlite3.Error as e:
+            logger.error(f"Scan history write failed ({len(result_rows)} results lost): {e}")
+    
+    
+    def end_scan(self):
+        """Flush remaining results and record the end of the scan"""
+        with self.lock:
+            self._flush()
+            
+            if self.scan_id is None:
+                return
+            
+            try:
+                conn = self._connect()
+                conn.execute("UPDATE scans SET finished_at = ? WHERE id = ?", (time.time(), self.scan_id))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Scan history update failed: {e}")
+            self.scan_id = None
+    
+    
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _result(row: sqlite3.Row) -> Dict:
+        """Database row -> result dict (same keys the pipeline produces)"""
+        return {
+            'ticker': row['ticker'],
+            'scan_time': _datetime(row['scan_time']),
+            'score': row['score'],
+            'tier': row['tier'],
+            'headline': row['headline'],
+            'news_url': row['news_url'],
+            'published_time': _datetime(row['published_time']),
+            'filing_url': row['filing_url'],
+            'features': json.loads(row['features']),
+            'data_gaps': json.loads(row['data_gaps'] or '[]'),
+            'score_bound': bool(row['score_bound']),
+        }
+    
+    
+    def ticker_history(self, ticker: str, min_score: Optional[float] = None,
+                       days: Optional[float] = None) -> List[Dict]:
+        """
+        Every final score for a ticker, newest first
+        (upper-bound scores from skipped filing texts are left out)
+        
+        Args:
+            ticker: Stock ticker symbol
+            min_score: Only results scoring at least this
+            days: Only the last N days
+        
+        Returns:
+            Result dicts with a scan_time key
+        """
+        query = "SELECT * FROM results WHERE ticker = ? AND score_bound = 0"
+        params = [ticker.upper()]
+        
+        if days is not None:
+            query += " AND scan_time >= ?"
+            params.append(time.time() - days * 86400)
+        if min_score is not None:
+            query += " AND score >= ?"
+            params.append(min_score)
+        
+        with self.lock:
+            rows = self._connect().execute(query + " ORDER BY scan_time DESC", params).fetchall()
+        return [self._result(row) for row in rows]
+    
+    
+    def top_results(self, min_score: float, days: Optional[float] = None, limit: int = 50) -> List[Dict]:
+        """
+        Highest scoring results across all tickers
+        
+        Args:
+            min_score: Only results scoring at least this
+            days: Only the last N days
+            limit: Maximum number of results
+        """
+        query = "SELECT * FROM results WHERE score >= ? AND score_bound = 0"
+        params = [min_score]
+        
+        if days is not None:
+            query += " AND scan_time >= ?"
+            params.append(time.time() - days * 86400)
+        
+        with self.lock:
+            rows = self._connect().execute(query + " ORDER BY score DESC LIMIT ?", params + [limit]).fetchall()
+        return [self._result(row) for row in rows]
+    
+    
+    def score_changes(self, hours: float = 24, min_change: float = 10) -> List[Dict]:
+        """
+        Tickers whose latest score moved since a point in time
+        Compares each ticker's newest final score in the window with its last final score before it
+        
+        Args:
+            hours: Window length (24 = "since yesterday")
+            min_change: Smallest absolute change to report
+        
+        Returns:
+            Dicts with ticker, score, previous_score, change, scan_time - biggest rise first
+        """
+        since = time.time() - hours * 3600
+        
+        # Both MAX(scan_time) lookups are answered from the (ticker, scan_time) index
+        query = """
+            WITH latest AS (
+                SELECT ticker, MAX(scan_time) AS scan_time FROM results
+                WHERE scan_time >= :since AND score_bound = 0 GROUP BY ticker
+            ), previous AS (
+                SELECT ticker, MAX(scan_time) AS scan_time FROM results
+                WHERE scan_time < :since AND score_bound = 0 AND ticker IN (SELECT ticker FROM latest)
+                GROUP BY ticker
+            )
+            SELECT now.ticker, now.score, before.score AS previous_score,
+                   now.score - before.score AS change, now.scan_time
+            FROM latest
+            JOIN previous USING (ticker)
+            JOIN results AS now ON now.ticker = latest.ticker AND now.scan_time = latest.scan_time
+            JOIN results AS before ON before.ticker = previous.ticker AND before.scan_time = previous.scan_time
+            WHERE ABS(now.score - before.score) >= :min_change
+            ORDER BY change DESC
+        """
+        
+        with self.lock:
+            rows = self._connect().execute(query, {'since': since, 'min_change': min_change}).fetchall()
+        
+        return [
+            {
+                'ticker': row['ticker'],
+                'score': row['score'],
+                'previous_score': row['previous_score'],
+                'change': row['change'],
+                'scan_time': _datetime(row['scan_time']),
+            }
+            for row in rows
+        ]
+    
+    
+    def close(self):
+        """Flush and close the database"""
+        self.closing.set()
+        if self.flusher is not None:
+            self.flusher.join()
+            self.flusher = None
+        
+        self.end_scan()
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
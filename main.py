@@ -0,0 +1,202 @@
+"""
+PennyStalker - Main Entry Point
+Scans recent penny stock news, validates against SEC filings and ranks the results
+
+Usage:
+    python main.py            # One scan of the last TIME_WINDOW_HOURS of news
+    python main.py --watch    # Poll the live feed and score new articles as they appear
+    python main.py --deadline 45   # Best results found within 45 seconds
+    python main.py --history ABCD --min-score 70 --days 90   # Past scores from the scan history
+    python main.py --movers   # Tickers whose score changed in the last 24 hours
+    python main.py score ABCD [--headline "..."]   # Score one ticker now
+    python main.py --report output/results/results-2026-10-18.jsonl   # Ranked report from a result log
+
+The scraping and scoring stacks (requests, lxml, numpy) are imported by the
+commands that use them, so history queries and --help start instantly.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional
+
+from config_files import ScanParameters
+
+
+def print_live_result(result):
+    """Show a result the moment it is scored (if it clears the threshold with a final score)"""
+    from report import format_result
+    
+    if result['score'] >= ScanParameters.MIN_SCORE_THRESHOLD and not result.get('score_bound'):
+        print(format_result(result), flush=True)
+        print(flush=True)
+
+
+def score_ticker(args) -> int:
+    """Answer the score subcommand - one ticker, no news scan, nothing saved"""
+    from pipeline import ScanPipeline
+    from report import format_result
+    
+    ticker = args.ticker.upper()
+    pipeline = ScanPipeline()
+    try:
+        result = pipeline.score_ticker(ticker, args.headline)
+    finally:
+        pipeline.close()
+    
+    if result is None:
+        print(f"{ticker} is not a known SEC registrant")
+        return 1
+    
+    print(format_result(result))
+    return 0
+
+
+def query_history(args) -> int:
+    """Answer --history / --movers from the scan history database"""
+    from history import ScanHistory
+    from report import format_history, format_movers
+    
+    history = ScanHistory()
+    try:
+        if args.history:
+            results = history.ticker_history(args.history, args.min_score, args.days)
+            print(format_history(args.history, results))
+        else:
+            print(format_movers(history.score_changes(args.hours, args.min_change), args.hours))
+    finally:
+        history.close()
+    return 0
+
+
+def report_top_n(args) -> Optional[int]:
+    """Tickers the report keeps: --top, else REPORT_TOP_N (None = all above the threshold)"""
+    return (ScanParameters.REPORT_TOP_N if args.top is None else args.top) or None
+
+
+def report_from_log(args) -> int:
+    """Answer --report - rank and print the records in result log files"""
+    from report import format_report
+    from results_log import rank_records, read_records
+    
+    scanned = 0
+    incomplete = 0
+    
+    def counted(records):
+        nonlocal scanned, incomplete
+        for record in records:
+            scanned += 1
+            incomplete += bool(record['data_gaps'])
+            yield record
+    
+    ranked = rank_records(counted(read_records(args.report)), top_n=report_top_n(args))
+    print(format_report(ranked, scanned, incomplete))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Find penny stocks with real catalysts")
+    parser.add_argument('--watch', action='store_true',
+                        help="poll the live feed continuously and score new articles")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="stop starting SEC work this many seconds into the scan "
+                             "(best candidates go first; default SCAN_DEADLINE_SECONDS)")
+    parser.add_argument('--top', type=int, metavar='N',
+                        help="report only the best N tickers (default REPORT_TOP_N; 0 = all above the threshold)")
+    parser.add_argument('--history', metavar='TICKER',
+                        help="show a ticker's saved scores instead of scanning")
+    parser.add_argument('--min-score', type=float,
+                        help="with --history: only scores at or above this")
+    parser.add_argument('--days', type=float,
+                        help="with --history: only the last N days")
+    parser.add_argument('--movers', action='store_true',
+                        help="show tickers whose score changed recently instead of scanning")
+    parser.add_argument('--hours', type=float, default=24,
+                        help="with --movers: window to compare against (default 24)")
+    parser.add_argument('--min-change', type=float, default=10,
+                        help="with --movers: smallest score change to show (default 10)")
+    parser.add_argument('--report', nargs='+', metavar='LOG',
+                        help="print the ranked report for result log files (.jsonl / .jsonl.gz) instead of scanning")
+    
+    commands = parser.add_subparsers(dest='command')
+    score = commands.add_parser('score', help="score one ticker now, without scanning the news")
+    score.add_argument('ticker', help="ticker symbol")
+    score.add_argument('--headline',
+                       help="catalyst headline to score (default: the ticker's latest StockTitan headline)")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=getattr(logging, ScanParameters.LOG_LEVEL.upper(), logging.INFO),
+        format='%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+    )
+    
+    if args.command == 'score':
+        return score_ticker(args)
+    
+    if args.history or args.movers:
+        return query_history(args)
+    
+    if args.report:
+        return report_from_log(args)
+    
+    from history import ScanHistory
+    from pipeline import run_scan
+    from report import format_report
+    from results_log import ResultLog, rank_records
+    
+    scored = []
+    incomplete = []
+    mode = 'watch' if args.watch else 'scan'
+    top_n = report_top_n(args)
+    
+    history = ScanHistory() if ScanParameters.SAVE_OUTPUT else None
+    if history:
+        scan_id = history.begin_scan(mode)
+    
+    # With the result log on, results live on disk and the ranking is read back from there
+    result_log = ResultLog() if ScanParameters.RESULTS_LOG else None
+    if result_log:
+        result_log.begin_scan(mode)
+    
+    def on_result(result):
+        scored.append(result['ticker'])
+        if result.get('data_gaps'):
+            incomplete.append(result['ticker'])
+        if result_log:
+            result_log.add(result)
+        if history:
+            history.add(result)
+        print_live_result(result)
+    
+    try:
+        ranked = run_scan(watch=args.watch, on_result=on_result, collect=result_log is None,
+                          deadline_seconds=args.deadline, top_n=top_n)
+    except KeyboardInterrupt:
+        print("\nScan interrupted")
+        return 130
+    finally:
+        # Results scored before an interrupt are kept too
+        if result_log:
+            result_log.close()
+        if history:
+            history.close()
+    
+    if args.watch:
+        return 0
+    
+    if result_log:
+        ranked = rank_records(result_log.read_scan(), top_n=top_n)
+    
+    print("\nFINAL RANKING\n")
+    print(format_report(ranked, len(scored), len(incomplete)))
+    
+    if history:
+        print(f"\nSaved scan #{scan_id} ({len(scored)} results) to {history.path}")
+    if result_log and result_log.paths:
+        print(f"Result log: {', '.join(result_log.paths)}")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+PennyStalker - Scan Metrics
+Counters and latency histograms for one scan, exported as JSON and Prometheus text
+
+Requests record per-host latency, bytes and rate-limit / backoff sleeps,
+parsers and the analyzer record time per call, and pipeline stages record
+time per item. At the end of a scan the totals are written to
+METRICS_DIR/metrics.json (summary) and metrics.prom (Prometheus text
+format, e.g. for node_exporter's textfile collector).
+
+With METRICS=false every recording call returns at its first line.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config_files import ScanParameters
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported metric name
+NAMESPACE = 'pennystalker'
+
+# Histogram bucket upper bounds in seconds (+Inf is implied)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help) for every metric recorded
+METRICS = {
+    'http_request_seconds': ('histogram', 'HTTP request latency until the response headers arrive'),
+    'http_requests_total': ('counter', 'HTTP requests sent, by host and status'),
+    'http_response_bytes_total': ('counter', 'Response body bytes received'),
+    'rate_limit_wait_seconds_total': ('counter', 'Time spent waiting for a rate-limit token'),
+    'retry_backoff_seconds_total': ('counter', 'Time spent sleeping between retries'),
+    'scraper_events_total': ('counter', 'Cache hits/misses, retries, coalesced and memoized lookups'),
+    'parse_seconds': ('histogram', 'Parse time per document, by parser'),
+    'analyzer_seconds': ('histogram', 'Analyzer time per call, by step'),
+    'stage_item_seconds': ('histogram', 'Pipeline stage time per item'),
+    'stage_items_total': ('counter', 'Items each pipeline stage finished'),
+    'filing_texts_skipped_total': ('counter', 'Filing text downloads avoided because they could not change the result'),
+    'deadline_skipped_total': ('counter', 'Candidates left unscanned because the scan deadline passed'),
+    'stage_throughput_items_per_second': ('gauge', 'Items a stage finished per second of scan time'),
+    'scan_seconds': ('gauge', 'Wall time of the scan'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus expects"""
+    
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    
+    def observe(self, value: float):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+    
+    
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+    
+    
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'max': round(self.max, 6),
+        }
+
+
+class _NullTimer:
+    """Timer handed out while metrics are disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, metrics: 'ScanMetrics', name: str, labels: Dict[str, str]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+    
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class ScanMetrics:
+    """
+    Thread-safe metric registry for one scan
+    
+    Metrics are keyed by name plus label values, e.g.
+    observe('http_request_seconds', 0.21, host='sec.gov').
+    """
+    
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: Record anything at all (False = every call is a no-op)
+        """
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+    
+    
+    def reset(self):
+        """Start a new scan"""
+        with self.lock:
+            self.values: Dict[str, Dict[Labels, float]] = {}
+            self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+            self.started = time.perf_counter()
+    
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+    
+    
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.values.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+    
+    
+    def observe(self, name: str, value: float, **labels):
+        """Add one observation to a histogram"""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+    
+    
+    def timer(self, name: str, **labels):
+        """Context manager observing the time spent in its block"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+    
+    
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    
+    def summary(self) -> Dict:
+        """
+        Everything recorded, grouped for reading
+        
+        Returns:
+            Dict with scan_seconds, and per metric name a list of
+            {'labels': {...}, 'value': ...} or {'labels': {...}, **histogram summary}
+        """
+        with self.lock:
+            summary = {'scan_seconds': round(time.perf_counter() - self.started, 6)}
+            
+            for name in sorted(self.values):
+                summary[name] = [
+                    {'labels': dict(labels), 'value': round(value, 6)}
+                    for labels, value in sorted(self.values[name].items())
+                ]
+            
+            for name in sorted(self.histograms):
+                summary[name] = [
+                    {'labels': dict(labels), **histogram.summary()}
+                    for labels, histogram in sorted(self.histograms[name].items())
+                ]
+        
+        return summary
+    
+    
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        
+        def header(name: str):
+            kind, help_text = METRICS.get(name, ('untyped', name))
+            lines.append(f"# HELP {NAMESPACE}_{name} {help_text}")
+            lines.append(f"# TYPE {NAMESPACE}_{name} {kind}")
+        
+        with self.lock:
+            values = {name: dict(series) for name, series in self.values.items()}
+            values.setdefault('scan_seconds', {})[()] = time.perf_counter() - self.started
+            
+            for name in sorted(values):
+                header(name)
+                for labels, value in sorted(values[name].items()):
+                    lines.append(f"{NAMESPACE}_{name}{_format_labels(labels)} {value:g}")
+            
+            for name in sorted(self.histograms):
+                header(name)
+                for labels, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(list(BUCKETS) + ['+Inf'], histogram.counts):
+                        cumulative += count
+                        le = bound if isinstance(bound, str) else f"{bound:g}"
+                        lines.append(f"{NAMESPACE}_{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{NAMESPACE}_{name}_sum{_format_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{NAMESPACE}_{name}_count{_format_labels(labels)} {histogram.count}")
+        
+        return '\n'.join(lines) + '\n'
+    
+    
+    def write(self, directory: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Write metrics.json and metrics.prom
+        
+        Args:
+            directory: Where to write (default: METRICS_DIR)
+        
+        Returns:
+            (json path, prometheus path), or None if disabled or the write failed
+        """
+        if not self.enabled:
+            return None
+        
+        directory = directory or ScanParameters.METRICS_DIR
+        json_path = os.path.join(directory, 'metrics.json')
+        prom_path = os.path.join(directory, 'metrics.prom')
+        
+        try:
+            os.makedirs(directory, exist_ok=True)
+            
+            # Write then rename, so a scraper never reads a half-written file
+            for path, text in ((json_path, json.dumps(self.summary(), indent=2)), (prom_path, self.to_prometheus())):
+                with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.error(f"Could not write scan metrics to {directory}: {e}")
+            return None
+        
+        logger.info(f"Scan metrics written to {json_path} and {prom_path}")
+        return json_path, prom_path
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+
+def timed(name: str, **labels) -> Callable:
+    """
+    Decorator observing a function's run time in a histogram
+    
+    Args:
+        name: Histogram name
+        **labels: Label values for every call
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = get_metrics()
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - start, **labels)
+        return wrapper
+    return decorate
+
+
+_shared_metrics: Optional[ScanMetrics] = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics() -> ScanMetrics:
+    """Get the process-wide metrics registry (disabled if METRICS=false)"""
+    global _shared_metrics
+    
+    if _shared_metrics is None:
+        with _shared_lock:
+            if _shared_metrics is None:
+                _shared_metrics = ScanMetrics(ScanParameters.METRICS_ENABLED)
+    return _shared_metrics
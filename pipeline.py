@@ -0,0 +1,577 @@
+"""
+PennyStalker - Scan Pipeline
+News -> SEC validation -> dilution detection -> scoring, run as concurrent stages
+
+Each stage has its own worker threads and hands work to the next stage
+through a bounded queue. SEC requests for one ticker overlap with parsing
+and scoring of the previous ones, a full queue blocks the stage feeding
+it (backpressure), and results come out as soon as each ticker is scored.
+
+Candidates are scheduled best pre-score first (the highest score a ticker
+can reach from its headline), so SEC time goes to strong catalysts before
+promotional fluff. With a deadline, no new SEC work starts once it passes:
+the scan returns the best candidates it got to.
+
+Filing texts are read lazily: before each download the ticker's score
+bounds are checked, and the rest are skipped once no text could change
+whether (or where) the ticker shows up in the report.
+
+Every stage records time per item and throughput in the scan metrics,
+written to METRICS_DIR when the scan ends (and at each watch poll).
+"""
+
+import heapq
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from analyzer import BatchScorer, FeatureBatch, extract_features, headline_features
+from config_files import ScanParameters, TimeWindows, is_confirmation_filing, is_dilution_filing
+from metrics import get_metrics
+from scrapers import SECScraper, StockTitanScraper
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class Stage:
+    """
+    A pool of worker threads that applies one function to every queued item
+    
+    The function may return None to drop an item. When the end marker
+    arrives, every worker finishes and the last one out forwards the marker.
+    """
+    
+    def __init__(self, name: str, func: Callable, workers: int,
+                 inbox: queue.Queue, outbox: queue.Queue, stop_event: threading.Event):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.remaining = self.workers
+        self.processed = 0
+        self.lock = threading.Lock()
+        self.threads: List[threading.Thread] = []
+        self.metrics = get_metrics()
+        self.started = self.finished = None
+    
+    
+    def start(self):
+        """Start the worker threads"""
+        self.started = time.perf_counter()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+    
+    
+    def _run(self):
+        while True:
+            item = self.inbox.get()
+            
+            if item is _DONE:
+                self.inbox.put(_DONE)  # Let sibling workers see it too
+                break
+            
+            # After a stop request, drain without doing work
+            if self.stop_event.is_set():
+                continue
+            
+            try:
+                with self.metrics.timer('stage_item_seconds', stage=self.name):
+                    result = self.func(item)
+            except Exception as e:
+                logger.error(f"{self.name} failed on {item.get('ticker', item)}: {e}")
+                continue
+            
+            with self.lock:
+                self.processed += 1
+            self.metrics.inc('stage_items_total', stage=self.name)
+            
+            if result is not None:
+                self.outbox.put(result)  # Blocks while the next stage is behind
+        
+        with self.lock:
+            self.remaining -= 1
+            last = self.remaining == 0
+        
+        if last:
+            self.finished = time.perf_counter()
+            self.outbox.put(_DONE)
+    
+    
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+    
+    
+    def throughput(self) -> float:
+        """Items finished per second between start and the last worker exiting"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class ScanPipeline:
+    """
+    Staged scan: candidates -> SEC stage -> analysis stage -> results
+    
+    Use run() with any iterable of news batches - one batch for a normal
+    scan, or StockTitanScraper.watch() for continuous mode.
+    """
+    
+    def __init__(self, sec: Optional[SECScraper] = None, scorer: Optional[BatchScorer] = None,
+                 sec_workers: Optional[int] = None, analysis_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None):
+        """
+        Args:
+            sec: SEC scraper (default: a new SECScraper)
+            scorer: Scoring engine (default: BatchScorer with config weights)
+            sec_workers: Threads fetching filings (default: SEC_WORKERS)
+            analysis_workers: Threads extracting features and scoring (default: ANALYSIS_WORKERS)
+            queue_size: Capacity of each inter-stage queue (default: PIPELINE_QUEUE_SIZE)
+        """
+        self.sec = sec or SECScraper()
+        self.scorer = scorer or BatchScorer()
+        self.sec_workers = sec_workers or ScanParameters.SEC_WORKERS
+        self.analysis_workers = analysis_workers or ScanParameters.ANALYSIS_WORKERS
+        self.queue_size = queue_size or ScanParameters.PIPELINE_QUEUE_SIZE
+        self.stop_event = threading.Event()
+        self.metrics = get_metrics()
+        
+        # time.monotonic() after which no new SEC work starts (None = no deadline)
+        self.deadline: Optional[float] = None
+        self.deadline_skipped = 0
+        self.lock = threading.Lock()
+        
+        # Lazy filing texts - reads done and skipped (by reason) this run
+        self.text_stats = {'downloaded': 0, 'decided': 0, 'below_threshold': 0, 'outside_top_n': 0}
+        
+        # Best final scores so far, when the report keeps only the top N
+        self.top_n: Optional[int] = None
+        self.top_scores: List[float] = []
+    
+    
+    def stop(self):
+        """Ask every stage to wind down (in-flight items are abandoned)"""
+        self.stop_event.set()
+    
+    
+    def _past_deadline(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    
+    def _skip_for_deadline(self, count: int = 1):
+        """Count candidates dropped because the deadline passed"""
+        with self.lock:
+            self.deadline_skipped += count
+        self.metrics.inc('deadline_skipped_total', count)
+    
+    
+    def _count_texts(self, stat: str, count: int = 1):
+        with self.lock:
+            self.text_stats[stat] += count
+        if stat != 'downloaded':
+            self.metrics.inc('filing_texts_skipped_total', count, reason=stat)
+    
+    
+    def _record_score(self, score: float):
+        """Track the best N final scores (the bar a ticker must clear to make the report)"""
+        if not self.top_n:
+            return
+        with self.lock:
+            if len(self.top_scores) < self.top_n:
+                heapq.heappush(self.top_scores, score)
+            else:
+                heapq.heappushpop(self.top_scores, score)
+    
+    
+    def _skip_texts_reason(self, news: Dict, filings: List[Dict], filing_texts: Dict[str, str],
+                           now: datetime, exact: bool) -> Optional[str]:
+        """
+        Why the remaining filing texts can't matter, or None if they still can
+        
+        Args:
+            news: The candidate's news item
+            filings: Its filings
+            filing_texts: Texts read so far
+            now: Reference time for the features
+            exact: Only skip when the score itself is already decided
+            
+        Returns:
+            'decided', 'below_threshold', 'outside_top_n' or None
+        """
+        lower, upper = self.scorer.bounds(extract_features(news, filings, filing_texts, now))
+        
+        if lower == upper:
+            return 'decided'  # Already at CRITICAL dilution, or capped either way
+        if exact:
+            return None
+        if upper < ScanParameters.MIN_SCORE_THRESHOLD:
+            return 'below_threshold'
+        
+        # The bar only rises as results come in, so below it now means below it for good
+        with self.lock:
+            full = self.top_n and len(self.top_scores) == self.top_n
+            if full and upper < self.top_scores[0]:
+                return 'outside_top_n'
+        return None
+    
+    
+    # ------------------------------------------------------------------
+    # Stage functions
+    # ------------------------------------------------------------------
+    
+    def _select_candidates(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        One candidate per ticker (its newest headline), best pre-score first
+        
+        Only the MAX_CANDIDATES best pre-scores are kept. Ties keep the news
+        order, newest first.
+        
+        Args:
+            news_items: News dicts from one StockTitan fetch
+        """
+        candidates = []
+        seen = set()
+        
+        for item in news_items:
+            ticker = item['ticker']
+            if ticker in seen:
+                continue
+            seen.add(ticker)
+            candidates.append({'ticker': ticker, 'news': item})
+        
+        # Unknown symbols never reach the SEC stage
+        known = set(self.sec.filter_known_tickers([c['ticker'] for c in candidates]))
+        candidates = [c for c in candidates if c['ticker'] in known]
+        
+        if not candidates:
+            return []
+        
+        now = datetime.now()
+        prescores = self.scorer.prescore([headline_features(c['news'], now) for c in candidates])
+        for candidate, prescore in zip(candidates, prescores):
+            candidate['prescore'] = float(prescore)
+        
+        # Stable sort - equal pre-scores stay newest first
+        candidates.sort(key=lambda c: -c['prescore'])
+        return candidates[:ScanParameters.MAX_CANDIDATES]
+    
+    
+    @staticmethod
+    def _filings_to_read(filings: List[Dict], now: datetime) -> List[Dict]:
+        """Recent dilution / confirmation filings whose text is worth downloading"""
+        cutoff = now - timedelta(days=TimeWindows.FILING_LOOKBACK_DAYS)
+        
+        relevant = [
+            f for f in filings
+            if f['filing_date'] >= cutoff
+            and (is_dilution_filing(f['filing_type']) or is_confirmation_filing(f['filing_type']))
+        ]
+        return relevant[:ScanParameters.MAX_FILING_TEXTS]
+    
+    
+    def _sec_stage(self, candidate: Dict, exact: bool = False) -> Dict:
+        """
+        Fetch filings over the dilution history window, then the relevant filing texts
+        Anything EDGAR couldn't deliver is recorded in data_gaps rather than read as "nothing found"
+        
+        Texts are read one at a time while they can still change the result.
+        Texts skipped for the threshold / top N leave the score at its upper
+        bound (still below the bar); exact=True reads them unless the score
+        is already decided.
+        """
+        # Out of time - leave the SEC alone and let the better candidates already in flight finish
+        if self._past_deadline():
+            self._skip_for_deadline()
+            return None
+        
+        ticker = candidate['ticker']
+        now = datetime.now()
+        data_gaps = []
+        
+        filings = self.sec.get_filings(ticker, TimeWindows.DILUTION_HISTORY_DAYS)
+        
+        if filings is None:
+            data_gaps.append('SEC filings unavailable')
+            filings = []
+        
+        filing_texts = {}
+        missing_texts = 0
+        skipped_texts = 0
+        score_bound = False
+        to_read = self._filings_to_read(filings, now)
+        
+        for i, filing in enumerate(to_read):
+            reason = self._skip_texts_reason(candidate['news'], filings, filing_texts, now, exact)
+            if reason:
+                skipped_texts = len(to_read) - i
+                # Skipped for the threshold / top N - the score will only be an upper bound
+                score_bound = reason != 'decided'
+                self._count_texts(reason, skipped_texts)
+                break
+            
+            self._count_texts('downloaded')
+            text = self.sec.get_filing_text(filing['filing_url'])
+            if text:
+                filing_texts[filing['filing_url']] = text
+            else:
+                missing_texts += 1
+        
+        if missing_texts:
+            data_gaps.append(f"{missing_texts} filing text{'s' if missing_texts > 1 else ''} unavailable")
+        
+        return {**candidate, 'filings': filings, 'filing_texts': filing_texts,
+                'filing_texts_skipped': skipped_texts, 'score_bound': score_bound, 'data_gaps': data_gaps}
+    
+    
+    def _analysis_stage(self, candidate: Dict) -> Dict:
+        """Extract features and score one ticker"""
+        news = candidate['news']
+        filings = candidate['filings']
+        
+        features = extract_features(news, filings, candidate['filing_texts'])
+        score = self.scorer.score(FeatureBatch.from_features([features]))
+        self._record_score(float(score[0]))
+        
+        # Link the confirming 8-K if there is one, otherwise the newest filing
+        confirming = [f for f in filings if is_confirmation_filing(f['filing_type'])]
+        filing = (confirming or filings or [{}])[0]
+        
+        return {
+            'ticker': candidate['ticker'],
+            'score': float(score[0]),
+            'tier': str(self.scorer.tiers(score)[0]),
+            'headline': news['headline'],
+            'news_url': news.get('url', ''),
+            'published_time': news.get('published_time'),
+            'filing_url': filing.get('filing_url', ''),
+            'filings': filings,
+            'features': features,
+            'filing_texts_skipped': candidate['filing_texts_skipped'],
+            'score_bound': candidate['score_bound'],
+            'data_gaps': candidate['data_gaps'],
+        }
+    
+    
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+    
+    def _produce(self, news_batches: Iterable[List[Dict]], outbox: queue.Queue):
+        """Feed candidates from each news batch into the SEC stage"""
+        try:
+            for polls, news_items in enumerate(news_batches):
+                if self.stop_event.is_set():
+                    break
+                
+                # Each watch poll is a new run - filings may have changed since the last one
+                self.sec.clear_memo()
+                
+                # Watch runs don't end - keep the metrics files current instead
+                if polls:
+                    self.metrics.write()
+                
+                candidates = self._select_candidates(news_items)
+                for i, candidate in enumerate(candidates):
+                    if self.stop_event.is_set():
+                        break
+                    if self._past_deadline():
+                        self._skip_for_deadline(len(candidates) - i)
+                        break
+                    outbox.put(candidate)
+        except Exception as e:
+            logger.error(f"News source failed: {e}")
+        finally:
+            outbox.put(_DONE)
+    
+    
+    def run(self, news_batches: Iterable[List[Dict]],
+            on_result: Optional[Callable[[Dict], None]] = None, collect: bool = True,
+            deadline: Optional[float] = None, top_n: Optional[int] = None) -> List[Dict]:
+        """
+        Run the pipeline until the news source is exhausted (or stop() is called)
+        
+        Args:
+            news_batches: Iterable of news item lists
+            on_result: Called with each result as soon as it is scored
+            collect: Keep results for the return value (off for endless watch runs)
+            deadline: time.monotonic() value after which candidates not yet
+                      at the SEC stage are dropped (SEC work in flight finishes)
+            top_n: The report keeps only the best N - texts of tickers that
+                   can't reach them are skipped (default: everything above
+                   the threshold counts)
+            
+        Returns:
+            All results, in completion order (empty if collect is False)
+        """
+        self.deadline = deadline
+        self.deadline_skipped = 0
+        self.top_n = top_n
+        self.top_scores = []
+        self.text_stats = dict.fromkeys(self.text_stats, 0)
+        
+        sec_queue = queue.Queue(maxsize=self.queue_size)
+        analysis_queue = queue.Queue(maxsize=self.queue_size)
+        result_queue = queue.Queue(maxsize=self.queue_size)
+        
+        stages = [
+            Stage('sec', self._sec_stage, self.sec_workers, sec_queue, analysis_queue, self.stop_event),
+            Stage('analysis', self._analysis_stage, self.analysis_workers,
+                  analysis_queue, result_queue, self.stop_event),
+        ]
+        
+        producer = threading.Thread(
+            target=self._produce, args=(news_batches, sec_queue), name='news', daemon=True
+        )
+        producer.start()
+        for stage in stages:
+            stage.start()
+        
+        results = []
+        
+        try:
+            while True:
+                result = result_queue.get()
+                if result is _DONE:
+                    break
+                if collect:
+                    results.append(result)
+                if on_result:
+                    on_result(result)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted - shutting down pipeline...")
+            self.stop()
+            # Keep draining so no stage blocks on a full queue
+            while result_queue.get() is not _DONE:
+                pass
+        
+        producer.join()
+        for stage in stages:
+            stage.join()
+            self.metrics.set('stage_throughput_items_per_second', stage.throughput(), stage=stage.name)
+        
+        logger.info(f"Pipeline finished: {stages[-1].processed} tickers scored")
+        if self.deadline_skipped:
+            logger.warning(f"Deadline reached - {self.deadline_skipped} lower-priority candidates not scanned")
+        
+        stats = self.text_stats
+        skipped = stats['decided'] + stats['below_threshold'] + stats['outside_top_n']
+        if stats['downloaded'] or skipped:
+            logger.info(
+                f"Filing texts: {stats['downloaded']} read, {skipped} downloads avoided "
+                f"({stats['decided']} score already decided, {stats['below_threshold']} below the threshold, "
+                f"{stats['outside_top_n']} outside the top {self.top_n or 'N'})"
+            )
+        return results
+    
+    
+    def score_ticker(self, ticker: str, headline: Optional[str] = None) -> Optional[Dict]:
+        """
+        Score one ticker right away, on this thread, without a news scan
+        
+        Args:
+            ticker: Stock ticker symbol
+            headline: Catalyst headline to score (default: the ticker's newest
+                      StockTitan headline, or none if it has no recent news)
+            
+        Returns:
+            Result dict as from run(), or None if the ticker isn't an SEC registrant
+        """
+        if not self.sec.filter_known_tickers([ticker]):
+            return None
+        
+        now = datetime.now()
+        news = {'ticker': ticker, 'headline': headline or '', 'url': '', 'published_time': now, 'source': 'manual'}
+        
+        if headline is None:
+            with StockTitanScraper() as news_scraper:
+                news = news_scraper.get_ticker_news(ticker) or news
+            
+            if not news['headline']:
+                logger.info(f"No recent StockTitan news for {ticker} - scoring on SEC filings only")
+        
+        # Exact - the user asked for this ticker's score, wherever it lands
+        return self._analysis_stage(self._sec_stage({'ticker': ticker, 'news': news}, exact=True))
+    
+    
+    def rank(self, results: List[Dict], top_n: Optional[int] = None) -> List[Dict]:
+        """
+        Final ranking of all results with one vectorized pass
+        
+        Args:
+            results: Results from run()
+            top_n: Keep only the best N
+            
+        Returns:
+            Results above MIN_SCORE_THRESHOLD, best first
+        """
+        if not results:
+            return []
+        
+        batch = FeatureBatch.from_features([r['features'] for r in results])
+        scores = self.scorer.score(batch)
+        return [results[i] for i in self.scorer.rank(scores, top_n=top_n)]
+    
+    
+    def close(self):
+        self.sec.close()
+
+
+def run_scan(watch: bool = False, on_result: Optional[Callable[[Dict], None]] = None,
+             collect: bool = True, deadline_seconds: Optional[float] = None,
+             top_n: Optional[int] = None) -> List[Dict]:
+    """
+    Scrape StockTitan and run the full pipeline
+    
+    Args:
+        watch: Poll the live feed continuously instead of one pass
+        on_result: Called with each result as soon as it is scored
+        collect: Keep results in memory and rank them (off when on_result
+                 persists them and the ranking is done from there)
+        deadline_seconds: Wall-clock budget for a single scan, counted from
+                          now (default: SCAN_DEADLINE_SECONDS, 0 = none;
+                          ignored in watch mode)
+        top_n: Report only the best N (default: REPORT_TOP_N, 0 = everything
+               above the threshold); lets the scan skip filing texts of
+               tickers that can't make it
+        
+    Returns:
+        Ranked results above the score threshold (empty if watching or not collecting)
+    """
+    if deadline_seconds is None:
+        deadline_seconds = ScanParameters.SCAN_DEADLINE_SECONDS
+    deadline = time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+    top_n = (ScanParameters.REPORT_TOP_N if top_n is None else top_n) or None
+    
+    metrics = get_metrics()
+    metrics.reset()
+    
+    with StockTitanScraper() as news_scraper:
+        pipeline = ScanPipeline()
+        
+        try:
+            if watch:
+                pipeline.run(news_scraper.watch(stop_event=pipeline.stop_event), on_result, collect=False)
+                return []
+            
+            with metrics.timer('stage_item_seconds', stage='news'):
+                news_items = news_scraper.get_recent_news()
+            metrics.inc('stage_items_total', len(news_items), stage='news')
+            
+            results = pipeline.run([news_items], on_result, collect=collect, deadline=deadline, top_n=top_n)
+            if not collect:
+                return []
+            
+            with metrics.timer('stage_item_seconds', stage='rank'):
+                return pipeline.rank(results, top_n=top_n)
+        finally:
+            pipeline.close()
+            metrics.write()
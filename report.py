@@ -0,0 +1,154 @@
+"""
+PennyStalker - Report Formatting
+Turns scored results into the terminal report and scan history listings
+"""
+
+from typing import Dict, List
+
+RULE = '═' * 63
+
+CATALYST_NAMES = ['NONE', 'WEAK', 'MEDIUM', 'STRONG']
+
+
+def _catalyst_line(features: Dict) -> str:
+    phrases = features['catalyst_phrases'] + features['promotional_phrases']
+    label = 'PROMOTIONAL' if features['promotional'] else CATALYST_NAMES[features['catalyst_level']]
+    return f"{', '.join(phrases) or 'No catalyst keywords'} ({label})"
+
+
+def _sec_line(features: Dict) -> str:
+    if features['confirmed']:
+        return "8-K filed confirming announcement"
+    if features['has_filings']:
+        return "Recent filings found, no confirming 8-K"
+    return "No recent filings found"
+
+
+def _dilution_line(features: Dict) -> str:
+    # Imported here - history listings don't need the analyzer (and numpy) loaded
+    from analyzer import DILUTION_LEVEL_NAMES
+    
+    level = DILUTION_LEVEL_NAMES[features['dilution_level']]
+    if level == 'NONE':
+        return "NONE detected"
+    
+    evidence = features['dilution_forms'] + features['dilution_phrases']
+    return f"{level} - {', '.join(evidence[:5])}"
+
+
+def _reasoning(features: Dict) -> str:
+    catalyst = CATALYST_NAMES[features['catalyst_level']].lower()
+    opening = f"{catalyst.capitalize()} catalyst" if catalyst != 'none' else "No clear catalyst"
+    confirmation = "with SEC confirmation" if features['confirmed'] else "without SEC confirmation"
+    parts = [f"{opening} {confirmation}"]
+    
+    if features['promotional']:
+        parts.append("promotional language")
+    if features['dilution_level'] >= 3:
+        parts.append("dilution is a major red flag")
+    elif features['dilution_level'] > 0:
+        parts.append("some dilution history")
+    else:
+        parts.append("no dilution red flags")
+    
+    return ', '.join(parts)
+
+
+def format_result(result: Dict, rank: int = None) -> str:
+    """
+    Format one scored ticker as a report block
+    
+    Args:
+        result: Result dict from the scan pipeline
+        rank: Position in the final ranking (omitted for live results)
+        
+    Returns:
+        Multi-line string
+    """
+    features = result['features']
+    title = f"RANK {rank}: " if rank is not None else ""
+    
+    lines = [
+        RULE,
+        f"{title}{result['ticker']} - Score: {result['score']:.0f}/100 ({result['tier']})",
+        RULE,
+        f"Catalyst: {_catalyst_line(features)}",
+        f"SEC Status: {_sec_line(features)}",
+        f"Dilution Risk: {_dilution_line(features)}",
+        f"Reasoning: {_reasoning(features)}",
+    ]
+    
+    if result.get('data_gaps'):
+        lines.append(f"⚠️ Incomplete Data: {', '.join(result['data_gaps'])} - score may be off")
+    
+    lines += [
+        "",
+        f"Headline: {result['headline']}",
+        f"News: {result['news_url'] or 'n/a'}",
+        f"Filing: {result['filing_url'] or 'n/a'}",
+    ]
+    return '\n'.join(lines)
+
+
+def format_report(ranked: List[Dict], scanned: int, incomplete: int = 0) -> str:
+    """
+    Format the final ranked report
+    
+    Args:
+        ranked: Results in rank order (already filtered by score)
+        scanned: Number of tickers scored in total
+        incomplete: How many of those were scored with missing SEC data
+        
+    Returns:
+        Report text
+    """
+    gaps = f"\n⚠️ {incomplete} of {scanned} tickers scored with incomplete SEC data" if incomplete else ""
+    
+    if not ranked:
+        return f"No results above the score threshold ({scanned} tickers scanned){gaps}"
+    
+    blocks = [format_result(result, rank) for rank, result in enumerate(ranked, start=1)]
+    blocks.append(f"\n{len(ranked)} of {scanned} tickers above the score threshold{gaps}")
+    return '\n\n'.join(blocks)
+
+
+def format_history(ticker: str, results: List[Dict]) -> str:
+    """
+    Format a ticker's past scores from the scan history
+    
+    Args:
+        ticker: Stock ticker symbol
+        results: Results from ScanHistory.ticker_history (newest first)
+        
+    Returns:
+        Report text
+    """
+    if not results:
+        return f"No saved results for {ticker.upper()}"
+    
+    lines = [RULE, f"{ticker.upper()} - {len(results)} saved results", RULE]
+    for result in results:
+        lines.append(f"{result['scan_time']:%Y-%m-%d %H:%M}  {result['score']:5.0f}  "
+                     f"{result['tier']:<22}  {result['headline'][:60]}")
+    return '\n'.join(lines)
+
+
+def format_movers(changes: List[Dict], hours: float) -> str:
+    """
+    Format tickers whose score changed within a time window
+    
+    Args:
+        changes: Rows from ScanHistory.score_changes
+        hours: Window the changes were measured over
+        
+    Returns:
+        Report text
+    """
+    if not changes:
+        return f"No score changes in the last {hours:g} hours"
+    
+    lines = [RULE, f"Score changes in the last {hours:g} hours", RULE]
+    for change in changes:
+        lines.append(f"{change['ticker']:<6} {change['previous_score']:5.0f} -> {change['score']:5.0f}  "
+                     f"({change['change']:+.0f})  {change['scan_time']:%Y-%m-%d %H:%M}")
+    return '\n'.join(lines)
@@ -0,0 +1,325 @@
+"""
+PennyStalker - Result Log
+Append-only JSONL log of every scored ticker, written as results stream in
+
+One record per line, appended as soon as a ticker is scored, so a scan that
+dies half way keeps everything scored before it and other tools can follow
+the file live (tail -f, or zcat on compressed logs). Writes go through a
+buffer flushed at least every FLUSH_SECONDS, also when no more results come.
+Files rotate daily and when they pass RESULTS_ROTATE_MB:
+
+    output/results/results-2026-10-18.jsonl
+    output/results/results-2026-10-18.1.jsonl   (once the first reaches the size cap)
+
+The final report is ranked from the records on disk, so a scan doesn't keep
+every result (filings, features) in memory until it ends.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config_files import ScanParameters
+
+logger = logging.getLogger(__name__)
+
+# Write buffer per log file
+BUFFER_SIZE = 64 * 1024
+
+# Buffered records are flushed once this old, so followers see them
+FLUSH_SECONDS = 1.0
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def to_record(result: Dict, scan: str) -> Dict:
+    """
+    Result dict from the pipeline -> log record
+    
+    Filing texts are left out (they are large and only feed the features).
+    
+    Args:
+        result: Result dict from the scan pipeline
+        scan: Id of the scan it belongs to
+    
+    Returns:
+        JSON-serializable dict
+    """
+    return {
+        'scan': scan,
+        'scan_time': datetime.now(),
+        'ticker': result['ticker'],
+        'score': result['score'],
+        'tier': result['tier'],
+        'headline': result['headline'],
+        'news_url': result.get('news_url'),
+        'published_time': result.get('published_time'),
+        'filing_url': result.get('filing_url'),
+        'features': result['features'],
+        'data_gaps': result.get('data_gaps') or [],
+        'filing_texts_skipped': result.get('filing_texts_skipped', 0),
+        'score_bound': result.get('score_bound', False),
+        'filings': [
+            {'filing_type': f['filing_type'], 'filing_date': f['filing_date'], 'filing_url': f['filing_url']}
+            for f in result.get('filings', [])
+        ],
+    }
+
+
+def from_record(record: Dict) -> Dict:
+    """Log record -> result dict (same keys the pipeline produces, datetimes restored)"""
+    record['scan_time'] = _parse_time(record.get('scan_time'))
+    record.setdefault('score_bound', False)  # Logs written before the flag existed
+    record['published_time'] = _parse_time(record.get('published_time'))
+    for filing in record.get('filings', []):
+        filing['filing_date'] = _parse_time(filing['filing_date'])
+    return record
+
+
+class ResultLog:
+    """
+    Streaming result writer
+    
+    Use begin_scan() / add() / close() while a scan runs (add() is
+    thread-safe); read_scan() gives back this scan's records afterwards.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, compress: Optional[bool] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Where log files go (default: RESULTS_DIR)
+            compress: Write .jsonl.gz instead of .jsonl (default: RESULTS_COMPRESS)
+            max_bytes: Start a new file once one reaches this size on disk
+                       (default: RESULTS_ROTATE_MB)
+        """
+        self.directory = directory or ScanParameters.RESULTS_DIR
+        self.compress = ScanParameters.RESULTS_COMPRESS if compress is None else compress
+        self.max_bytes = max_bytes or ScanParameters.RESULTS_ROTATE_MB * 1024 * 1024
+        self.suffix = '.jsonl.gz' if self.compress else '.jsonl'
+        self.lock = threading.Lock()
+        
+        self.raw = None   # Underlying file (its position is the size on disk)
+        self.file = None  # What records are written to (gzip wrapper or raw)
+        self.day = None
+        self.last_flush = time.monotonic()
+        self.unflushed = False  # Records written since the last flush
+        
+        self.scan = None
+        self.paths: List[str] = []  # Files this scan wrote to, in order
+        
+        # Flushes the last records of a quiet watch poll, when no add() comes to do it
+        self.flusher: Optional[threading.Thread] = None
+        self.closing = threading.Event()
+    
+    
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    
+    def begin_scan(self, mode: str = 'scan') -> str:
+        """
+        Start a scan - its records are tagged with a new scan id
+        
+        Args:
+            mode: 'scan' or 'watch'
+        
+        Returns:
+            Scan id
+        """
+        with self.lock:
+            self.scan = f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}-{mode}"
+            self.paths = []
+            return self.scan
+    
+    
+    def add(self, result: Dict):
+        """
+        Append a scored result
+        
+        Args:
+            result: Result dict from the scan pipeline
+        """
+        line = json.dumps(to_record(result, self.scan), default=_json_default, separators=(',', ':'))
+        
+        with self.lock:
+            try:
+                self._ensure_file()
+                self.file.write(line.encode('utf-8') + b'\n')
+                self.unflushed = True
+                
+                if time.monotonic() - self.last_flush >= FLUSH_SECONDS:
+                    self._flush()
+            except OSError as e:
+                logger.error(f"Result log write failed for {result['ticker']}: {e}")
+            
+            if self.flusher is None:
+                self.closing.clear()
+                self.flusher = threading.Thread(target=self._flush_loop, name='results-flush', daemon=True)
+                self.flusher.start()
+    
+    
+    def _flush_loop(self):
+        """Flush buffered records every FLUSH_SECONDS, even if no more arrive"""
+        while not self.closing.wait(FLUSH_SECONDS):
+            with self.lock:
+                if not self.unflushed:
+                    continue  # Nothing new - an empty gzip sync flush would still add bytes
+                try:
+                    self._flush()
+                except OSError as e:
+                    logger.error(f"Result log flush failed: {e}")
+    
+    
+    def flush(self):
+        """Push buffered records to disk now"""
+        with self.lock:
+            self._flush()
+    
+    
+    def _flush(self):
+        """Flush buffers (lock held) - gzip does a sync flush, so readers can decode up to here"""
+        self.last_flush = time.monotonic()
+        self.unflushed = False
+        if self.file is not None:
+            self.file.flush()
+    
+    
+    def _ensure_file(self):
+        """Open today's file, rotating on a new day or when the current one is full (lock held)"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        if self.file is not None and self.day == today and self.raw.tell() < self.max_bytes:
+            return
+        
+        self._close_file()
+        os.makedirs(self.directory, exist_ok=True)
+        
+        # Continue the newest part of the day unless it is already full
+        part = 0
+        while os.path.exists(self._path(today, part + 1)):
+            part += 1
+        path = self._path(today, part)
+        if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            path = self._path(today, part + 1)
+        
+        self.raw = open(path, 'ab', buffering=BUFFER_SIZE)
+        # Appending to a .gz adds a gzip member; readers decode members back to back
+        self.file = gzip.GzipFile(fileobj=self.raw, mode='ab') if self.compress else self.raw
+        self.day = today
+        
+        if path not in self.paths:
+            self.paths.append(path)
+        logger.debug(f"Result log: {path}")
+    
+    
+    def _path(self, day: str, part: int) -> str:
+        name = f"results-{day}.{part}{self.suffix}" if part else f"results-{day}{self.suffix}"
+        return os.path.join(self.directory, name)
+    
+    
+    def _close_file(self):
+        if self.file is None:
+            return
+        
+        try:
+            self.file.close()
+            if self.file is not self.raw:
+                self.raw.close()
+        except OSError as e:
+            logger.error(f"Result log close failed: {e}")
+        self.file = self.raw = None
+    
+    
+    def close(self):
+        """Flush and close the current file"""
+        self.closing.set()
+        if self.flusher is not None:
+            self.flusher.join()
+            self.flusher = None
+        
+        with self.lock:
+            self._close_file()
+    
+    
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    
+    def read_scan(self) -> Iterator[Dict]:
+        """This scan's records, in the order they were scored (call after close)"""
+        return read_records(self.paths, scan=self.scan)
+
+
+def read_records(paths: Iterable[str], scan: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream result dicts back out of log files
+    
+    A cut-off last line or gzip member (the writer died mid-write) ends
+    that file instead of failing the read.
+    
+    Args:
+        paths: Log files (.jsonl or .jsonl.gz), read in order
+        scan: Only records from this scan id (default: all)
+    
+    Yields:
+        Result dicts with datetimes restored
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        
+        try:
+            with opener(path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping incomplete record in {path}")
+                        continue
+                    
+                    if scan is None or record.get('scan') == scan:
+                        yield from_record(record)
+        except (EOFError, zlib.error) as e:
+            logger.warning(f"{path} ends early ({e}) - read what was complete")
+        except OSError as e:
+            logger.error(f"Could not read result log {path}: {e}")
+
+
+def rank_records(records: Iterable[Dict], top_n: Optional[int] = None,
+                 min_score: Optional[float] = None) -> List[Dict]:
+    """
+    Final ranking over records streamed from disk
+    
+    Only results above the threshold are kept in memory. Scores were
+    computed by the scorer at scan time, so this matches ScanPipeline.rank
+    (highest first, ties in the order they were scored). Upper-bound
+    scores (score_bound, filing texts skipped) are left out - they were
+    below the scan's bar, and a larger top_n here mustn't rank them as final.
+    
+    Args:
+        records: Result dicts, e.g. from read_records
+        top_n: Keep only the best N
+        min_score: Drop results below this (default: MIN_SCORE_THRESHOLD)
+    
+    Returns:
+        Ranked result dicts
+    """
+    if min_score is None:
+        min_score = ScanParameters.MIN_SCORE_THRESHOLD
+    
+    ranked = sorted((r for r in records if r['score'] >= min_score and not r['score_bound']), key=lambda r: -r['score'])
+    return ranked[:top_n] if top_n is not None else ranked
@@ -1,14 +1,31 @@
 """
 PennyStalker - Scrapers Package
 Data collection from StockTitan and SEC Edgar
+
+The scraper classes are imported on first use, so importing a light module
+from the package (the CIK index, the form index) doesn't load the HTTP stack.
 """
 
-from .stocktitan import StockTitanScraper
-from .sec import SECScraper
+import importlib
+
+# Public name -> module that defines it
+_LAZY = {
+    'StockTitanScraper': '.stocktitan',
+    'SECScraper': '.sec',
+}
 
 __all__ = [
     'StockTitanScraper',
     'SECScraper',
 ]
 
-__version__ = '1.0.0'
\ No newline at end of file
+__version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
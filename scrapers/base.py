@@ -4,12 +4,24 @@ Shared functionality for all scrapers
 """
 
 import requests
-import time
+from requests.adapters import HTTPAdapter
 import logging
-from typing import Optional
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
 from abc import ABC
 
 from config_files import ScanParameters
+from metrics import get_metrics
+from .rate_limiter import get_rate_limiter, host_key
+from .retry_policy import (
+    CircuitBreaker, IDEMPOTENT_METHODS, RETRY_STATUSES, THROTTLE_STATUSES,
+    backoff_delay, get_circuit_breaker, retry_after_seconds,
+)
+from .http_cache import get_http_cache
+from .parsers import get_parse_executor
+from .single_flight import SingleFlight
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -28,8 +40,31 @@ class BaseScraper(ABC):
         self.timeout = ScanParameters.REQUEST_TIMEOUT
         self.delay = ScanParameters.REQUEST_DELAY
         
+        # Shared per-host token buckets (replaces a fixed sleep per request)
+        self.rate_limiter = get_rate_limiter()
+        
+        # Persistent response cache shared by all scrapers (None if disabled)
+        self.http_cache = get_http_cache()
+        self.cache_stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stale': 0}
+        self.request_stats = {'retries': 0, 'throttled': 0, 'failed_fast': 0}
+        self.saved_stats = {'coalesced': 0, 'memoized': 0}
+        self.stats_lock = threading.Lock()
+        
+        # Per-scan latency / bytes / wait metrics (no-op if METRICS=false)
+        self.metrics = get_metrics()
+        
+        # Concurrent GETs for the same URL share one request
+        self.in_flight = SingleFlight()
+        
+        # Worker processes for HTML parsing (None = parse on the calling thread)
+        self.parse_executor = get_parse_executor()
+        
         # Create persistent session for connection pooling
+        # Pool is sized so concurrent workers don't fight over connections
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, ScanParameters.MAX_WORKERS))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Default headers (can be overridden by subclasses)
         self.session.headers.update({
@@ -43,57 +78,298 @@ class BaseScraper(ABC):
         logger.debug(f"{self.__class__.__name__} initialized")
     
     
-    def make_request(self, url: str, method: str = 'GET', **kwargs) -> Optional[requests.Response]:
+    def make_request(self, url: str, method: str = 'GET', revalidate: bool = False,
+                     **kwargs) -> Optional[requests.Response]:
         """
-        Make an HTTP request with error handling and rate limiting
+        Make an HTTP request with error handling, caching, rate limiting and retries
+        
+        GETs are served from the HTTP cache while fresh, and revalidated with
+        ETag / If-Modified-Since once stale. Streaming requests and requests
+        that carry their own validators bypass the cache.
+        
+        GETs that time out or get a 429/5xx are retried with jittered backoff
+        (honoring Retry-After). Throttling also pauses and slows the whole
+        host, and a host that keeps failing is skipped by its circuit breaker
+        until it cools down. When a request finally fails, a stale cached copy
+        is served if there is one.
+        
+        Concurrent identical GETs are coalesced: the first caller makes the
+        request and the others wait for it and get the same response.
         
         Args:
             url: URL to request
             method: HTTP method (GET, POST, etc.)
+            revalidate: Ask the server even if the cached copy is still fresh
             **kwargs: Additional arguments passed to requests
             
         Returns:
             Response object or None if request failed
         """
+        if not self._is_coalescable(method, kwargs):
+            return self._make_request(url, method, revalidate, **kwargs)
         
-        # Rate limiting - respect the delay
-        time.sleep(self.delay)
+        def fetch():
+            response = self._make_request(url, method, revalidate, **kwargs)
+            if response is not None:
+                response.content  # Read the body now so every waiter can use it
+            return response
         
-        try:
-            # Set timeout if not provided
-            if 'timeout' not in kwargs:
-                kwargs['timeout'] = self.timeout
-            
-            # Make request
-            if method.upper() == 'GET':
-                response = self.session.get(url, **kwargs)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, **kwargs)
-            else:
-                logger.error(f"Unsupported HTTP method: {method}")
+        params = kwargs.get('params')
+        key = (url, tuple(sorted(params.items())) if params else None, revalidate)
+        response, shared = self.in_flight.do(key, fetch)
+        
+        if shared:
+            self._count(self.saved_stats, 'coalesced')
+            logger.debug(f"Coalesced with request in flight: {url}")
+        return response
+    
+    
+    def _make_request(self, url: str, method: str, revalidate: bool, **kwargs) -> Optional[requests.Response]:
+        """make_request without coalescing"""
+        method = method.upper()
+        
+        if method not in ('GET', 'POST'):
+            logger.error(f"Unsupported HTTP method: {method}")
+            return None
+        
+        # Check the cache first - a fresh hit costs no request at all
+        cached = None
+        use_cache = self._is_cacheable(method, kwargs)
+        
+        # Query parameters are part of what was asked for - key the cache on the full URL
+        cache_key = self._cache_key(url, kwargs.get('params')) if use_cache else url
+        
+        if use_cache:
+            cached = self.http_cache.lookup(cache_key)
+            
+            if cached and cached.fresh and not revalidate:
+                self._count(self.cache_stats, 'hits')
+                logger.debug(f"Cache hit: {url}")
+                return cached.to_response()
+            
+            if cached:
+                kwargs['headers'] = {**(kwargs.get('headers') or {}), **cached.conditional_headers()}
+        
+        # Set timeout if not provided
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = self.timeout
+        
+        breaker = get_circuit_breaker(url)
+        host = host_key(url)
+        attempts = 1 + (ScanParameters.MAX_RETRIES if method in IDEMPOTENT_METHODS else 0)
+        
+        for attempt in range(attempts):
+            retries_left = attempt + 1 < attempts
+            
+            # Degraded host - fail fast instead of waiting out another timeout
+            if not breaker.allow():
+                self._count(self.request_stats, 'failed_fast')
+                logger.debug(f"Circuit open for {host_key(url)} - skipping {url}")
+                return self._serve_stale(url, cached)
+            
+            # Rate limiting - wait for a token from this host's bucket
+            waited = self.rate_limiter.acquire(url)
+            if waited:
+                self.metrics.inc('rate_limit_wait_seconds_total', waited, host=host)
+            
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                problem = 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'connection error'
+                self.metrics.inc('http_requests_total', host=host, status=problem.split()[0])
+                self._record_failure(url, breaker)
+                
+                if retries_left:
+                    delay = backoff_delay(attempt)
+                    self._count(self.request_stats, 'retries')
+                    logger.warning(f"Request {problem} for {url} - retrying in {delay:.1f}s")
+                    self.metrics.inc('retry_backoff_seconds_total', delay, host=host)
+                    time.sleep(delay)
+                    continue
+                
+                logger.error(f"Request {problem} for {url}")
+                return self._serve_stale(url, cached)
+                
+            except Exception as e:
+                logger.error(f"Unexpected error requesting {url}: {e}")
+                self._record_failure(url, breaker)
                 return None
             
+            self.metrics.observe('http_request_seconds', time.perf_counter() - start, host=host)
+            self.metrics.inc('http_requests_total', host=host, status=str(response.status_code))
+            
+            if response.status_code in RETRY_STATUSES:
+                status = response.status_code
+                response.close()
+                
+                # 429 means busy, not broken - pacing handles it, the breaker doesn't
+                # (but a half-open trial still has to end, or the host stays locked out)
+                if status != 429:
+                    self._record_failure(url, breaker)
+                else:
+                    breaker.release_trial()
+                
+                retry_after = retry_after_seconds(response)
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                
+                # Asked to stay away longer than we'd wait - skip the host until then
+                if retry_after is not None and retry_after > ScanParameters.RETRY_BACKOFF_MAX:
+                    breaker.trip(retry_after)
+                    logger.error(f"HTTP {status} for {url} - {host_key(url)} asks to wait "
+                                 f"{retry_after:.0f}s, skipping it until then")
+                    return self._serve_stale(url, cached)
+                
+                # Throttling pauses every request to the host (acquire waits it out),
+                # other server errors only delay this retry
+                if status in THROTTLE_STATUSES:
+                    self._count(self.request_stats, 'throttled')
+                    self.rate_limiter.throttle(url, delay)
+                
+                if retries_left:
+                    self._count(self.request_stats, 'retries')
+                    logger.warning(f"HTTP {status} for {url} - retrying in {delay:.1f}s "
+                                   f"(attempt {attempt + 2}/{attempts})")
+                    if status not in THROTTLE_STATUSES:
+                        self.metrics.inc('retry_backoff_seconds_total', delay, host=host)
+                        time.sleep(delay)
+                    continue
+                
+                logger.error(f"HTTP error for {url}: {status} after {attempts} attempts")
+                return self._serve_stale(url, cached)
+            
+            # The host answered (a 404 is the request's problem, not the host's)
+            breaker.record_success()
+            self.rate_limiter.recover(url)
+            
+            # Streamed bodies are counted by the caller once read
+            if not kwargs.get('stream'):
+                self.record_bytes(url, response)
+            
+            # Stale entry still valid - serve it and extend its lifetime
+            if cached and response.status_code == 304:
+                self._count(self.cache_stats, 'revalidated')
+                self.http_cache.refresh(cache_key, response)
+                logger.debug(f"Cache revalidated: {url}")
+                return cached.to_response()
+            
             # Check for HTTP errors
-            response.raise_for_status()
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                logger.error(f"HTTP error for {url}: {e}")
+                return None
+            
+            if use_cache:
+                self._count(self.cache_stats, 'misses')
+                if response.status_code == 200:
+                    self.http_cache.store(cache_key, response)
             
             logger.debug(f"Request successful: {url} (Status: {response.status_code})")
             return response
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"Request timeout for {url}")
-            return None
-            
-        except requests.exceptions.ConnectionError:
-            logger.error(f"Connection error for {url}")
+        
+        return None
+    
+    
+    def _record_failure(self, url: str, breaker: CircuitBreaker):
+        """Count a failed attempt against the host's circuit breaker"""
+        if breaker.record_failure():
+            logger.warning(
+                f"Circuit opened for {host_key(url)} - failing fast for "
+                f"{ScanParameters.CIRCUIT_BREAKER_COOLDOWN:.0f}s"
+            )
+    
+    
+    def _serve_stale(self, url: str, cached) -> Optional[requests.Response]:
+        """Fall back to an expired cached copy when the host can't be reached"""
+        if cached is None:
             return None
+        
+        self._count(self.cache_stats, 'stale')
+        logger.warning(f"Serving stale cached copy of {url}")
+        return cached.to_response()
+    
+    
+    def parse(self, func: Callable, *args) -> Any:
+        """
+        Run a parser from scrapers.parsers
+        
+        With PARSE_WORKERS set the call goes to the process pool, so the
+        GIL-bound BeautifulSoup work happens off the I/O threads; this thread
+        just waits on the result. Otherwise it runs inline.
+        
+        Args:
+            func: Module-level parse function (must be picklable)
+            *args: Arguments for it (raw bytes and plain values)
             
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error for {url}: {e}")
-            return None
+        Returns:
+            Whatever the parse function returns
+        """
+        with self.metrics.timer('parse_seconds', parser=func.__name__):
+            if self.parse_executor is None:
+                return func(*args)
             
-        except Exception as e:
-            logger.error(f"Unexpected error requesting {url}: {e}")
-            return None
+            try:
+                return self.parse_executor.submit(func, *args).result()
+            except BrokenProcessPool as e:
+                # A dead worker shouldn't end the scan - parse here from now on
+                logger.error(f"Parse pool failed ({e}) - parsing inline")
+                self.parse_executor = None
+                return func(*args)
+    
+    
+    def record_bytes(self, url: str, response: requests.Response):
+        """
+        Count a response's body bytes toward its host's transfer metric
+        
+        Reads the bytes taken off the wire (before decompression), so a
+        streamed download abandoned half way counts only what arrived.
+        
+        Args:
+            url: URL the response came from
+            response: Response whose body has been read (or closed early)
+        """
+        if not self.metrics.enabled:
+            return
+        
+        try:
+            received = response.raw.tell()
+        except (AttributeError, OSError):
+            return  # Built from the cache, not the network
+        
+        self.metrics.inc('http_response_bytes_total', received, host=host_key(url))
+    
+    
+    def _count(self, stats: dict, stat: str):
+        """Increment a cache / request counter (scrapers are shared across threads)"""
+        with self.stats_lock:
+            stats[stat] += 1
+        self.metrics.inc('scraper_events_total', scraper=self.__class__.__name__, event=stat)
+    
+    
+    @staticmethod
+    def _is_coalescable(method: str, kwargs: dict) -> bool:
+        """Whether one response can serve every concurrent caller (plain, non-streaming GETs)"""
+        return method.upper() == 'GET' and not kwargs.get('stream') and not kwargs.get('headers')
+    
+    
+    @staticmethod
+    def _cache_key(url: str, params) -> str:
+        """URL the request actually goes to (params encoded the way requests does)"""
+        if not params:
+            return url
+        return requests.Request('GET', url, params=params).prepare().url
+    
+    
+    def _is_cacheable(self, method: str, kwargs: dict) -> bool:
+        """Whether a request may be served from / stored in the HTTP cache"""
+        if self.http_cache is None or method.upper() != 'GET' or kwargs.get('stream'):
+            return False
+        
+        # Callers doing their own revalidation need to see the real 304
+        headers = kwargs.get('headers') or {}
+        return not any(name in headers for name in ('If-None-Match', 'If-Modified-Since'))
     
     
     def test_connection(self, url: str) -> bool:
@@ -114,7 +390,28 @@ class BaseScraper(ABC):
     
     
     def close(self):
-        """Close the session (cleanup)"""
+        """Close the session (cleanup) and report cache / retry counts for this run"""
+        if self.http_cache is not None and any(self.cache_stats.values()):
+            stats = self.cache_stats
+            logger.info(
+                f"{self.__class__.__name__} cache: {stats['hits']} hits, "
+                f"{stats['revalidated']} revalidated, {stats['misses']} misses, {stats['stale']} stale"
+            )
+        
+        if any(self.request_stats.values()):
+            stats = self.request_stats
+            logger.info(
+                f"{self.__class__.__name__} requests: {stats['retries']} retries, "
+                f"{stats['throttled']} throttled, {stats['failed_fast']} failed fast"
+            )
+        
+        if any(self.saved_stats.values()):
+            stats = self.saved_stats
+            logger.info(
+                f"{self.__class__.__name__} duplicate work saved: {stats['coalesced']} requests "
+                f"coalesced, {stats['memoized']} lookups answered from this run's results"
+            )
+        
         self.session.close()
         logger.debug(f"{self.__class__.__name__} session closed")
     
@@ -0,0 +1,231 @@
+"""
+PennyStalker - Ticker to CIK Index
+Local copy of SEC's company tickers file so symbols resolve without a network call
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from config_files import DataSources, ScanParameters, TimeWindows
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_ticker(ticker: str) -> str:
+    """Normalize a symbol to SEC's spelling (upper case, '-' for share classes)"""
+    return ticker.strip().upper().replace('.', '-')
+
+
+class CIKIndex:
+    """
+    Ticker -> CIK lookup table backed by a sorted text file
+    
+    The file holds one 'TICKER<tab>CIK' line per symbol and is read into a
+    dict once per process, so validating a ticker is a single hash lookup.
+    Refreshes use a conditional GET and only rewrite the file when SEC's
+    copy actually changed.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Index file location (default: CACHE_DIR/cik_index.tsv)
+        """
+        self.path = path or os.path.join(ScanParameters.CACHE_DIR, 'cik_index.tsv')
+        self.meta_path = self.path + '.meta.json'
+        self.url = DataSources.SEC_COMPANY_TICKERS
+        self.ciks: Dict[str, int] = {}
+        self.symbols: FrozenSet[str] = frozenset()  # Same keys, shareable with the ticker extractor
+        self.meta: Dict = {}
+        self.loaded = False
+        self.checked = False  # Freshness checked this process
+        self.lock = threading.Lock()
+    
+    
+    @property
+    def available(self) -> bool:
+        """True if the index has entries to validate against"""
+        return bool(self.ciks)
+    
+    
+    def __len__(self) -> int:
+        return len(self.ciks)
+    
+    
+    def __contains__(self, ticker: str) -> bool:
+        return normalize_ticker(ticker) in self.ciks
+    
+    
+    def lookup(self, ticker: str) -> Optional[int]:
+        """
+        Resolve a ticker to its CIK
+        
+        Args:
+            ticker: Stock ticker symbol
+            
+        Returns:
+            CIK number or None if the ticker is unknown
+        """
+        return self.ciks.get(normalize_ticker(ticker))
+    
+    
+    def filter_known(self, tickers: Iterable[str]) -> List[str]:
+        """
+        Drop tickers that are not SEC registrants
+        Returns the input unchanged if the index is unavailable
+        """
+        tickers = list(tickers)
+        if not self.available:
+            return tickers
+        return [t for t in tickers if normalize_ticker(t) in self.ciks]
+    
+    
+    def load(self) -> bool:
+        """
+        Read the index file from disk (no-op after the first call)
+        
+        Returns:
+            True if entries were loaded
+        """
+        with self.lock:
+            if self.loaded:
+                return self.available
+            self.loaded = True
+            
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        ticker, _, cik = line.rstrip('\n').partition('\t')
+                        if ticker and cik:
+                            self.ciks[ticker] = int(cik)
+            except FileNotFoundError:
+                logger.debug(f"No CIK index at {self.path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read CIK index {self.path}: {e}")
+                self.ciks = {}
+            
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    self.meta = json.load(f)
+            except (OSError, ValueError):
+                self.meta = {}
+            
+            self.symbols = frozenset(self.ciks)
+            
+            if self.ciks:
+                logger.debug(f"Loaded {len(self.ciks)} tickers from CIK index")
+            return self.available
+    
+    
+    def is_stale(self) -> bool:
+        """True if the index is missing or older than CIK_INDEX_MAX_AGE_HOURS"""
+        fetched_at = self.meta.get('fetched_at', 0)
+        max_age = TimeWindows.CIK_INDEX_MAX_AGE_HOURS * 3600
+        return not self.available or time.time() - fetched_at > max_age
+    
+    
+    def ensure_fresh(self, scraper) -> bool:
+        """
+        Load the index and refresh it from SEC if stale
+        Only the first call per process does any work
+        
+        Args:
+            scraper: Scraper whose make_request is used for the download
+            
+        Returns:
+            True if the index is available
+        """
+        self.load()
+        
+        with self.lock:
+            if self.checked:
+                return self.available
+            self.checked = True
+            
+            if self.is_stale():
+                self._refresh(scraper)
+            
+            return self.available
+    
+    
+    def _refresh(self, scraper):
+        """Conditionally download SEC's tickers file and apply any changes"""
+        headers = {}
+        if self.available and self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.available and self.meta.get('last_modified'):
+            headers['If-Modified-Since'] = self.meta['last_modified']
+        
+        response = scraper.make_request(self.url, headers=headers)
+        
+        if not response:
+            logger.warning("Could not refresh CIK index - using local copy" if self.available
+                           else "Could not download CIK index - tickers will not be pre-validated")
+            return
+        
+        if response.status_code == 304:
+            logger.debug("CIK index unchanged on SEC")
+            self._save_meta(response)
+            return
+        
+        try:
+            data = response.json()
+            fresh = {
+                normalize_ticker(entry['ticker']): int(entry['cik_str'])
+                for entry in data.values()
+            }
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Malformed company tickers file: {e}")
+            return
+        
+        added = sum(1 for t, cik in fresh.items() if self.ciks.get(t) != cik)
+        removed = sum(1 for t in self.ciks if t not in fresh)
+        
+        self.ciks = fresh
+        self.symbols = frozenset(fresh)
+        self._save(response)
+        logger.info(f"CIK index refreshed: {len(fresh)} tickers ({added} new/changed, {removed} removed)")
+    
+    
+    def _save(self, response):
+        """Write the index file atomically, sorted by ticker"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"{ticker}\t{self.ciks[ticker]}\n" for ticker in sorted(self.ciks))
+        os.replace(tmp_path, self.path)
+        
+        self._save_meta(response)
+    
+    
+    def _save_meta(self, response):
+        """Record validators and fetch time for the next conditional refresh"""
+        self.meta = {
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag') or self.meta.get('etag'),
+            'last_modified': response.headers.get('Last-Modified') or self.meta.get('last_modified'),
+        }
+        
+        os.makedirs(os.path.dirname(self.meta_path) or '.', exist_ok=True)
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+
+
+# One index per process - loaded on first use
+_shared_index: Optional[CIKIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_cik_index() -> CIKIndex:
+    """Get the process-wide ticker -> CIK index"""
+    global _shared_index
+    
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = CIKIndex()
+        return _shared_index
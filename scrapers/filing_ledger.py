@@ -0,0 +1,192 @@
+"""
+PennyStalker - Filing Ledger
+Per-CIK record of filings already listed, so company pages are synced incrementally
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from config_files import CacheSettings, ScanParameters
+
+logger = logging.getLogger(__name__)
+
+
+class FilingLedger:
+    """
+    SQLite ledger of every filing seen per company
+    
+    Accepted filings never change, so once a company's history has been
+    paged back to a date only filings newer than the ones already recorded
+    need fetching. covered_from marks how far back the ledger is complete.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (default: CACHE_DIR/filing_ledger.sqlite3)
+        """
+        self.path = path or os.path.join(ScanParameters.CACHE_DIR, 'filing_ledger.sqlite3')
+        self.lock = threading.Lock()
+        self.conn = None
+    
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS companies (
+                    cik INTEGER PRIMARY KEY,
+                    covered_from REAL NOT NULL,
+                    synced_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS filings (
+                    cik INTEGER NOT NULL,
+                    filing_url TEXT NOT NULL,
+                    filing_type TEXT NOT NULL,
+                    filing_date REAL NOT NULL,
+                    PRIMARY KEY (cik, filing_url)
+                );
+                CREATE INDEX IF NOT EXISTS idx_filings_cik_date ON filings (cik, filing_date);
+            """)
+            self.conn.commit()
+        return self.conn
+    
+    
+    def sync_state(self, cik: int) -> Optional[Tuple[datetime, float]]:
+        """
+        How far back and how recently a company was synced
+        
+        Args:
+            cik: Company CIK
+        
+        Returns:
+            (date the ledger is complete from, time of the last sync),
+            or None if the company was never synced
+        """
+        with self.lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT covered_from, synced_at FROM companies WHERE cik = ?", (cik,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Filing ledger read failed: {e}")
+                return None
+        return (datetime.fromtimestamp(row[0]), row[1]) if row else None
+    
+    
+    def known_urls(self, cik: int) -> Set[str]:
+        """Filing URLs already recorded for a company"""
+        with self.lock:
+            try:
+                rows = self._connect().execute(
+                    "SELECT filing_url FROM filings WHERE cik = ?", (cik,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Filing ledger read failed: {e}")
+                return set()
+        return {row[0] for row in rows}
+    
+    
+    def record(self, cik: int, filings: List[Dict], covered_from: Optional[datetime] = None):
+        """
+        Add newly listed filings for a company
+        
+        Args:
+            cik: Company CIK
+            filings: Filing dicts from the company page
+            covered_from: Set after a full sync - the ledger is complete back to
+                this date and older rows are dropped (None for a delta sync)
+        """
+        rows = [
+            (cik, filing['filing_url'], filing['filing_type'], filing['filing_date'].timestamp())
+            for filing in filings
+        ]
+        
+        with self.lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("INSERT OR IGNORE INTO filings VALUES (?, ?, ?, ?)", rows)
+                    
+                    if covered_from is not None:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO companies VALUES (?, ?, ?)",
+                            (cik, covered_from.timestamp(), time.time())
+                        )
+                        conn.execute(
+                            "DELETE FROM filings WHERE cik = ? AND filing_date < ?",
+                            (cik, covered_from.timestamp())
+                        )
+                    else:
+                        conn.execute("UPDATE companies SET synced_at = ? WHERE cik = ?", (time.time(), cik))
+            except sqlite3.Error as e:
+                logger.warning(f"Filing ledger write failed: {e}")
+    
+    
+    def filings(self, cik: int, ticker: str, cutoff_date: datetime) -> Optional[List[Dict]]:
+        """
+        Recorded filings for a company inside a window, newest first
+        
+        Args:
+            cik: Company CIK
+            ticker: Stock ticker the filings belong to
+            cutoff_date: Ignore filings older than this
+        
+        Returns:
+            List of dicts with keys: ticker, filing_type, filing_date, filing_url,
+            or None if the ledger couldn't be read
+        """
+        with self.lock:
+            try:
+                rows = self._connect().execute(
+                    "SELECT filing_type, filing_date, filing_url FROM filings "
+                    "WHERE cik = ? AND filing_date >= ? ORDER BY filing_date DESC",
+                    (cik, cutoff_date.timestamp())
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Filing ledger read failed: {e}")
+                return None
+        
+        return [
+            {
+                'ticker': ticker.upper(),
+                'filing_type': filing_type,
+                'filing_date': datetime.fromtimestamp(filing_date),
+                'filing_url': filing_url,
+            }
+            for filing_type, filing_date, filing_url in rows
+        ]
+    
+    
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+# One ledger per process, shared by all SEC scrapers
+_shared_ledger: Optional[FilingLedger] = None
+_shared_lock = threading.Lock()
+
+
+def get_filing_ledger() -> Optional[FilingLedger]:
+    """Get the process-wide filing ledger (None if disabled in config)"""
+    global _shared_ledger
+    
+    if not CacheSettings.FILING_LEDGER_ENABLED:
+        return None
+    
+    with _shared_lock:
+        if _shared_ledger is None:
+            _shared_ledger = FilingLedger()
+        return _shared_ledger
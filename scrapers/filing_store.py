@@ -0,0 +1,256 @@
+"""
+PennyStalker - Filing Text Store
+Extracted filing text kept on disk, keyed by accession number
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from config_files import CacheSettings, ScanParameters
+
+logger = logging.getLogger(__name__)
+
+ACCESSION_PATTERN = re.compile(r'(\d{10}-\d{2}-\d{6})')
+
+
+def accession_from_url(url: str) -> Optional[str]:
+    """
+    Pull the accession number out of a filing URL
+    
+    Args:
+        url: Filing documents page URL (.../0001234567-24-000001-index.htm)
+        
+    Returns:
+        Accession number or None if the URL doesn't contain one
+    """
+    match = ACCESSION_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+class FilingTextStore:
+    """
+    Compressed text blobs plus a SQLite index with sizes and access times
+    
+    Accepted SEC filings never change, so an accession number always maps to
+    the same text and entries never need revalidation - only eviction once
+    the store grows past its size cap.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Store location (default: CACHE_DIR/filing_text)
+            max_bytes: Cap on compressed bytes kept (default: FILING_STORE_MAX_MB)
+        """
+        self.directory = directory or os.path.join(ScanParameters.CACHE_DIR, 'filing_text')
+        self.index_path = os.path.join(self.directory, 'index.sqlite3')
+        self.max_bytes = max_bytes or CacheSettings.FILING_STORE_MAX_MB * 1024 * 1024
+        
+        self.total_bytes = 0
+        self.touched: Dict[str, float] = {}  # Access times from reads, written on flush
+        self.conn = None
+        self.lock = threading.Lock()
+    
+    
+    def _blob_path(self, accession: str) -> str:
+        """Blob location - sharded by the accession's last two digits"""
+        return os.path.join(self.directory, accession[-2:], f"{accession}.z")
+    
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the index on first use (caller holds the lock)"""
+        if self.conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    accession TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_accessed ON blobs (accessed_at)")
+            self._import_json_index(self.conn)
+            self.conn.commit()
+            
+            row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            self.total_bytes = row[0]
+        return self.conn
+    
+    
+    def _import_json_index(self, conn: sqlite3.Connection):
+        """Carry over the index.json kept by earlier versions, then remove it"""
+        json_path = os.path.join(self.directory, 'index.json')
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Old filing store index unreadable, skipping it: {e}")
+            entries = {}
+        
+        conn.executemany(
+            "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)",
+            [(accession, size, accessed) for accession, (size, accessed) in entries.items()]
+        )
+        try:
+            os.remove(json_path)
+        except OSError:
+            pass
+    
+    
+    def __contains__(self, accession: str) -> bool:
+        with self.lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT 1 FROM blobs WHERE accession = ?", (accession,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Filing store read failed: {e}")
+                return False
+        return row is not None
+    
+    
+    def get(self, accession: str) -> Optional[str]:
+        """
+        Read stored text for a filing
+        
+        Args:
+            accession: Accession number
+            
+        Returns:
+            Extracted text or None if not stored
+        """
+        if accession not in self:
+            return None
+        
+        try:
+            with open(self._blob_path(accession), 'rb') as f:
+                text = zlib.decompress(f.read()).decode('utf-8')
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable filing blob {accession}: {e}")
+            with self.lock:
+                self._forget(accession)
+            return None
+        
+        with self.lock:
+            self.touched[accession] = time.time()
+        return text
+    
+    
+    def put(self, accession: str, text: str):
+        """
+        Store extracted text, evicting least recently used filings if over the cap
+        
+        Args:
+            accession: Accession number
+            text: Extracted filing text
+        """
+        blob = zlib.compress(text.encode('utf-8'), 6)
+        path = self._blob_path(accession)
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store filing text {accession}: {e}")
+            return
+        
+        with self.lock:
+            try:
+                conn = self._connect()
+                old = conn.execute("SELECT size FROM blobs WHERE accession = ?", (accession,)).fetchone()
+                conn.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)", (accession, len(blob), time.time()))
+                self.total_bytes += len(blob) - (old[0] if old else 0)
+                self.touched.pop(accession, None)
+                
+                if self.total_bytes > self.max_bytes:
+                    self._evict(conn)
+                
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not index filing text {accession}: {e}")
+    
+    
+    def _forget(self, accession: str):
+        """Remove an entry from the index (caller holds the lock)"""
+        self.touched.pop(accession, None)
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT size FROM blobs WHERE accession = ?", (accession,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM blobs WHERE accession = ?", (accession,))
+                self.total_bytes -= row[0]
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Filing store write failed: {e}")
+    
+    
+    def _write_touched(self, conn: sqlite3.Connection):
+        """Apply access times gathered by reads (caller holds the lock)"""
+        if self.touched:
+            conn.executemany(
+                "UPDATE blobs SET accessed_at = ? WHERE accession = ?",
+                [(accessed, accession) for accession, accessed in self.touched.items()]
+            )
+            self.touched = {}
+    
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used blobs until under 90% of the cap (caller holds the lock)"""
+        target = int(self.max_bytes * 0.9)
+        self._write_touched(conn)
+        
+        rows = conn.execute("SELECT accession, size FROM blobs ORDER BY accessed_at").fetchall()
+        for accession, size in rows:
+            if self.total_bytes <= target:
+                break
+            conn.execute("DELETE FROM blobs WHERE accession = ?", (accession,))
+            self.total_bytes -= size
+            try:
+                os.remove(self._blob_path(accession))
+            except OSError:
+                pass
+    
+    
+    def flush(self):
+        """Persist access times gathered by reads"""
+        with self.lock:
+            if not self.touched:
+                return
+            try:
+                conn = self._connect()
+                self._write_touched(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write filing store access times: {e}")
+
+
+# One store per process, shared by all SEC scrapers
+_shared_store: Optional[FilingTextStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_filing_store() -> Optional[FilingTextStore]:
+    """Get the process-wide filing text store (None if disabled in config)"""
+    global _shared_store
+    
+    if not CacheSettings.FILING_STORE_ENABLED:
+        return None
+    
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = FilingTextStore()
+        return _shared_store
@@ -0,0 +1,380 @@
+"""
+PennyStalker - EDGAR Form Index
+Local table of recent filings built from EDGAR's bulk master index files
+
+Instead of one company page request per candidate, the 'bulk' backend
+downloads EDGAR's quarterly master index once, then only the daily index
+files published since, and answers every ticker from a local table keyed
+by CIK.
+"""
+
+import gzip
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+from config_files import ScanParameters, TimeWindows
+from .sec_submissions import FilingColumns
+
+logger = logging.getLogger(__name__)
+
+DAILY_FILE_PATTERN = re.compile(r'^master\.(\d{8})\.idx$')
+
+# Wait this long before trying a failed quarterly download again
+BACKFILL_RETRY_SECONDS = 15 * 60
+
+
+def normalize_date(text: str) -> str:
+    """Master index dates -> 'YYYY-MM-DD' (daily files write them as YYYYMMDD)"""
+    text = text.strip()
+    if len(text) == 8 and text.isdigit():
+        return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    return text
+
+
+def quarters_between(start: date, end: date) -> List[Tuple[int, int]]:
+    """Calendar quarters (year, quarter) from start's through end's, in order"""
+    quarters = []
+    year, quarter = start.year, (start.month - 1) // 3 + 1
+    
+    while (year, quarter) <= (end.year, (end.month - 1) // 3 + 1):
+        quarters.append((year, quarter))
+        year, quarter = (year + 1, 1) if quarter == 4 else (year, quarter + 1)
+    
+    return quarters
+
+
+def parse_master_index(lines: Iterable[str], ciks: Optional[Set[int]] = None) -> Iterator[Tuple[int, str, str, str]]:
+    """
+    Parse an EDGAR master index (full-index master.idx or daily-index master.YYYYMMDD.idx)
+    
+    Data lines look like 'CIK|Company Name|Form Type|Date Filed|edgar/data/CIK/ACCESSION.txt';
+    the description header and dashed rule above them are skipped
+    
+    Args:
+        lines: Lines of the index file
+        ciks: Only keep these companies (None = keep every filer)
+    
+    Yields:
+        (cik, form_type, filing_date 'YYYY-MM-DD', accession)
+    """
+    for line in lines:
+        parts = line.rstrip('\r\n').split('|')
+        if len(parts) != 5 or not parts[0].isdigit():
+            continue
+        
+        cik = int(parts[0])
+        if ciks is not None and cik not in ciks:
+            continue
+        
+        accession = parts[4].rsplit('/', 1)[-1]
+        if accession.endswith('.txt'):
+            accession = accession[:-4]
+        
+        yield cik, parts[2], normalize_date(parts[3]), accession
+
+
+class FormIndex:
+    """
+    Recent filings for every listed company, from EDGAR's master index files
+    
+    The table is clustered by CIK, so answering a candidate is one short
+    range scan. covered_from / synced_through record which dates are loaded;
+    the table only keeps DILUTION_HISTORY_DAYS, pruned as the window moves.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (default: CACHE_DIR/form_index.sqlite3)
+        """
+        self.path = path or os.path.join(ScanParameters.CACHE_DIR, 'form_index.sqlite3')
+        self.history_days = TimeWindows.DILUTION_HISTORY_DAYS
+        self.lock = threading.Lock()
+        self.conn = None
+        self.backfill_failed_at = None  # Monotonic time of the last failed backfill
+    
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS filings (
+                    cik INTEGER NOT NULL,
+                    accession TEXT NOT NULL,
+                    form_type TEXT NOT NULL,
+                    filing_date TEXT NOT NULL,
+                    PRIMARY KEY (cik, accession)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+            self.conn.commit()
+        return self.conn
+    
+    
+    def _state(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    
+    def _set_state(self, key: str, value: str):
+        self._connect().execute("INSERT OR REPLACE INTO state VALUES (?, ?)", (key, value))
+    
+    
+    def ingest(self, rows: Iterable[Tuple[int, str, str, str]]) -> Tuple[int, Optional[str]]:
+        """
+        Add parsed index rows in one transaction
+        
+        Args:
+            rows: (cik, form_type, filing_date, accession) tuples, e.g. from parse_master_index
+        
+        Returns:
+            (rows read, newest filing date seen or None)
+        """
+        seen = {'count': 0, 'newest': None}
+        
+        def reordered():
+            for cik, form_type, filing_date, accession in rows:
+                seen['count'] += 1
+                if seen['newest'] is None or filing_date > seen['newest']:
+                    seen['newest'] = filing_date
+                yield cik, accession, form_type, filing_date
+        
+        with self._connect():
+            self.conn.executemany("INSERT OR IGNORE INTO filings VALUES (?, ?, ?, ?)", reordered())
+        
+        return seen['count'], seen['newest']
+    
+    
+    def ingest_file(self, path: str, ciks: Optional[Set[int]] = None) -> int:
+        """
+        Load a saved master index file (plain or .gz)
+        Marks the index available from the file's oldest date, so it can be used offline
+        
+        Args:
+            path: master.idx / master.YYYYMMDD.idx file
+            ciks: Only keep these companies (None = keep every filer)
+        
+        Returns:
+            Number of rows loaded
+        """
+        opener = gzip.open if path.endswith('.gz') else open
+        
+        with self.lock:
+            with opener(path, 'rt', encoding='latin-1') as f:
+                rows = list(parse_master_index(f, ciks))
+            
+            count, newest = self.ingest(rows)
+            if rows:
+                oldest = min(row[2] for row in rows)
+                covered_from = self._state('covered_from')
+                synced_through = self._state('synced_through')
+                with self.conn:
+                    self._set_state('covered_from', min(covered_from or oldest, oldest))
+                    self._set_state('synced_through', max(synced_through or newest, newest))
+        
+        logger.info(f"Loaded {count} filings from {path}")
+        return count
+    
+    
+    @property
+    def available(self) -> bool:
+        """True once some index range has been loaded"""
+        with self.lock:
+            try:
+                return self._state('covered_from') is not None
+            except sqlite3.Error:
+                return False
+    
+    
+    def ensure_fresh(self, scraper) -> bool:
+        """
+        Load the window on first use, then pick up new daily index files
+        Checked at most every FORM_INDEX_CHECK_HOURS; concurrent callers wait for one sync
+        
+        Args:
+            scraper: SEC scraper whose make_request (and base_url / CIK index) is used
+        
+        Returns:
+            True if the index can answer queries
+        """
+        with self.lock:
+            try:
+                checked_at = float(self._state('checked_at') or 0)
+                covered_from = self._state('covered_from')
+                
+                if covered_from and time.time() - checked_at < TimeWindows.FORM_INDEX_CHECK_HOURS * 3600:
+                    return True
+                
+                since = (date.today() - timedelta(days=self.history_days)).isoformat()
+                
+                # Only keep listed companies - every other filer is noise for a ticker scan
+                ciks = set(scraper.cik_index.ciks.values()) or None
+                archive = f"{scraper.base_url}/Archives/edgar"
+                
+                if covered_from is None or covered_from > since:
+                    # Don't retry a failed multi-megabyte download for every ticker in the batch
+                    if self.backfill_failed_at and time.monotonic() - self.backfill_failed_at < BACKFILL_RETRY_SECONDS:
+                        return covered_from is not None
+                    
+                    if not self._backfill(scraper, archive, since, ciks):
+                        self.backfill_failed_at = time.monotonic()
+                        return covered_from is not None
+                
+                self._sync_daily(scraper, archive, ciks)
+                
+                with self.conn:
+                    # Slide the window - the table stays DILUTION_HISTORY_DAYS long
+                    if self._state('covered_from') < since:
+                        self.conn.execute("DELETE FROM filings WHERE filing_date < ?", (since,))
+                        self._set_state('covered_from', since)
+                    self._set_state('checked_at', str(time.time()))
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Form index unavailable: {e}")
+                return False
+    
+    
+    def _backfill(self, scraper, archive: str, since: str, ciks: Optional[Set[int]]) -> bool:
+        """Load the quarterly master index for every quarter in the window (lock held)"""
+        quarters = quarters_between(date.fromisoformat(since), date.today())
+        logger.info(f"Building form index from {len(quarters)} quarterly master files...")
+        
+        newest = None
+        for year, quarter in quarters:
+            loaded = self._download(scraper, f"{archive}/full-index/{year}/QTR{quarter}/master.idx", ciks)
+            if loaded is None:
+                logger.warning(f"Could not download master index for {year} Q{quarter}")
+                return False
+            if loaded[1] and (newest is None or loaded[1] > newest):
+                newest = loaded[1]
+        
+        with self.conn:
+            self._set_state('covered_from', since)
+            self._set_state('synced_through', newest or since)
+        return True
+    
+    
+    def _sync_daily(self, scraper, archive: str, ciks: Optional[Set[int]]):
+        """Load daily index files published after synced_through (lock held)"""
+        synced_through = self._state('synced_through')
+        added = 0
+        
+        for year, quarter in quarters_between(date.fromisoformat(synced_through), date.today()):
+            directory = f"{archive}/daily-index/{year}/QTR{quarter}"
+            
+            listing = scraper.make_request(f"{directory}/index.json")
+            if not listing:
+                logger.warning(f"Could not list daily index files for {year} Q{quarter}")
+                return
+            
+            try:
+                names = [item['name'] for item in listing.json()['directory']['item']]
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Malformed daily index listing: {e}")
+                return
+            
+            days = []
+            for name in names:
+                match = DAILY_FILE_PATTERN.match(name)
+                if match:
+                    days.append((normalize_date(match.group(1)), name))
+            
+            for day, name in sorted(days):
+                if day <= synced_through:
+                    continue
+                
+                loaded = self._download(scraper, f"{directory}/{name}", ciks)
+                if loaded is None:
+                    return  # Retried from this day at the next check
+                
+                synced_through = day
+                added += loaded[0]
+                with self.conn:
+                    self._set_state('synced_through', day)
+        
+        logger.info(f"Form index synced through {synced_through} ({added} new filings)")
+    
+    
+    def _download(self, scraper, url: str, ciks: Optional[Set[int]]) -> Optional[Tuple[int, Optional[str]]]:
+        """Stream one master index file into the table (lock held)"""
+        # Streamed - index files are large and must not land in the HTTP cache
+        response = scraper.make_request(url, stream=True)
+        if not response:
+            return None
+        
+        try:
+            lines = (raw.decode('latin-1') for raw in response.iter_lines())
+            return self.ingest(parse_master_index(lines, ciks))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Master index download failed for {url}: {e}")
+            return None
+        finally:
+            scraper.record_bytes(url, response)
+            response.close()
+    
+    
+    def filings(self, cik: int, ticker: str, cutoff_date: datetime, base_url: str) -> Optional[List[Dict]]:
+        """
+        Filings for one company inside a window, newest first
+        
+        Args:
+            cik: Company CIK
+            ticker: Stock ticker the filings belong to
+            cutoff_date: Ignore filings older than this
+            base_url: SEC base URL for the documents page link
+        
+        Returns:
+            List of dicts with keys: ticker, filing_type, filing_date, filing_url,
+            or None if the index couldn't be read
+        """
+        with self.lock:
+            try:
+                rows = self._connect().execute(
+                    "SELECT form_type, filing_date, accession FROM filings "
+                    "WHERE cik = ? AND filing_date >= ? ORDER BY filing_date DESC",
+                    (cik, cutoff_date.strftime('%Y-%m-%d'))
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Form index read failed: {e}")
+                return None
+        
+        columns = FilingColumns(cik, [row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows])
+        return columns.to_filings(ticker, cutoff_date, base_url)
+    
+    
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+# One index per process, shared by all SEC scrapers
+_shared_index: Optional[FormIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_form_index() -> FormIndex:
+    """Get the process-wide form index (opened on first use)"""
+    global _shared_index
+    
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = FormIndex()
+        return _shared_index
@@ -0,0 +1,250 @@
+"""
+PennyStalker - HTTP Response Cache
+Persistent, size-bounded cache under BaseScraper.make_request
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config_files import CacheSettings, ScanParameters
+
+logger = logging.getLogger(__name__)
+
+# Response headers worth keeping - the body is stored decoded, so encoding/length are dropped
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+
+
+class CachedEntry:
+    """A stored response plus its validators"""
+    
+    def __init__(self, url: str, body: bytes, headers: Dict[str, str], stored_at: float, ttl: float):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.stored_at = stored_at
+        self.ttl = ttl
+    
+    
+    @property
+    def fresh(self) -> bool:
+        """True if the entry can be served without asking the server"""
+        return time.time() - self.stored_at < self.ttl
+    
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators for a revalidation request"""
+        headers = {}
+        if self.headers.get('ETag'):
+            headers['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+    
+    
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response so callers can't tell it came from disk"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = self.url
+        response._content = self.body
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+class HTTPCache:
+    """
+    SQLite-backed response cache with per-URL-class TTLs and LRU eviction
+    
+    Fresh entries are served directly. Stale entries are revalidated with
+    ETag / If-Modified-Since, and a 304 just extends their lifetime.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Database file (default: CACHE_DIR/http_cache.sqlite3)
+            max_bytes: Size cap for stored bodies (default: HTTP_CACHE_MAX_MB)
+        """
+        self.path = path or os.path.join(ScanParameters.CACHE_DIR, 'http_cache.sqlite3')
+        self.max_bytes = max_bytes or CacheSettings.HTTP_CACHE_MAX_MB * 1024 * 1024
+        self.lock = threading.Lock()
+        self.conn = None
+        self.total_bytes = 0
+    
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)")
+            self.conn.commit()
+            
+            row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            self.total_bytes = row[0]
+        return self.conn
+    
+    
+    @staticmethod
+    def ttl_for(url: str) -> float:
+        """Time-to-live for a URL, from CacheSettings.HTTP_CACHE_TTLS"""
+        for pattern, ttl in CacheSettings.HTTP_CACHE_TTLS:
+            if pattern in url:
+                return ttl
+        return CacheSettings.HTTP_CACHE_DEFAULT_TTL
+    
+    
+    def lookup(self, url: str) -> Optional[CachedEntry]:
+        """
+        Find a stored response (fresh or stale)
+        
+        Args:
+            url: Request URL
+            
+        Returns:
+            CachedEntry or None if the URL was never stored
+        """
+        with self.lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT headers, body, stored_at FROM responses WHERE url = ?", (url,)
+                ).fetchone()
+                
+                if not row:
+                    return None
+                
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache read failed: {e}")
+                return None
+        
+        headers, body, stored_at = row
+        return CachedEntry(url, body, json.loads(headers), stored_at, self.ttl_for(url))
+    
+    
+    def store(self, url: str, response: requests.Response):
+        """
+        Save a successful response, evicting least recently used entries if over the cap
+        
+        Args:
+            url: Request URL
+            response: Response with its body already read
+        """
+        body = response.content
+        
+        if len(body) > self.max_bytes // 4:
+            return  # One giant document shouldn't flush the whole cache
+        
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        now = time.time()
+        
+        with self.lock:
+            try:
+                conn = self._connect()
+                old = conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (url, headers, body, size, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, json.dumps(headers), body, len(body), now, now)
+                )
+                self.total_bytes += len(body) - (old[0] if old else 0)
+                
+                if self.total_bytes > self.max_bytes:
+                    self._evict(conn)
+                
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache write failed: {e}")
+    
+    
+    def refresh(self, url: str, response: requests.Response):
+        """
+        Mark a stored entry fresh again after a 304 Not Modified
+        
+        Args:
+            url: Request URL
+            response: The 304 response (may carry updated validators)
+        """
+        with self.lock:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT headers FROM responses WHERE url = ?", (url,)).fetchone()
+                if not row:
+                    return
+                
+                headers = json.loads(row[0])
+                headers.update({name: response.headers[name] for name in KEPT_HEADERS if name in response.headers})
+                
+                conn.execute(
+                    "UPDATE responses SET headers = ?, stored_at = ? WHERE url = ?",
+                    (json.dumps(headers), time.time(), url)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache refresh failed: {e}")
+    
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache is back under 90% of its cap"""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        
+        rows = conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if self.total_bytes <= target:
+                break
+            conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.total_bytes -= size
+            evicted += 1
+        
+        logger.debug(f"HTTP cache evicted {evicted} entries ({self.total_bytes} bytes kept)")
+    
+    
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+# One cache per process, shared by all scrapers
+_shared_cache: Optional[HTTPCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Get the process-wide HTTP cache (None if disabled in config)"""
+    global _shared_cache
+    
+    if not CacheSettings.HTTP_CACHE_ENABLED:
+        return None
+    
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache()
+        return _shared_cache
@@ -0,0 +1,764 @@
+"""
+PennyStalker - HTML Parsers
+Pure parsing functions for StockTitan and SEC pages
+
+Everything here takes raw page bytes and returns small plain results
+(news items, filing rows, document links, truncated text), so it can run
+inline or in a worker process via the parse executor.
+
+Page parsers try a direct lxml/XPath extractor first and fall back to the
+BeautifulSoup version when the page doesn't have the expected structure.
+Both build their records through the same helpers, so the output is identical.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# bs4 is imported by the BeautifulSoup fallbacks themselves - the lxml fast
+# paths don't need it, and it is the slowest import at startup
+from lxml import etree
+
+from config_files import ScanParameters
+from .text_extract import extract_text
+from .tickers import TickerExtractor
+
+logger = logging.getLogger(__name__)
+
+STOCKTITAN_BASE = 'https://www.stocktitan.net'
+
+# Tags whose contents BeautifulSoup's get_text() doesn't count as text
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+# ----------------------------------------------------------------------
+# lxml helpers
+# ----------------------------------------------------------------------
+
+def _lxml_root(content: bytes, encoding: Optional[str]):
+    """
+    Parse page bytes with lxml's HTML parser
+    Decodes the way BeautifulSoup would: the given encoding, else sniffed
+    
+    Returns:
+        Root element, or None for an empty document
+    """
+    if encoding is None:
+        from bs4 import UnicodeDammit
+        encoding = UnicodeDammit(content, is_html=True).original_encoding
+    return etree.fromstring(content, etree.HTMLParser(encoding=encoding))
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one class token, like BeautifulSoup's class_="""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled once - compiling per call costs more than the query itself
+XP_LINK_BLOCKS = etree.XPath(f"//div[{_has_class('link-block')}]")
+XP_ENTRY_TITLE = etree.XPath(f".//div[{_has_class('title')}]")
+XP_ENTRY_H3 = etree.XPath('.//h3')
+XP_ENTRY_TIME = etree.XPath('.//time')
+XP_ENTRY_TIME_SPAN = etree.XPath(f".//span[{_has_class('time')}]")
+XP_LINKS = etree.XPath('.//a[@href]')
+XP_FILINGS_TABLE = etree.XPath(f"//table[{_has_class('tableFile2')}]")
+XP_DOCUMENTS_TABLE = etree.XPath(f"//table[{_has_class('tableFile')}]")
+XP_ROWS = etree.XPath('.//tr')
+XP_CELLS = etree.XPath('.//td')
+XP_DOCUMENTS_BUTTON = etree.XPath(".//a[@id='documentsbutton']")
+
+
+def _first(element, xpath: etree.XPath):
+    """First XPath match or None"""
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _collect_text(element, parts: List[str]):
+    """Gather text nodes in document order, skipping comments and non-text tags"""
+    if element.text and element.tag not in NON_TEXT_TAGS:
+        parts.append(element.text)
+    
+    for child in element:
+        # Comments and processing instructions have a non-string tag
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's element.get_text(strip=True)"""
+    parts = []
+    _collect_text(element, parts)
+    return ''.join(part.strip() for part in parts)
+
+
+# ----------------------------------------------------------------------
+# StockTitan
+# ----------------------------------------------------------------------
+
+def find_news_entries(soup) -> list:
+    """News entry elements on the live page"""
+    # StockTitan uses <div class="link-block">
+    news_entries = soup.find_all('div', class_='link-block')
+    
+    if not news_entries:
+        logger.warning("No news entries found - HTML structure may have changed")
+        # Try alternative selector
+        news_entries = soup.find_all('a', href=re.compile(r'/news/'))
+    
+    return news_entries
+
+
+def entry_url(entry) -> str:
+    """Article URL for an entry - on the entry itself or its first link"""
+    url = entry.get('href', '')
+    
+    if not url:
+        link = entry.find('a', href=True)
+        url = link['href'] if link else ''
+    
+    if url and not url.startswith('http'):
+        url = f"{STOCKTITAN_BASE}{url}"
+    return url
+
+
+def entry_key(entry) -> str:
+    """Identity of an entry across polls - its URL, or its text if it has none"""
+    return entry_url(entry) or entry.get_text(strip=True)
+
+
+# Absolute timestamps on article lists, tried after ISO 8601 ("2024-12-17T13:05:00Z")
+ABSOLUTE_TIME_FORMATS = (
+    '%b %d, %Y %I:%M %p',   # Dec 17, 2024 8:00 AM
+    '%b %d, %Y',            # Dec 17, 2024
+    '%B %d, %Y %I:%M %p',   # December 17, 2024 8:00 AM
+    '%B %d, %Y',            # December 17, 2024
+    '%m/%d/%Y %I:%M %p',    # 12/17/2024 8:00 AM
+    '%m/%d/%Y',             # 12/17/2024
+    '%Y-%m-%d %H:%M',       # 2024-12-17 08:00
+)
+TIME_ZONE_SUFFIX = re.compile(r'\s+(ET|EST|EDT|UTC|GMT)$', re.IGNORECASE)
+WEEKDAY_PREFIX = re.compile(r'^(?:mon|tues|wednes|thurs|fri|satur|sun)day,?\s+', re.IGNORECASE)
+
+# UTC offsets in hours for the fixed zone names (ET follows daylight saving time)
+UTC_OFFSETS = {'EST': -5, 'EDT': -4, 'UTC': 0, 'GMT': 0}
+
+
+def eastern_offset(moment: datetime) -> timedelta:
+    """
+    UTC offset of US Eastern time at a wall-clock time (America/New_York)
+    
+    Daylight saving time runs from 2 AM on the second Sunday of March to
+    2 AM on the first Sunday of November. Fixed rules rather than zoneinfo,
+    which has no time zone data on Windows without the tzdata package.
+    
+    Args:
+        moment: Naive New York wall-clock time
+        
+    Returns:
+        -4 hours (EDT) or -5 hours (EST)
+    """
+    march = datetime(moment.year, 3, 8)
+    november = datetime(moment.year, 11, 1)
+    dst_start = march + timedelta(days=(6 - march.weekday()) % 7, hours=2)
+    dst_end = november + timedelta(days=(6 - november.weekday()) % 7, hours=2)
+    return timedelta(hours=-4 if dst_start <= moment < dst_end else -5)
+
+
+def parse_absolute_time(time_text: str) -> Optional[datetime]:
+    """
+    Parse a calendar date/time
+    
+    Args:
+        time_text: Time string like "Tuesday, Dec 17, 2024 8:00 AM ET" or an ISO 8601 timestamp
+        
+    Returns:
+        Naive local datetime, or None if the text isn't an absolute time
+        (ET / EST / EDT / UTC / GMT and ISO offsets are converted to local time)
+    """
+    text = ' '.join(time_text.replace(' at ', ' ').split())
+    zone = TIME_ZONE_SUFFIX.search(text)
+    text = WEEKDAY_PREFIX.sub('', TIME_ZONE_SUFFIX.sub('', text))
+    
+    try:
+        # Python 3.8's fromisoformat doesn't accept the Z suffix
+        parsed = datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+    except ValueError:
+        parsed = None
+    
+    if parsed is None:
+        for fmt in ABSOLUTE_TIME_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    
+    if parsed.tzinfo is None and zone:
+        name = zone.group(1).upper()
+        offset = eastern_offset(parsed) if name == 'ET' else timedelta(hours=UTC_OFFSETS[name])
+        parsed = parsed.replace(tzinfo=timezone(offset))
+    
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def parse_time(time_text: str) -> datetime:
+    """
+    Parse StockTitan's time format
+    Handles: "2 hours ago", "5 minutes ago", "today", "yesterday", actual dates
+    
+    Args:
+        time_text: Time string from StockTitan
+        
+    Returns:
+        datetime object (now if the text can't be parsed)
+    """
+    now = datetime.now()
+    
+    try:
+        # Absolute dates first - "Monday, Dec 16, 2024" mustn't read as "16 days ago"
+        absolute = parse_absolute_time(time_text)
+        if absolute is not None:
+            return absolute
+        
+        time_text = time_text.lower().strip()
+        
+        # Relative times
+        if 'minute' in time_text:
+            match = re.search(r'(\d+)', time_text)
+            if match:
+                minutes = int(match.group(1))
+                return now - timedelta(minutes=minutes)
+        
+        elif 'hour' in time_text:
+            match = re.search(r'(\d+)', time_text)
+            if match:
+                hours = int(match.group(1))
+                return now - timedelta(hours=hours)
+        
+        elif 'day' in time_text and 'yesterday' not in time_text:
+            match = re.search(r'(\d+)', time_text)
+            if match:
+                days = int(match.group(1))
+                return now - timedelta(days=days)
+        
+        elif 'today' in time_text:
+            return now
+        
+        elif 'yesterday' in time_text:
+            return now - timedelta(days=1)
+        
+        # Assume recent if we can't parse
+        logger.debug(f"Unrecognised time '{time_text}', assuming now")
+        return now
+        
+    except Exception as e:
+        logger.debug(f"Error parsing time '{time_text}': {e}")
+        return now
+
+
+def build_news_items(entries: List[Tuple[str, str, Optional[str]]], cutoff_time: datetime,
+                     known_symbols: Optional[FrozenSet[str]] = None) -> Tuple[List[Dict], Optional[datetime]]:
+    """
+    Turn the fields of a page's news entries into news items
+    Tickers for all entries are extracted in one batch
+    
+    Args:
+        entries: (headline, url, time text or None) per entry, in page order
+        cutoff_time: Ignore news older than this
+        known_symbols: Listed ticker symbols for vetting bare-word tickers
+        
+    Returns:
+        News item dicts (one per ticker found per entry), and the oldest
+        entry's publish time (None if no entry had one)
+    """
+    kept = []
+    oldest = None
+    
+    for headline, url, time_text in entries:
+        if not headline or len(headline) < 10:
+            continue
+        
+        # Default to now if no timestamp
+        if time_text is not None:
+            published_time = parse_time(time_text)
+            oldest = published_time if oldest is None else min(oldest, published_time)
+        else:
+            published_time = datetime.now()
+        
+        # Skip if too old
+        if published_time < cutoff_time:
+            continue
+        
+        kept.append((headline, url, published_time))
+    
+    found = TickerExtractor(known_symbols).extract_batch([headline for headline, _, _ in kept])
+    news_items = []
+    
+    # Create news item for each ticker
+    for (headline, url, published_time), tickers in zip(kept, found):
+        if not tickers:
+            logger.debug(f"No tickers found in: {headline[:60]}...")
+            continue
+        
+        for ticker, source in tickers:
+            news_items.append({
+                'ticker': ticker,
+                'ticker_source': source,
+                'headline': headline,
+                'url': url,
+                'published_time': published_time,
+                'source': 'StockTitan'
+            })
+            logger.debug(f"Found news for {ticker} ({source}): {headline[:50]}...")
+    
+    return news_items, oldest
+
+
+def parse_news_entry(entry) -> Tuple[str, str, Optional[str]]:
+    """
+    Parse a single news entry element
+    
+    Args:
+        entry: BeautifulSoup element
+        
+    Returns:
+        (headline, url, time text or None) for build_news_items
+    """
+    # Extract headline
+    headline_elem = entry.find('div', class_='title') or entry.find('h3') or entry
+    headline = headline_elem.get_text(strip=True) if headline_elem else ""
+    
+    # Extract timestamp - a <time datetime="..."> attribute is exact, prefer it
+    time_elem = entry.find('time') or entry.find('span', class_='time')
+    time_text = (time_elem.get('datetime') or time_elem.get_text(strip=True)) if time_elem else None
+    
+    return headline, entry_url(entry), time_text
+
+
+def _lxml_entry_url(entry) -> str:
+    """entry_url for an lxml element"""
+    url = entry.get('href') or ''
+    
+    if not url:
+        link = _first(entry, XP_LINKS)
+        url = link.get('href') if link is not None else ''
+    
+    if url and not url.startswith('http'):
+        url = f"{STOCKTITAN_BASE}{url}"
+    return url
+
+
+def _lxml_news_entry(entry) -> Tuple[str, str, Optional[str]]:
+    """parse_news_entry for an lxml element"""
+    headline_elem = _first(entry, XP_ENTRY_TITLE)
+    if headline_elem is None:
+        headline_elem = _first(entry, XP_ENTRY_H3)
+    headline = _text(headline_elem if headline_elem is not None else entry)
+    
+    time_elem = _first(entry, XP_ENTRY_TIME)
+    if time_elem is None:
+        time_elem = _first(entry, XP_ENTRY_TIME_SPAN)
+    time_text = (time_elem.get('datetime') or _text(time_elem)) if time_elem is not None else None
+    
+    return headline, _lxml_entry_url(entry), time_text
+
+
+def _parse_news_page_lxml(content: bytes, encoding: Optional[str], cutoff_time: datetime,
+                          limit: Optional[int], skip_keys: Optional[FrozenSet[str]],
+                          known_symbols: Optional[FrozenSet[str]]) -> Optional[Dict]:
+    """XPath fast path for parse_news_page - None if there are no link-block entries"""
+    root = _lxml_root(content, encoding)
+    
+    if root is None:
+        return None
+    
+    news_entries = XP_LINK_BLOCKS(root)
+    
+    if not news_entries:
+        return None
+    
+    keys = []
+    fields = []
+    
+    for entry in news_entries[:limit]:
+        try:
+            key = _lxml_entry_url(entry) or _text(entry)
+            keys.append(key)
+            
+            if skip_keys and key in skip_keys:
+                continue
+            
+            fields.append(_lxml_news_entry(entry))
+        except Exception as e:
+            logger.debug(f"Error parsing entry: {e}")
+            continue
+    
+    news_items, oldest = build_news_items(fields, cutoff_time, known_symbols)
+    return {'entry_count': len(news_entries), 'keys': keys, 'items': news_items, 'oldest': oldest}
+
+
+def parse_news_page(content: bytes, encoding: Optional[str], cutoff_time: datetime,
+                    limit: Optional[int] = 50, skip_keys: Optional[FrozenSet[str]] = None,
+                    known_symbols: Optional[FrozenSet[str]] = None) -> Dict:
+    """
+    Parse the StockTitan live page
+    
+    Args:
+        content: Raw page bytes
+        encoding: Encoding from the response headers (None = detect)
+        cutoff_time: Ignore news older than this
+        limit: Only look at the first N entries (None = all)
+        skip_keys: Entry keys to skip without parsing (already seen)
+        known_symbols: Listed ticker symbols for vetting bare-word tickers
+        
+    Returns:
+        Dict with entry_count (entries on the page), keys (of the first
+        `limit` entries), items (news item dicts for entries not skipped)
+        and oldest (publish time of the oldest parsed entry, or None)
+    """
+    try:
+        page = _parse_news_page_lxml(content, encoding, cutoff_time, limit, skip_keys, known_symbols)
+    except Exception as e:
+        logger.debug(f"lxml news parser failed: {e}")
+        page = None
+    
+    if page is None:
+        page = _parse_news_page_soup(content, encoding, cutoff_time, limit, skip_keys, known_symbols)
+    return page
+
+
+def _parse_news_page_soup(content: bytes, encoding: Optional[str], cutoff_time: datetime,
+                          limit: Optional[int] = 50, skip_keys: Optional[FrozenSet[str]] = None,
+                          known_symbols: Optional[FrozenSet[str]] = None) -> Dict:
+    """
+    Parse the StockTitan live page with BeautifulSoup
+    Fallback for layouts the XPath parser doesn't recognise - same arguments and result
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
+    news_entries = find_news_entries(soup)
+    
+    keys = []
+    fields = []
+    
+    for entry in news_entries[:limit]:
+        try:
+            key = entry_key(entry)
+            keys.append(key)
+            
+            if skip_keys and key in skip_keys:
+                continue
+            
+            fields.append(parse_news_entry(entry))
+        except Exception as e:
+            logger.debug(f"Error parsing entry: {e}")
+            continue
+    
+    news_items, oldest = build_news_items(fields, cutoff_time, known_symbols)
+    return {'entry_count': len(news_entries), 'keys': keys, 'items': news_items, 'oldest': oldest}
+
+
+# ----------------------------------------------------------------------
+# SEC Edgar
+# ----------------------------------------------------------------------
+
+def build_filing(ticker: str, filing_type: str, date_text: str, href: Optional[str],
+                 cutoff_date: datetime, base_url: str) -> Optional[Dict]:
+    """
+    Turn the fields of one filing table row into a filing dict
+    
+    Args:
+        ticker: Stock ticker
+        filing_type: Form type cell text (e.g. "8-K")
+        date_text: Filing date cell text
+        href: Documents link (None if the row has none)
+        cutoff_date: Ignore filings older than this
+        base_url: SEC base URL for the documents link
+        
+    Returns:
+        Filing dict or None if invalid/too old
+    """
+    try:
+        filing_date = datetime.strptime(date_text, '%Y-%m-%d')
+    except ValueError:
+        logger.debug(f"Could not parse date: {date_text}")
+        return None
+    
+    # Skip if too old
+    if filing_date < cutoff_date:
+        return None
+    
+    if not href:
+        return None
+    
+    filing_url = base_url + href
+    
+    logger.debug(f"Found {filing_type} for {ticker} dated {filing_date.date()}")
+    
+    return {
+        'ticker': ticker.upper(),
+        'filing_type': filing_type,
+        'filing_date': filing_date,
+        'filing_url': filing_url
+    }
+
+
+def parse_filing_row(row, ticker: str, cutoff_date: datetime, base_url: str) -> Optional[Dict]:
+    """
+    Parse a single filing table row
+    
+    Args:
+        row: BeautifulSoup table row element
+        ticker: Stock ticker
+        cutoff_date: Ignore filings older than this
+        base_url: SEC base URL for the documents link
+        
+    Returns:
+        Filing dict or None if invalid/too old
+    """
+    cols = row.find_all('td')
+    
+    if len(cols) < 4:
+        return None
+    
+    # Filing type (e.g., "8-K", "10-Q"), filing date and documents link
+    doc_link = cols[1].find('a', {'id': 'documentsbutton'})
+    href = doc_link.get('href') if doc_link else None
+    
+    return build_filing(ticker, cols[0].get_text(strip=True), cols[3].get_text(strip=True),
+                        href, cutoff_date, base_url)
+
+
+def _lxml_filing_row(row, ticker: str, cutoff_date: datetime, base_url: str) -> Optional[Dict]:
+    """parse_filing_row for an lxml element"""
+    cols = XP_CELLS(row)
+    
+    if len(cols) < 4:
+        return None
+    
+    doc_link = _first(cols[1], XP_DOCUMENTS_BUTTON)
+    href = doc_link.get('href') if doc_link is not None else None
+    
+    return build_filing(ticker, _text(cols[0]), _text(cols[3]), href, cutoff_date, base_url)
+
+
+def _parse_filings_page_lxml(content: bytes, encoding: Optional[str], ticker: str,
+                             cutoff_date: datetime, base_url: str) -> Optional[Tuple[int, List[Dict]]]:
+    """XPath fast path for parse_filings_page - None if there is no filings table"""
+    root = _lxml_root(content, encoding)
+    
+    if root is None:
+        return None
+    
+    filing_table = _first(root, XP_FILINGS_TABLE)
+    
+    if filing_table is None:
+        return None
+    
+    rows = XP_ROWS(filing_table)[1:]  # Skip header
+    
+    filings = []
+    for row in rows:
+        try:
+            filing_data = _lxml_filing_row(row, ticker, cutoff_date, base_url)
+            if filing_data:
+                filings.append(filing_data)
+        except Exception as e:
+            logger.debug(f"Error parsing filing row: {e}")
+            continue
+    
+    return len(rows), filings
+
+
+def parse_filings_page(content: bytes, encoding: Optional[str], ticker: str,
+                       cutoff_date: datetime, base_url: str) -> Optional[Tuple[int, List[Dict]]]:
+    """
+    Parse an EDGAR company page (browse-edgar?action=getcompany)
+    
+    Args:
+        content: Raw page bytes
+        encoding: Encoding from the response headers (None = detect)
+        ticker: Stock ticker
+        cutoff_date: Ignore filings older than this
+        base_url: SEC base URL for the documents links
+        
+    Returns:
+        (number of rows in the table, filing dicts inside the window),
+        or None if the page has no filings table
+    """
+    try:
+        parsed = _parse_filings_page_lxml(content, encoding, ticker, cutoff_date, base_url)
+    except Exception as e:
+        logger.debug(f"lxml filings parser failed: {e}")
+        parsed = None
+    
+    if parsed is None:
+        parsed = _parse_filings_page_soup(content, encoding, ticker, cutoff_date, base_url)
+    return parsed
+
+
+def _parse_filings_page_soup(content: bytes, encoding: Optional[str], ticker: str,
+                             cutoff_date: datetime, base_url: str) -> Optional[Tuple[int, List[Dict]]]:
+    """
+    Parse an EDGAR company page with BeautifulSoup
+    Fallback for pages the XPath parser doesn't recognise - same arguments and result
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
+    
+    # Find filing table
+    filing_table = soup.find('table', class_='tableFile2')
+    
+    if not filing_table:
+        return None
+    
+    # Parse rows
+    rows = filing_table.find_all('tr')[1:]  # Skip header
+    
+    filings = []
+    for row in rows:
+        try:
+            filing_data = parse_filing_row(row, ticker, cutoff_date, base_url)
+            if filing_data:
+                filings.append(filing_data)
+        except Exception as e:
+            logger.debug(f"Error parsing filing row: {e}")
+            continue
+    
+    return len(rows), filings
+
+
+def find_primary_document(content: bytes, encoding: Optional[str]) -> Optional[str]:
+    """
+    Find the main document link on a filing index page
+    
+    Args:
+        content: Raw index page bytes
+        encoding: Encoding from the response headers (None = detect)
+        
+    Returns:
+        Document href (site-relative) or None if not found
+    """
+    try:
+        href = _find_primary_document_lxml(content, encoding)
+    except Exception as e:
+        logger.debug(f"lxml filing index parser failed: {e}")
+        href = None
+    
+    return href or _find_primary_document_soup(content, encoding)
+
+
+def _find_primary_document_lxml(content: bytes, encoding: Optional[str]) -> Optional[str]:
+    """XPath fast path for find_primary_document - None if no link was found"""
+    root = _lxml_root(content, encoding)
+    
+    if root is None:
+        return None
+    
+    doc_table = _first(root, XP_DOCUMENTS_TABLE)
+    
+    if doc_table is None:
+        return None
+    
+    for row in XP_ROWS(doc_table):
+        doc_link = _first(row, XP_LINKS)
+        if doc_link is not None:
+            return doc_link.get('href').replace('/ix?doc=', '')
+    
+    return None
+
+
+def _find_primary_document_soup(content: bytes, encoding: Optional[str]) -> Optional[str]:
+    """
+    Find the main document link with BeautifulSoup
+    Fallback for pages the XPath parser doesn't recognise - same arguments and result
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
+    
+    doc_table = soup.find('table', class_='tableFile')
+    
+    if not doc_table:
+        logger.warning("No document table found in filing page")
+        return None
+    
+    # Get first document (main filing) - the first row is a header row
+    for row in doc_table.find_all('tr'):
+        doc_link = row.find('a', href=True)
+        if doc_link:
+            # Inline XBRL documents link through the JS viewer - go to the file itself
+            return doc_link['href'].replace('/ix?doc=', '')
+    
+    return None
+
+
+def extract_document_text(content: bytes, encoding: Optional[str], max_chars: int) -> Tuple[str, bool]:
+    """
+    Extract text from (a prefix of) a filing document
+    
+    Args:
+        content: Document bytes downloaded so far
+        encoding: Encoding from the response headers
+        max_chars: Character budget
+        
+    Returns:
+        (text, True if the budget was filled)
+    """
+    text = extract_text([content], max_chars, encoding)
+    return text, len(text) >= max_chars
+
+
+# ----------------------------------------------------------------------
+# Parse executor
+# ----------------------------------------------------------------------
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for HTML parsing (None when PARSE_WORKERS is 0)
+    
+    Workers are spawned rather than forked - forking a process that already
+    runs network threads can copy held locks into the children.
+    """
+    global _executor
+    
+    if ScanParameters.PARSE_WORKERS <= 0:
+        return None
+    
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=ScanParameters.PARSE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            atexit.register(shutdown_parse_executor)
+            logger.info(f"Parse executor started with {ScanParameters.PARSE_WORKERS} processes")
+        return _executor
+
+
+def shutdown_parse_executor():
+    """Stop the parse worker processes"""
+    global _executor
+    
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,220 @@
+"""
+PennyStalker - Rate Limiting
+Per-host token buckets shared by every scraper in the process
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from config_files import ScanParameters
+
+logger = logging.getLogger(__name__)
+
+
+# Adaptive rate: halve on throttling, win back 5% of the ceiling per success
+THROTTLE_FACTOR = 0.5
+RECOVERY_STEP = 0.05
+MIN_RATE_FRACTION = 1 / 16
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    Callers reserve a token up front and sleep outside the lock, so many
+    threads can queue on one bucket while requests stay in flight
+
+    The rate adapts (AIMD): throttle() halves it and pauses the host,
+    recover() raises it back toward the configured ceiling step by step
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second (<= 0 means unlimited)
+            burst: Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until it is available
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self.lock:
+            now = time.monotonic()
+
+            # While the host is paused, pacing starts from the end of the pause
+            start = max(now, self.blocked_until)
+
+            if self.rate <= 0:
+                wait = start - now
+            else:
+                elapsed = max(0.0, start - self.last_refill)
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                self.last_refill = max(self.last_refill, start)
+
+                # Reserve the token now - a negative balance is the queue ahead of us
+                self.tokens -= 1
+                wait = (start - now) + (-self.tokens / self.rate if self.tokens < 0 else 0.0)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+    def throttle(self, pause: float) -> float:
+        """
+        The host pushed back - slow down and hold off new requests
+
+        Args:
+            pause: Seconds before the next request may start (e.g. Retry-After)
+
+        Returns:
+            The new rate
+        """
+        with self.lock:
+            now = time.monotonic()
+
+            # Requests already in flight when the host pushed back report the
+            # same congestion - only the first one of a pause cuts the rate
+            if self.rate > 0 and now >= self.blocked_until:
+                self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate * THROTTLE_FACTOR)
+
+            self.blocked_until = max(self.blocked_until, now + pause)
+            return self.rate
+
+
+    def recover(self):
+        """A request succeeded - step the rate back up toward the ceiling"""
+        if self.rate >= self.max_rate:
+            return
+
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+
+def host_key(url: str) -> str:
+    """
+    Map a URL to the host it is rate limited under
+
+    Subdomains share their parent's bucket (www.sec.gov and data.sec.gov
+    count against the same EDGAR limit)
+
+    Args:
+        url: Full URL or bare host name
+
+    Returns:
+        Host key, e.g. 'sec.gov'
+    """
+    host = urlparse(url).hostname if '://' in url else url
+    host = (host or '').lower()
+
+    labels = host.split('.')
+    if len(labels) <= 2 or host.replace('.', '').isdigit():
+        return host
+    return '.'.join(labels[-2:])
+
+
+class HostRateLimiter:
+    """
+    Registry of token buckets keyed by host
+    Hosts without an explicit limit get the default rate
+    """
+
+    def __init__(self, default_rate: float):
+        """
+        Args:
+            default_rate: Requests per second for unconfigured hosts
+        """
+        self.default_rate = default_rate
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+
+    def configure(self, url: str, rate: float, burst: int = 1):
+        """
+        Set the request rate for a host
+        An existing bucket with the same settings is kept so its pacing state survives
+
+        Args:
+            url: URL or host name on the host to limit
+            rate: Requests per second
+            burst: Requests allowed back-to-back before pacing kicks in
+        """
+        key = host_key(url)
+        with self.lock:
+            existing = self.buckets.get(key)
+            if existing and existing.max_rate == rate and existing.capacity == max(1, burst):
+                return
+            self.buckets[key] = TokenBucket(rate, burst)
+        logger.debug(f"Rate limit for {key}: {rate}/s (burst {burst})")
+
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Get (or lazily create) the bucket for a URL's host"""
+        key = host_key(url)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.default_rate)
+                self.buckets[key] = bucket
+            return bucket
+
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until a request to this URL's host is allowed
+
+        Returns:
+            Seconds spent waiting
+        """
+        return self.bucket_for(url).acquire()
+
+
+    def throttle(self, url: str, pause: float):
+        """
+        Slow a host down after a 429/503
+
+        Args:
+            url: URL on the throttled host
+            pause: Seconds to hold off every request to it
+        """
+        bucket = self.bucket_for(url)
+        rate = bucket.throttle(pause)
+        if bucket.max_rate > 0:
+            logger.warning(f"{host_key(url)} is throttling - pausing {pause:.1f}s, rate now {rate:.2f}/s")
+        else:
+            logger.warning(f"{host_key(url)} is throttling - pausing {pause:.1f}s")
+
+
+    def recover(self, url: str):
+        """Let a host's rate climb back after a successful request"""
+        self.bucket_for(url).recover()
+
+
+# Process-wide limiter so separate scraper instances respect the same ceilings
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Get the process-wide host rate limiter"""
+    global _shared_limiter
+
+    with _shared_lock:
+        if _shared_limiter is None:
+            delay = ScanParameters.REQUEST_DELAY
+            _shared_limiter = HostRateLimiter(1.0 / delay if delay > 0 else 0)
+        return _shared_limiter
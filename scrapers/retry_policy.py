@@ -0,0 +1,196 @@
+"""
+PennyStalker - Retry Policy
+Backoff, Retry-After handling and per-host circuit breakers for HTTP requests
+"""
+
+import random
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from config_files import ScanParameters
+from .rate_limiter import host_key
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth another attempt - the server may answer next time
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Statuses that mean "slow down" rather than "broken"
+THROTTLE_STATUSES = {429, 503}
+
+# Only methods that are safe to send twice are retried
+IDEMPOTENT_METHODS = {'GET', 'HEAD'}
+
+
+def backoff_delay(attempt: int, base: Optional[float] = None, cap: Optional[float] = None) -> float:
+    """
+    Jittered exponential backoff
+    Half the delay is fixed and half random, so retries from many threads
+    spread out instead of arriving together
+    
+    Args:
+        attempt: Retry number, starting at 0
+        base: Delay before the first retry (default: RETRY_BACKOFF_SECONDS)
+        cap: Longest delay (default: RETRY_BACKOFF_MAX)
+    
+    Returns:
+        Seconds to wait
+    """
+    base = ScanParameters.RETRY_BACKOFF_SECONDS if base is None else base
+    cap = ScanParameters.RETRY_BACKOFF_MAX if cap is None else cap
+    
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """
+    Read a Retry-After header (delay in seconds or an HTTP date)
+    
+    Args:
+        response: requests.Response
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or unreadable
+    """
+    value = response.headers.get('Retry-After')
+    
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.debug(f"Unreadable Retry-After: {value}")
+        return None
+    
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+    
+    After `threshold` consecutive failures the circuit opens and requests
+    fail immediately for `cooldown` seconds. Then a single trial request is
+    let through: success closes the circuit, failure opens it again. Every
+    way a trial can end must resolve it, or the host stays locked out.
+    """
+    
+    def __init__(self, threshold: int, cooldown: float):
+        """
+        Args:
+            threshold: Consecutive failures that open the circuit
+            cooldown: Seconds to fail fast before trying the host again
+        """
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until: Optional[float] = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+    
+    
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'"""
+        with self.lock:
+            if self.open_until is None:
+                return 'closed'
+            return 'open' if time.monotonic() < self.open_until else 'half-open'
+    
+    
+    def allow(self) -> bool:
+        """
+        Whether a request may go out now
+        
+        Returns:
+            False while open, True for the one trial request once the cooldown ends
+        """
+        with self.lock:
+            if self.open_until is None:
+                return True
+            
+            if time.monotonic() < self.open_until or self.trial_in_flight:
+                return False
+            
+            self.trial_in_flight = True
+            return True
+    
+    
+    def record_success(self):
+        """The host answered - close the circuit"""
+        with self.lock:
+            self.failures = 0
+            self.open_until = None
+            self.trial_in_flight = False
+    
+    
+    def record_failure(self) -> bool:
+        """
+        The host failed a request
+        
+        Returns:
+            True if this failure opened the circuit
+        """
+        with self.lock:
+            self.failures += 1
+            trial_failed = self.trial_in_flight
+            self.trial_in_flight = False
+            
+            if trial_failed or (self.open_until is None and self.failures >= self.threshold):
+                self.open_until = time.monotonic() + self.cooldown
+                return True
+            return False
+    
+    
+    def release_trial(self):
+        """
+        The trial request ended without telling whether the host recovered
+        (e.g. a 429) - stay half-open and let the next request be the trial
+        """
+        with self.lock:
+            self.trial_in_flight = False
+    
+    
+    def trip(self, duration: float):
+        """
+        Open the circuit for a known duration (e.g. a long Retry-After)
+        
+        Args:
+            duration: Seconds to fail fast
+        """
+        with self.lock:
+            until = time.monotonic() + duration
+            self.open_until = max(self.open_until or 0.0, until)
+            self.trial_in_flight = False
+
+
+# One breaker per host, shared by every scraper in the process
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a URL's host"""
+    key = host_key(url)
+    
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                ScanParameters.CIRCUIT_BREAKER_THRESHOLD,
+                ScanParameters.CIRCUIT_BREAKER_COOLDOWN
+            )
+            _breakers[key] = breaker
+        return breaker
@@ -0,0 +1,103 @@
+"""
+PennyStalker - SEC Submissions API
+Columnar view of EDGAR's per-CIK JSON submissions document
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+
+def filing_index_url(base_url: str, cik: int, accession: str) -> str:
+    """
+    Build the filing documents page URL for an accession number
+    Same URL the company page's 'Documents' button links to
+    """
+    return f"{base_url}/Archives/edgar/data/{cik}/{accession.replace('-', '')}/{accession}-index.htm"
+
+
+class FilingColumns:
+    """
+    Recent filings for one company, kept as parallel arrays
+    
+    The submissions document lists up to 1000 recent filings. Rows are only
+    turned into filing dicts once they pass the date filter, so a six-month
+    window over a prolific filer costs a few string comparisons per row.
+    """
+    
+    def __init__(self, cik: int, forms: List[str], dates: List[str], accessions: List[str]):
+        """
+        Args:
+            cik: Company CIK
+            forms: Form types (e.g. '8-K')
+            dates: Filing dates as 'YYYY-MM-DD' strings
+            accessions: Accession numbers ('0001234567-24-000001')
+        """
+        self.cik = cik
+        self.forms = forms
+        self.dates = dates
+        self.accessions = accessions
+    
+    
+    @classmethod
+    def from_json(cls, data: Dict) -> 'FilingColumns':
+        """
+        Build from a parsed submissions document
+        
+        Args:
+            data: JSON from data.sec.gov/submissions/CIK##########.json
+            
+        Returns:
+            FilingColumns (empty if the document has no recent filings)
+        """
+        recent = data.get('filings', {}).get('recent', {})
+        
+        forms = recent.get('form', [])
+        dates = recent.get('filingDate', [])
+        accessions = recent.get('accessionNumber', [])
+        
+        # Columns must line up - truncate to the shortest if the document is ragged
+        size = min(len(forms), len(dates), len(accessions))
+        
+        return cls(int(data.get('cik', 0)), forms[:size], dates[:size], accessions[:size])
+    
+    
+    def __len__(self) -> int:
+        return len(self.forms)
+    
+    
+    def rows_since(self, cutoff_date: datetime) -> List[int]:
+        """
+        Row indexes filed on or after the cutoff date
+        ISO dates compare correctly as strings, so no row is parsed to filter
+        """
+        cutoff = cutoff_date.strftime('%Y-%m-%d')
+        return [i for i, date in enumerate(self.dates) if date >= cutoff]
+    
+    
+    def to_filings(self, ticker: str, cutoff_date: datetime, base_url: str) -> List[Dict]:
+        """
+        Materialize filing dicts for rows inside the window
+        
+        Args:
+            ticker: Stock ticker the filings belong to
+            cutoff_date: Ignore filings older than this
+            base_url: SEC base URL for the documents page link
+            
+        Returns:
+            List of dicts with keys: ticker, filing_type, filing_date, filing_url
+        """
+        # The date filter keeps same-day filings; match the HTML path's datetime cutoff exactly
+        filings = []
+        for i in self.rows_since(cutoff_date):
+            filing_date = datetime.strptime(self.dates[i], '%Y-%m-%d')
+            if filing_date < cutoff_date:
+                continue
+            
+            filings.append({
+                'ticker': ticker.upper(),
+                'filing_type': self.forms[i],
+                'filing_date': filing_date,
+                'filing_url': filing_index_url(base_url, self.cik, self.accessions[i]),
+            })
+        
+        return filings
@@ -0,0 +1,50 @@
+"""
+PennyStalker - Seen Item Tracking
+Bounded memory of already-processed keys for long-running watchers
+"""
+
+from collections import OrderedDict
+from typing import Hashable
+
+
+class SeenSet:
+    """
+    Set with a fixed capacity that forgets the least recently seen keys
+    Memory stays flat no matter how long a watcher runs
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Maximum number of keys remembered
+        """
+        self.capacity = max(1, capacity)
+        self.keys: OrderedDict = OrderedDict()
+    
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.keys
+    
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    
+    def add(self, key: Hashable) -> bool:
+        """
+        Remember a key
+        
+        Args:
+            key: Item identifier (e.g. article URL)
+            
+        Returns:
+            True if the key was new
+        """
+        if key in self.keys:
+            self.keys.move_to_end(key)  # Still on the page - keep it
+            return False
+        
+        self.keys[key] = None
+        if len(self.keys) > self.capacity:
+            self.keys.popitem(last=False)
+        return True
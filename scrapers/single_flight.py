@@ -0,0 +1,89 @@
+"""
+PennyStalker - Single-Flight Calls
+Concurrent callers for the same key share one call (and optionally its result)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Flight:
+    """One call in progress"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicates calls by key
+    
+    While a call for a key is running, other callers for that key wait for
+    it and get the same result (or exception) instead of running their own.
+    With a capacity, finished results are also remembered - the least
+    recently used are forgotten past it - until clear().
+    """
+    
+    def __init__(self, capacity: int = 0):
+        """
+        Args:
+            capacity: Finished results to remember (0 = only share in-flight calls)
+        """
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.flights: Dict[Hashable, _Flight] = {}
+        self.results: OrderedDict = OrderedDict()
+    
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run func once for a key
+        
+        Args:
+            key: Identity of the call (e.g. URL)
+            func: The call itself
+        
+        Returns:
+            (result, shared) - shared is True if another caller's call or a
+            remembered result answered this one. None results (failures)
+            are shared while in flight but never remembered.
+        """
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                return self.results[key], True
+            
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        
+        try:
+            flight.result = func()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+                if self.capacity > 0 and flight.error is None and flight.result is not None:
+                    self.results[key] = flight.result
+                    if len(self.results) > self.capacity:
+                        self.results.popitem(last=False)
+            flight.done.set()
+    
+    
+    def clear(self):
+        """Forget remembered results (calls in flight are unaffected)"""
+        with self.lock:
+            self.results.clear()
@@ -3,14 +3,18 @@ PennyStalker - StockTitan News Scraper
 Fetches penny stock news from StockTitan
 """
 
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Callable, List, Dict, FrozenSet, Iterator, Optional, Set
 import logging
-import re
+import threading
+import time
 
 from .base import BaseScraper
-from config_files import DataSources, TimeWindows, Patterns
+from .cik_index import get_cik_index
+from .parsers import parse_news_page
+from .seen import SeenSet
+from config_files import DataSources, TimeWindows, ScanParameters
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,13 @@ class StockTitanScraper(BaseScraper):
         """Initialize StockTitan scraper"""
         super().__init__()
         self.news_url = DataSources.STOCKTITAN_NEWS
+        self.news_page_url = DataSources.STOCKTITAN_NEWS_PAGE
+        self.backfill_pages = ScanParameters.NEWS_BACKFILL_PAGES
+        self.backfill_workers = max(1, ScanParameters.NEWS_BACKFILL_WORKERS)
+        
+        # Listed symbols vet bare uppercase words in headlines (read from disk, no request)
+        self.cik_index = get_cik_index()
+        
         logger.info("StockTitan scraper initialized")
     
     
@@ -32,204 +43,240 @@ class StockTitanScraper(BaseScraper):
         """
         Fetch recent penny stock news from StockTitan
         
+        Every entry on the live page is read. If its oldest entry is still
+        inside TIME_WINDOW_HOURS, older pages are backfilled until one reaches
+        the cutoff.
+        
         Returns:
-            List of dicts with keys: ticker, headline, url, published_time, source
+            List of dicts with keys: ticker, ticker_source, headline, url, published_time, source
+            (newest first)
         """
         logger.info("Fetching news from StockTitan...")
         
-        news_items = []
-        
-        # Make request using base class method
-        response = self.make_request(self.news_url)
+        cutoff_time = datetime.now() - timedelta(hours=TimeWindows.NEWS_LOOKBACK_HOURS)
+        page = self._fetch_news_page(cutoff_time=cutoff_time, limit=None)
         
-        if not response:
-            logger.error("Failed to fetch StockTitan page")
+        if page is None:
             return []
         
-        logger.info(f"StockTitan responded with status {response.status_code}")
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'lxml')
+        pages = [page]
+        if self.backfill_pages > 0 and page['keys'] and not self._reaches_cutoff(page, cutoff_time):
+            pages.extend(self._backfill(cutoff_time, set(page['keys'])))
         
-        # Find news entries - StockTitan uses <div class="link-block">
-        news_entries = soup.find_all('div', class_='link-block')
+        news_items = self._merge_pages(pages)
         
-        if not news_entries:
-            logger.warning("No news entries found - HTML structure may have changed")
-            # Try alternative selector
-            news_entries = soup.find_all('a', href=re.compile(r'/news/'))
+        logger.info(f"Successfully extracted {len(news_items)} news items with tickers from {len(pages)} page(s)")
+        return news_items
+    
+    
+    def get_ticker_news(self, ticker: str) -> Optional[Dict]:
+        """
+        Newest recent headline for one ticker
         
-        logger.info(f"Found {len(news_entries)} potential news entries")
+        Reads the live page and only walks older pages (like
+        get_recent_news) if the ticker isn't on it, stopping at the first
+        page that has it.
         
-        # Calculate cutoff time
+        Args:
+            ticker: Stock ticker symbol
+            
+        Returns:
+            News item dict, or None if the ticker has no news inside TIME_WINDOW_HOURS
+        """
         cutoff_time = datetime.now() - timedelta(hours=TimeWindows.NEWS_LOOKBACK_HOURS)
+        page = self._fetch_news_page(cutoff_time=cutoff_time, limit=None)
         
-        # Parse each entry
-        for entry in news_entries[:50]:  # Limit to first 50
-            try:
-                news_data = self._parse_news_entry(entry, cutoff_time)
-                if news_data:
-                    news_items.extend(news_data)
-            except Exception as e:
-                logger.debug(f"Error parsing entry: {e}")
-                continue
-        
-        logger.info(f"Successfully extracted {len(news_items)} news items with tickers")
-        return news_items
+        if page is None:
+            return None
+        
+        def newest(page: Dict) -> Optional[Dict]:
+            items = [item for item in page['items'] if item['ticker'] == ticker]
+            return max(items, key=lambda item: item['published_time']) if items else None
+        
+        found = newest(page)
+        if found is None and self.backfill_pages > 0 and page['keys'] and not self._reaches_cutoff(page, cutoff_time):
+            for older in self._backfill(cutoff_time, set(page['keys']), stop=lambda p: newest(p) is not None):
+                found = found or newest(older)
+        
+        return found
     
     
-    def _parse_news_entry(self, entry, cutoff_time: datetime) -> List[Dict]:
+    def _backfill(self, cutoff_time: datetime, seen_keys: Set[str],
+                  stop: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
         """
-        Parse a single news entry element
+        Walk older news pages until one reaches the cutoff
+        
+        Up to backfill_workers pages are in flight at once (the host's rate
+        limit still applies per request); pages are examined in order and
+        pages past the first one that reaches the cutoff are cancelled.
         
         Args:
-            entry: BeautifulSoup element
-            cutoff_time: Ignore news older than this
+            cutoff_time: Oldest publish time wanted
+            seen_keys: Entry keys of the pages read so far (updated in place)
+            stop: Also end the walk after a page this returns True for
             
         Returns:
-            List of news item dicts (one per ticker found)
+            Parsed pages, newest page first
         """
-        news_items = []
-        
-        # Extract headline
-        headline_elem = entry.find('div', class_='title') or entry.find('h3') or entry
-        headline = headline_elem.get_text(strip=True) if headline_elem else ""
-        
-        if not headline or len(headline) < 10:
-            return []
+        last_page = self.backfill_pages + 1
+        pages = []
         
-        # Extract URL
-        url = entry.get('href', '')
-        if url and not url.startswith('http'):
-            url = f"https://www.stocktitan.net{url}"
+        with ThreadPoolExecutor(max_workers=self.backfill_workers) as pool:
+            futures = {}
+            next_page = 2
+            
+            for number in range(2, last_page + 1):
+                while next_page <= last_page and len(futures) < self.backfill_workers:
+                    futures[next_page] = pool.submit(
+                        self._fetch_news_page, self.news_page_url.format(page=next_page), cutoff_time=cutoff_time,
+                        limit=None)
+                    next_page += 1
+                
+                page = futures.pop(number).result()
+                
+                # A failed or empty page, or one with nothing new (the site
+                # ignored the page number), ends the walk
+                done = page is None or not any(key not in seen_keys for key in page['keys'])
+                
+                if not done:
+                    seen_keys.update(page['keys'])
+                    pages.append(page)
+                    done = self._reaches_cutoff(page, cutoff_time) or (stop is not None and stop(page))
+                
+                if done:
+                    for future in futures.values():
+                        future.cancel()
+                    break
         
-        # Extract timestamp
-        time_elem = entry.find('time') or entry.find('span', class_='time')
-        published_time = None
+        logger.info(f"Backfilled {len(pages)} older news page(s)")
+        return pages
+    
+    
+    @staticmethod
+    def _reaches_cutoff(page: Dict, cutoff_time: datetime) -> bool:
+        """True if the page's oldest entry is older than the cutoff"""
+        return page['oldest'] is not None and page['oldest'] < cutoff_time
+    
+    
+    @staticmethod
+    def _merge_pages(pages: List[Dict]) -> List[Dict]:
+        """
+        News items of several pages, newest first
+        An article that moved down a page between fetches is only kept once
+        """
+        seen = set()
+        news_items = []
         
-        if time_elem:
-            time_text = time_elem.get_text(strip=True)
-            published_time = self._parse_time(time_text)
+        for page in pages:
+            for item in page['items']:
+                key = (item['ticker'], item['url'] or item['headline'])
+                if key not in seen:
+                    seen.add(key)
+                    news_items.append(item)
         
-        # Default to now if no timestamp
-        if not published_time:
-            published_time = datetime.now()
+        # Stable sort - items published at the same time keep page order
+        news_items.sort(key=lambda item: item['published_time'], reverse=True)
+        return news_items
+    
+    
+    def get_new_news(self, seen: SeenSet) -> List[Dict]:
+        """
+        Fetch the live page and return only articles not seen before
         
-        # Skip if too old
-        if published_time < cutoff_time:
-            return []
+        Entries already in `seen` are skipped before any parsing, so a poll
+        that finds nothing new costs one (usually revalidated) request.
         
-        # Extract tickers from headline
-        tickers = self._extract_tickers(headline)
+        Args:
+            seen: Article keys processed by earlier polls (updated in place)
+            
+        Returns:
+            News item dicts for new articles
+        """
+        page = self._fetch_news_page(revalidate=True, skip_keys=frozenset(seen.keys))
         
-        if not tickers:
-            logger.debug(f"No tickers found in: {headline[:60]}...")
+        if page is None:
             return []
         
-        # Create news item for each ticker
-        for ticker in tickers:
-            news_item = {
-                'ticker': ticker.upper(),
-                'headline': headline,
-                'url': url,
-                'published_time': published_time,
-                'source': 'StockTitan'
-            }
-            news_items.append(news_item)
-            logger.debug(f"Found news for {ticker}: {headline[:50]}...")
+        # Every entry on the page is marked seen, including ones without tickers,
+        # so nothing on the page is parsed twice
+        new_entries = [key for key in page['keys'] if seen.add(key)]
+        news_items = page['items']
         
+        logger.info(f"{len(new_entries)} new entries, {len(news_items)} new news items with tickers")
         return news_items
     
     
-    def _parse_time(self, time_text: str) -> datetime:
+    def watch(self, poll_interval: Optional[float] = None, max_polls: Optional[int] = None,
+              stop_event: Optional[threading.Event] = None) -> Iterator[List[Dict]]:
         """
-        Parse StockTitan's time format
-        Handles: "2 hours ago", "5 minutes ago", "today", "yesterday", actual dates
+        Poll the live feed forever, yielding only newly published items
         
         Args:
-            time_text: Time string from StockTitan
+            poll_interval: Seconds between polls (default: WATCH_POLL_SECONDS)
+            max_polls: Stop after this many polls (default: run until closed)
+            stop_event: Set to end the watch without waiting out the poll interval
             
-        Returns:
-            datetime object
+        Yields:
+            List of new news item dicts per poll (empty if nothing new)
         """
-        time_text = time_text.lower().strip()
-        now = datetime.now()
-        
-        try:
-            # Relative times
-            if 'minute' in time_text:
-                match = re.search(r'(\d+)', time_text)
-                if match:
-                    minutes = int(match.group(1))
-                    return now - timedelta(minutes=minutes)
-            
-            elif 'hour' in time_text:
-                match = re.search(r'(\d+)', time_text)
-                if match:
-                    hours = int(match.group(1))
-                    return now - timedelta(hours=hours)
-            
-            elif 'day' in time_text and 'yesterday' not in time_text:
-                match = re.search(r'(\d+)', time_text)
-                if match:
-                    days = int(match.group(1))
-                    return now - timedelta(days=days)
-            
-            elif 'today' in time_text:
-                return now
+        poll_interval = poll_interval if poll_interval is not None else ScanParameters.WATCH_POLL_SECONDS
+        seen = SeenSet(ScanParameters.WATCH_SEEN_CAPACITY)
+        stop_event = stop_event or threading.Event()
+        polls = 0
+        
+        logger.info(f"Watching StockTitan every {poll_interval}s...")
+        
+        while (max_polls is None or polls < max_polls) and not stop_event.is_set():
+            started = time.monotonic()
             
-            elif 'yesterday' in time_text:
-                return now - timedelta(days=1)
+            yield self.get_new_news(seen)
+            polls += 1
             
-            # TODO: Add actual date parsing if needed (e.g., "Dec 17, 2024")
-            # For now, assume recent if we can't parse
-            return now
+            if max_polls is not None and polls >= max_polls:
+                break
             
-        except Exception as e:
-            logger.debug(f"Error parsing time '{time_text}': {e}")
-            return now
+            stop_event.wait(max(0.0, poll_interval - (time.monotonic() - started)))
     
     
-    def _extract_tickers(self, text: str) -> List[str]:
+    def _fetch_news_page(self, url: Optional[str] = None, revalidate: bool = False,
+                         skip_keys: Optional[FrozenSet[str]] = None,
+                         cutoff_time: Optional[datetime] = None,
+                         limit: Optional[int] = ScanParameters.NEWS_ENTRY_LIMIT) -> Optional[Dict]:
         """
-        Extract ticker symbols from text using multiple patterns
+        Download a news page and parse its news entries
         
         Args:
-            text: Text to search for tickers
+            url: Page to fetch (default: the live page)
+            revalidate: Skip a fresh cached copy (watch mode must see new items)
+            skip_keys: Entry keys to leave unparsed (already seen)
+            cutoff_time: Ignore news older than this (default: TIME_WINDOW_HOURS ago)
+            limit: Only look at the first N entries (None = all)
             
         Returns:
-            List of unique ticker symbols
+            Parsed page (see parsers.parse_news_page) or None if the request failed
         """
-        tickers = set()
+        url = url or self.news_url
+        
+        # Make request using base class method
+        response = self.make_request(url, revalidate=revalidate)
         
-        # Pattern 1: $TICKER format (most reliable)
-        dollar_tickers = Patterns.TICKER_WITH_DOLLAR.findall(text)
-        tickers.update(dollar_tickers)
+        if not response:
+            logger.error(f"Failed to fetch StockTitan page {url}")
+            return None
         
-        # Pattern 2: (NASDAQ: TICKER) or (NYSE: TICKER) format
-        paren_matches = Patterns.TICKER_IN_PARENS.findall(text)
-        tickers.update([match[1] for match in paren_matches])
+        logger.info(f"StockTitan responded with status {response.status_code}")
         
-        # Pattern 3: Standalone uppercase words (more prone to false positives)
-        # Only use if no tickers found yet
-        if not tickers:
-            potential_tickers = Patterns.TICKER.findall(text)
-            
-            # Filter out common false positives
-            false_positives = {
-                'THE', 'AND', 'FOR', 'INC', 'LLC', 'USA', 'CEO', 'CFO', 
-                'FDA', 'SEC', 'IPO', 'NYSE', 'NASDAQ', 'OTC', 'ETF',
-                'NEWS', 'STOCK', 'MARKET', 'ABOUT', 'WILL', 'HAVE'
-            }
-            
-            # Only keep if 1-5 chars and not a false positive
-            valid_tickers = [
-                t for t in potential_tickers 
-                if t not in false_positives and 1 <= len(t) <= 5
-            ]
-            tickers.update(valid_tickers)
-        
-        return list(tickers)
+        # Cutoff is taken at parse time so cached pages age out correctly
+        if cutoff_time is None:
+            cutoff_time = datetime.now() - timedelta(hours=TimeWindows.NEWS_LOOKBACK_HOURS)
+        
+        known_symbols = self.cik_index.symbols if self.cik_index.load() else None
+        
+        page = self.parse(parse_news_page, response.content, response.encoding, cutoff_time,
+                          limit, skip_keys, known_symbols)
+        
+        logger.info(f"Found {page['entry_count']} potential news entries")
+        return page
     
     
     def test_connection(self) -> bool:
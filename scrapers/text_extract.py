@@ -0,0 +1,219 @@
+"""
+PennyStalker - Streaming Text Extraction
+Turns HTML into plain text incrementally and stops once enough text is collected
+"""
+
+import codecs
+import re
+from typing import Iterable, List, Optional, Union
+
+from lxml import etree
+
+WHITESPACE = re.compile(r'\s+')
+
+# Elements whose content is never visible text
+SKIPPED_TAGS = {'script', 'style'}
+
+# Longest unclosed '<...' held back between feeds before it is parsed anyway
+MAX_PENDING = 64 * 1024
+
+
+class _TextCollector:
+    """
+    lxml parser target that collects visible text strings
+    
+    Mirrors BeautifulSoup's get_text(separator=' ', strip=True) followed by
+    whitespace collapsing: every text node is stripped, empty nodes are
+    dropped and the rest are joined with single spaces.
+    """
+    
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.pieces: List[str] = []
+        self.length = 0
+        self.buffer: List[str] = []
+        self.skip_depth = 0
+    
+    
+    @property
+    def done(self) -> bool:
+        """True once the character budget is filled"""
+        return self.length >= self.max_chars
+    
+    
+    def _flush(self):
+        """Close out the current text node (lxml may deliver one node in several calls)"""
+        if not self.buffer:
+            return
+        
+        text = ''.join(self.buffer).strip()
+        self.buffer = []
+        
+        if text and not self.done:
+            text = WHITESPACE.sub(' ', text)
+            self.length += len(text) + (1 if self.pieces else 0)
+            self.pieces.append(text)
+    
+    
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+    
+    
+    def end(self, tag):
+        self._flush()
+        if tag in SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+    
+    
+    def data(self, data):
+        if not self.skip_depth:
+            self.buffer.append(data)
+    
+    
+    def comment(self, text):
+        self._flush()
+    
+    
+    def pi(self, target, data=None):
+        self._flush()
+    
+    
+    def close(self) -> str:
+        self._flush()
+        return ' '.join(self.pieces)[:self.max_chars]
+
+
+class StreamingTextExtractor:
+    """
+    Incremental HTML -> text converter
+    
+    Feed chunks as they arrive; check `done` after each one and stop reading
+    the response once it is True. Only the text kept so far is held in memory,
+    never a document tree.
+    """
+    
+    def __init__(self, max_chars: int, encoding: Optional[str] = None):
+        """
+        Args:
+            max_chars: Character budget for the extracted text
+            encoding: Encoding for byte chunks (default: utf-8)
+        """
+        self.collector = _TextCollector(max_chars)
+        self.parser = etree.HTMLParser(target=self.collector)
+        self.decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        self.pending = ''
+        self.result = None
+        
+        # libxml2 only hands over a text node once the next tag arrives, so a
+        # tagless document (.txt) or a long text run is measured here instead
+        self.run_chars = 0      # Collapsed characters fed since the last '>'
+        self.run_space = False  # ... the last of which is a space
+    
+    
+    @property
+    def done(self) -> bool:
+        """True once enough text has been extracted"""
+        collector = self.collector
+        if collector.done:
+            return True
+        # The run as the collector will keep it: stripped, joined with a space
+        run = self.run_chars - self.run_space
+        if run > 0 and collector.pieces:
+            run += 1
+        return collector.length + run >= collector.max_chars
+    
+    
+    def feed(self, chunk: Union[bytes, str]):
+        """
+        Parse the next piece of the document
+        
+        Args:
+            chunk: Raw bytes (decoded with the extractor's encoding) or text
+        """
+        if self.done:
+            return
+        
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk)
+        
+        # Hold back a tag left open at the end - libxml2's push parser
+        # misreads end tags like </script> that are split across feeds.
+        # Text without tags (plain .txt documents) goes straight through,
+        # and a '<' that never closes is only held for MAX_PENDING chars.
+        text = self.pending + chunk
+        cut = text.rfind('<')
+        if cut >= 0 and text.find('>', cut) < 0 and len(text) - cut <= MAX_PENDING:
+            self._feed(text[:cut])
+            self.pending = text[cut:]
+        else:
+            self._feed(text)
+            self.pending = ''
+    
+    
+    def _feed(self, text: str):
+        """Pass text to the parser, tracking the text run libxml2 hasn't delivered yet"""
+        if not text:
+            return
+        self.parser.feed(text)
+        
+        end = text.rfind('>')
+        run = text[end + 1:]
+        if '<' in run:
+            return  # Inside a tag (a '<' that never closed) - not text
+        if end >= 0:
+            self.run_chars = 0
+            self.run_space = False
+        if self.collector.skip_depth:
+            return  # Script / style content - never text
+        
+        run = WHITESPACE.sub(' ', run)
+        if run.startswith(' ') and (self.run_space or not self.run_chars):
+            run = run[1:]  # Collapses into the space before it, or leading
+        if run:
+            self.run_chars += len(run)
+            self.run_space = run.endswith(' ')
+    
+    
+    def close(self) -> str:
+        """
+        Finish parsing and return the extracted text
+        
+        Returns:
+            Text truncated to the character budget
+        """
+        if self.result is None:
+            if not self.done:
+                tail = self.pending + self.decoder.decode(b'', final=True)
+                if tail:
+                    self.parser.feed(tail)
+            try:
+                self.parser.close()
+            except etree.LxmlError:
+                pass  # Empty or truncated documents - keep whatever text was collected
+            self.result = self.collector.close()
+        return self.result
+
+
+def extract_text(chunks: Iterable[Union[bytes, str]], max_chars: int, encoding: Optional[str] = None) -> str:
+    """
+    Extract visible text from an HTML document delivered in chunks
+    Stops consuming the iterable as soon as the budget is reached
+    
+    Args:
+        chunks: Document pieces (e.g. response.iter_content())
+        max_chars: Character budget
+        encoding: Encoding for byte chunks
+        
+    Returns:
+        Extracted text, at most max_chars long
+    """
+    extractor = StreamingTextExtractor(max_chars, encoding)
+    
+    for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+    
+    return extractor.close()
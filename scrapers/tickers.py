@@ -0,0 +1,115 @@
+"""
+PennyStalker - Ticker Extraction
+Finds ticker symbols in a whole batch of headlines
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from config_files import Patterns
+
+# Where a ticker came from, most to least reliable
+SOURCE_DOLLAR = 'dollar'        # $ABCD
+SOURCE_EXCHANGE = 'exchange'    # (NASDAQ: ABCD)
+SOURCE_BARE = 'bare'            # ABCD - any short uppercase word
+
+
+class TickerHit(NamedTuple):
+    """One headline a ticker was found in"""
+    headline: int   # Index into the batch
+    source: str
+
+
+class TickerExtractor:
+    """
+    Batch ticker extraction
+    
+    All headlines are joined and scanned once for $ tickers and once for
+    exchange tickers. Bare uppercase words are a fallback: only headlines
+    with neither are scanned for them (Patterns.TICKER_BARE), and the words
+    must not be stop words and, when the ticker index is available, must be
+    listed symbols.
+    """
+    
+    def __init__(self, known_symbols: Optional[FrozenSet[str]] = None):
+        """
+        Args:
+            known_symbols: Listed ticker symbols (None = accept any bare word that isn't a stop word)
+        """
+        self.known_symbols = known_symbols
+    
+    
+    def extract_batch(self, headlines: List[str]) -> List[List[Tuple[str, str]]]:
+        """
+        Tickers for every headline in a batch
+        
+        Args:
+            headlines: Headline texts
+        
+        Returns:
+            Per headline, (ticker, source) pairs in order of first appearance
+        """
+        lines = [headline.replace('\n', ' ') for headline in headlines]
+        text = '\n'.join(lines)
+        ends = list(accumulate(len(line) + 1 for line in lines))
+        
+        # $ and exchange tickers in one pass each over the whole batch; a
+        # match's offset says which headline it is in
+        strong: Dict[int, List[Tuple[int, str, str]]] = {}
+        for match in Patterns.TICKER_WITH_DOLLAR.finditer(text):
+            strong.setdefault(bisect_right(ends, match.start()), []).append(
+                (match.start(), match.group(1), SOURCE_DOLLAR))
+        for match in Patterns.TICKER_EXCHANGE.finditer(text):
+            strong.setdefault(bisect_right(ends, match.start()), []).append(
+                (match.start(), match.group('exchange'), SOURCE_EXCHANGE))
+        
+        stop_words = Patterns.TICKER_STOP_WORDS
+        known = self.known_symbols
+        results: List[List[Tuple[str, str]]] = []
+        
+        for index, line in enumerate(lines):
+            found: Dict[str, str] = {}
+            if index in strong:
+                for _, ticker, source in sorted(strong[index]):
+                    found.setdefault(ticker, source)
+            else:
+                # Bare words only count when the headline has no reliable
+                # ticker, so only those headlines are scanned for them
+                for word in Patterns.TICKER_BARE.findall(line):
+                    if word not in stop_words and (known is None or word in known):
+                        found.setdefault(word, SOURCE_BARE)
+            results.append(list(found.items()))
+        
+        return results
+    
+    
+    def map_batch(self, headlines: List[str]) -> Dict[str, List[TickerHit]]:
+        """
+        Ticker -> headlines it appears in
+        
+        Args:
+            headlines: Headline texts
+        
+        Returns:
+            Dict mapping each ticker to TickerHits, in headline order
+        """
+        tickers: Dict[str, List[TickerHit]] = {}
+        for index, found in enumerate(self.extract_batch(headlines)):
+            for ticker, source in found:
+                tickers.setdefault(ticker, []).append(TickerHit(index, source))
+        return tickers
+
+
+def extract_tickers(text: str, known_symbols: Optional[FrozenSet[str]] = None) -> List[str]:
+    """
+    Ticker symbols in one piece of text
+    
+    Args:
+        text: Text to search for tickers
+        known_symbols: Listed ticker symbols for vetting bare words
+    
+    Returns:
+        Unique ticker symbols in order of appearance
+    """
+    return [ticker for ticker, _ in TickerExtractor(known_symbols).extract_batch([text])[0]]